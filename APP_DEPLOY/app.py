@@ -1,19 +1,43 @@
-from dash import Dash, html, Input, Output, callback, dcc, State, dash_table, DiskcacheManager
+from dash import Dash, html, Input, Output, callback, dcc, State, dash_table
 import os
+import multiprocessing
+import pickle
+import threading
+from functools import lru_cache, partial, update_wrapper
 from datetime import datetime, timedelta
 import dash
+import diskcache
 
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
-import yfinance as yf
-from ta.trend import SMAIndicator, EMAIndicator, MACD
-from ta.momentum import RSIIndicator
 import pandas as pd
 import numpy as np
 
 from components.menu import *
-from components.prophet import ProphetForecast
+from components.prophet import ProphetForecast, artifact_path, DEFAULT_FEATURES
+from components.datasets import prepare_market_data, prepare_forecast_data
+from components.forecast_cache import ForecastCache
+from components.market_data import MarketDataStore, YahooFetcher, FixtureFetcher
+from components.shared_data import SharedDatasets
+from components.startup import Resources
+from components.forecast_service import ForecastService
+from components.backtest import Backtest
+from components.background import ForkSafeDiskcacheManager
+from components.metrics import metrics, instrument_callbacks
+from components.downsampling import viewport, is_zoom_event
+from components.figures import (adobe_figure, adobe_extend, index_figure, predict_figure, predict_extend,
+                                volatility_figure, correlation_figure)
+from components.year_index import YearIndex
+from components.volatility import GarchModel, log_returns
+from components.news import NewsClient, NewsStore, NewsIngestor, NewsScheduler, NEWSAPI_URL
+from components.news_stub import NewsStubServer
+from components.sentiment import SentimentScorer, DailySentiment, align_sentiment, SENTIMENT_FEATURE
+from components.macro import MacroFeatureStore, MACRO_SERIES
+from components.correlation import CorrelationEngine
+from components.lstm import LstmForecaster, lstm_features, lstm_path
+from components.registry import ModelRegistry
+from components.streaming import MarketStream, SimulatedFeed, FetcherFeed
 from components.analyse import Analyse
 from components.techn import Techn
 from components.model import Model
@@ -21,15 +45,10 @@ from components.calibration import Calibration
 
 import plotly.express as px
 import pandas as pd
-from collections import Counter
 
 from dash_holoniq_wordcloud import DashWordcloud
 
-import requests
-import re
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
-nltk.download('vader_lexicon')
+from flask import jsonify, Response
 
 
 # Initialisation du chemin permettant le lancement de l'application
@@ -41,11 +60,20 @@ path = f"/"
 app = Dash(__name__, requests_pathname_prefix=path, external_stylesheets=[dbc.themes.BOOTSTRAP, FONT_AWESOME], suppress_callback_exceptions = True)
 
 app.index_string = INDEX_CONFIG
+# Serveur WSGI pour un déploiement multi-processus (ex. gunicorn app:server)
+server = app.server
+
+# Liste des tickers suivis (variable d'environnement WATCHLIST, séparés par des virgules), Adobe en premier
+watchlist = ['ADBE'] + [t for t in os.environ.get('WATCHLIST', 'MSFT,AAPL,GOOGL,CRM').split(',') if t and t != 'ADBE']
+
+# Mode streaming (STREAMING=1) : les graphiques des cours reçoivent les nouvelles séances toutes les
+# STREAM_INTERVAL secondes, sans renvoi de l'historique
+stream_interval = float(os.environ.get('STREAM_INTERVAL', 5)) if os.environ.get('STREAMING') else None
 
 # Initialisation des différentes sections de l'application via des objets personnalisés
 analyse = Analyse()      
-tech = Techn() 
-model = Model() 
+tech = Techn(watchlist, stream_interval) 
+model = Model(watchlist, stream_interval) 
 calibration = Calibration() 
 
 
@@ -66,158 +94,334 @@ app.layout = html.Div(
         html.Button(id='load-data-button', style={"display": "none"}), # Bouton caché pour déclencher le chargement des données
         dcc.Store(id='selected-item', data='', storage_type='session'),  # Stockage temporaire de données sélectionnées en session
         html.Div(id="hidden-div", style={"display": "none"}), # Division cachée pour stocker d'autres informations ou déclencher des callbacks
+        dcc.Store(id='ready-components', data=[]), # Composants construits en arrière-plan et disponibles
+        dcc.Interval(id='readiness-poll', interval=1000), # Interrogation de l'état d'initialisation jusqu'à la fin du démarrage
     ])
 
 
 
-date_considere = (datetime.today() - timedelta(days=1)).date().strftime("%Y-%m-%d")
-api_key = '1212688ede774309ad6e24ee2a5bd970'
-
-def get_news(date, api_key):
-    # URL de NewsAPI
-    url = f'https://newsapi.org/v2/everything?q=adobe&?country=us&from={date}&sortBy=publishedAt&apiKey={api_key}'
+api_key = os.environ.get('NEWS_API_KEY', '1212688ede774309ad6e24ee2a5bd970')
 
-    # Faire la requête
-    response = requests.get(url)
+# Les actualités sont téléchargées de façon asynchrone dans une base SQLite locale, puis rafraîchies en arrière-plan.
+# NEWS_QUERIES : requêtes séparées par des virgules, NEWS_DAYS : jours d'historique, NEWS_REFRESH : période en secondes.
+# NEWS_OFFLINE=1 remplace NewsAPI par un serveur local (components/news_stub.py), NEWS_API_URL pointe vers un autre serveur.
+news_api_url = os.environ.get('NEWS_API_URL', NEWSAPI_URL)
+if os.environ.get('NEWS_OFFLINE') and __name__ != '__mp_main__':
+    news_api_url = NewsStubServer().start()
 
-    if response.status_code == 200:
-        data = response.json()
-        
-        news_data = []
+news_store = NewsStore(os.path.join('data', 'news.sqlite'))
+news_ingestor = NewsIngestor(NewsClient(api_key, base_url=news_api_url), news_store,
+                             queries=os.environ.get('NEWS_QUERIES', 'adobe').split(','),
+                             days=int(os.environ.get('NEWS_DAYS', 7)))
 
-        # Vérifier s'il y a des articles dans la réponse
-        if data['articles']:
-            df = pd.json_normalize(data['articles'])[["publishedAt", "title", "description"]]
-            
-            df.columns = ["Date", "Title", "Description"]
-            df = df[["Title", "Description"]]
-            return df
-        else:
-            print("Aucun article trouvé pour cette date.")
-            return pd.DataFrame() 
-    else:
-        print(f"Erreur lors de la récupération des actualités. Code : {response.status_code}")
-        return pd.DataFrame()
-    
 ##############################
 # Import des données d'Adobe et des indices
 start_date = '2010-01-01'
 end_date = pd.to_datetime('today')
 
-adobe_data = yf.download('ADBE', start=start_date, end=end_date)
-sp_data = yf.download('^GSPC', start=start_date, end=end_date)
-cac_data = yf.download('^FCHI', start=start_date, end=end_date)
-
-adobe_data.columns = ['Close', 'High', 'Low', 'Open', 'Volume']
-sp_data.columns = ['Close', 'High', 'Low', 'Open', 'Volume']
-cac_data.columns = ['Close', 'High', 'Low', 'Open', 'Volume']
+# Les cours sont lus depuis le stockage local ; seules les dates manquantes sont téléchargées.
+# MARKET_DATA_OFFLINE=1 remplace Yahoo Finance par des données synthétiques pour travailler sans réseau.
+market_fetcher = FixtureFetcher() if os.environ.get('MARKET_DATA_OFFLINE') else YahooFetcher()
+market_store = MarketDataStore(os.path.join('data', 'market'), fetcher=market_fetcher)
+# Les jeux préparés sont partagés en lecture seule, sans copie, entre les callbacks et les processus du serveur
+shared_datasets = SharedDatasets(os.path.join('cache', 'datasets'))
 
-# Calcul du rendement logarithmique
-adobe_data['LogReturn'] = np.log(adobe_data['Close'] / adobe_data['Close'].shift(1))
-sp_data['LogReturn'] = np.log(sp_data['Close'] / sp_data['Close'].shift(1))
-cac_data['LogReturn'] = np.log(cac_data['Close'] / cac_data['Close'].shift(1))
+def load_market_data(ticker):
+    return shared_datasets.publish(ticker, prepare_market_data(market_store.get(ticker, start_date, end_date)))
 
-# Normalisation Min-Max des prix de clôture
-adobe_data['NormalizedClose'] = (adobe_data['Close'] - adobe_data['Close'].min()) / (adobe_data['Close'].max() - adobe_data['Close'].min())
-sp_data['NormalizedClose'] = (sp_data['Close'] - sp_data['Close'].min()) / (sp_data['Close'].max() - sp_data['Close'].min())
-cac_data['NormalizedClose'] = (cac_data['Close'] - cac_data['Close'].min()) / (cac_data['Close'].max() - cac_data['Close'].min())
 
-
-# Charger le dataframe
-df_sentiment = pd.read_csv('data\macro_sentiment_info.csv')
-
-df_sentiment['Year'] = pd.to_datetime(df_sentiment['DATE']).dt.year
-df_sentiment['Month'] = pd.to_datetime(df_sentiment['DATE']).dt.month_name()
-
-# Normaliser les valeurs en Min-Max pour les colonnes numériques manuellement
 columns_to_normalize = ['EMVMACROBUS', 'CPIAUCSL', 'EXPINF1YR', 'LNS12032195', 'UMCSENT']
-for column in columns_to_normalize:
-    min_value = df_sentiment[column].min()
-    max_value = df_sentiment[column].max()
-    df_sentiment[column + '_N'] = (df_sentiment[column] - min_value) / (max_value - min_value)
-
-
-# Calcul des indicateurs techniques pour Adobe
-def calculate_indicators(df):
-    df['RSI3Day'] = RSIIndicator(df['Close'], window=3).rsi()
-    df['RSI9Day'] = RSIIndicator(df['Close'], window=9).rsi()
-    df['RSI14Day'] = RSIIndicator(df['Close'], window=14).rsi()
-    df['RSI30Day'] = RSIIndicator(df['Close'], window=30).rsi()
-    df['MA10Day'] = SMAIndicator(df['Close'], window=10).sma_indicator()
-    df['MA30Day'] = SMAIndicator(df['Close'], window=30).sma_indicator()
-    df['MA50Day'] = SMAIndicator(df['Close'], window=50).sma_indicator()
-    df['EMA10Day'] = EMAIndicator(df['Close'], window=10).ema_indicator()
-    # MACD
-    macd = MACD(df['Close'])
-    df['MACD'] = macd.macd()
-    df['Signal'] = macd.macd_signal()
-
-    return df
-
-adobe_data = calculate_indicators(adobe_data)
-adobe_data['Date'] = pd.to_datetime(adobe_data.index)
-
-forecast_model = ProphetForecast(adobe_data)
-forecast_model.fit_model()
-
-
-
-
-
-
-scrapped_data = get_news(date_considere, api_key)
-scrapped_data = scrapped_data.dropna()
-
-text = ' '.join(scrapped_data['Title']) + ' ' + ' '.join(scrapped_data['Description'])
-# Convertir le texte en minuscules
-text = text.lower()
-
-# Retirer les caractères spéciaux, chiffres, et ponctuation
-text = re.sub(r'[^a-z\s]', '', text)
-
-# Liste des prépositions à retirer
-prepositions = {'de', 'la', 'le', 'des', 'en', 'pour', 'avec', 'sans', 'sur', 'par', 'à', 'et', 'mais', 'ou'}
-
-# Tokenisation du texte (division en mots)
-words = text.split()
 
-# Retirer les prépositions et les mots de moins de 3 caractères
-words = [word for word in words if word not in prepositions and len(word) > 4]
-
-# Compter la fréquence des mots
-word_counts = Counter(words)
-
-df_words = pd.DataFrame(word_counts.items(), columns=['Word', 'Count'])
-df_words['Count'] = df_words['Count']*10
-
-
-# Initialisation de l'analyseur de sentiment
-sia = SentimentIntensityAnalyzer()
-
-# Fonction pour classer le sentiment
-def classify_sentiment(text):
-    sentiment_score = sia.polarity_scores(text)
-    compound_score = sentiment_score['compound']
-    
-    if compound_score >= 0.05:
-        return 'Positive'
-    elif compound_score <= -0.05:
-        return 'Negative'
+def load_macro_sentiment():
+    # Charger le dataframe
+    df_sentiment = pd.read_csv(os.path.join('data', 'macro_sentiment_info.csv'))
+
+    df_sentiment['Year'] = pd.to_datetime(df_sentiment['DATE']).dt.year
+    df_sentiment['Month'] = pd.to_datetime(df_sentiment['DATE']).dt.month_name()
+
+    # Normaliser les valeurs en Min-Max pour toutes les colonnes numériques à la fois
+    values = df_sentiment[columns_to_normalize]
+    normalized = (values - values.min()) / (values.max() - values.min())
+    return df_sentiment.join(normalized.add_suffix('_N'))
+
+
+def load_adobe_data():
+    return shared_datasets.publish('ADBE', prepare_forecast_data(market_store.get('ADBE', start_date, end_date)))
+
+# Cache des prévisions partagé entre les callbacks et les workers, invalidé à chaque réajustement du modèle
+forecast_cache = ForecastCache('cache/forecasts')
+
+# NEWS_REGRESSOR=1 ajoute le sentiment journalier des actualités aux régresseurs du modèle d'Adobe
+news_regressor = bool(os.environ.get('NEWS_REGRESSOR'))
+
+# Séries macroéconomiques FRED (data/fred) alignées sur les séances en respectant leur délai de publication.
+# MACRO_REGRESSORS : séries ajoutées aux régresseurs du modèle d'Adobe, séparées par des virgules (all : toutes)
+macro_store = MacroFeatureStore(os.path.join('data', 'fred'), os.path.join('cache', 'macro'))
+macro_regressors = os.environ.get('MACRO_REGRESSORS', '')
+macro_regressors = list(MACRO_SERIES) if macro_regressors == 'all' else [name for name in macro_regressors.split(',') if name]
+
+def load_macro_features(adobe_data):
+    # Seules les lignes touchées par une nouvelle publication ou par de nouvelles séances sont recalculées
+    return macro_store.features(adobe_data.index, macro_regressors)
+
+def forecast_inputs(adobe_data, daily_sentiment=None, macro_features=None):
+    # Données et régresseurs du modèle d'Adobe : indicateurs par défaut et régresseurs optionnels activés
+    features = list(DEFAULT_FEATURES)
+    if daily_sentiment is not None:
+        adobe_data = adobe_data.assign(**{SENTIMENT_FEATURE: align_sentiment(daily_sentiment, adobe_data.index).values})
+        features.append(SENTIMENT_FEATURE)
+    if macro_features is not None:
+        adobe_data = adobe_data.assign(**{name: macro_features[name].to_numpy() for name in macro_features})
+        features += list(macro_features)
+    return adobe_data, features
+
+def fit_forecast_model(adobe_data, daily_sentiment=None, macro_features=None):
+    # Le modèle enregistré (voir train.py) est rechargé ; Prophet n'est réajusté que si les données ont changé
+    adobe_data, features = forecast_inputs(adobe_data, daily_sentiment, macro_features)
+    forecast_model = ProphetForecast(adobe_data, features=features, cache=forecast_cache)
+    forecast_model.fit_or_load(artifact_path('models', 'ADBE'))
+    return forecast_model
+
+
+# Les pools de processus démarrent depuis un serveur forkserver : un fork direct, pendant que d'autres ressources
+# se chargent dans des threads, peut copier un verrou d'import tenu et bloquer le processus fils indéfiniment.
+# Le serveur forkserver importe une fois Prophet pour tous les processus qu'il crée. Sans forkserver (Windows),
+# le contexte par défaut de la plateforme est utilisé
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    process_context = multiprocessing.get_context('forkserver')
+    process_context.set_forkserver_preload(['components.prophet'])
+else:
+    process_context = multiprocessing.get_context()
+
+# Les autres tickers de la liste sont ajustés en parallèle dans un pool de processus ;
+# FORECAST_WORKERS fixe le nombre de processus et FORECAST_TIMEOUT le délai par ticker (secondes)
+forecast_service = ForecastService(market_store, start_date, end_date, models_dir='models',
+                                   max_workers=int(os.environ.get('FORECAST_WORKERS', 0)) or None,
+                                   timeout=float(os.environ.get('FORECAST_TIMEOUT', 600)),
+                                   cache=forecast_cache, mp_context=process_context, datasets=shared_datasets)
+
+# Registre des modèles servis : chaque callback utilise la version courante du modèle de son ticker jusqu'à la fin
+# de son exécution ; une nouvelle version est construite en arrière-plan puis remplace la courante sans interrompre
+# les callbacks en cours. Une version remplacée est libérée dès que plus aucun callback ne l'utilise.
+def evict_model(version):
+    # Les prévisions en cache d'une version libérée ne resservent plus (sauf empreinte identique à la courante)
+    if model_registry.fingerprints().get(version.name) != version.fingerprint:
+        forecast_cache.invalidate(version.fingerprint)
+
+def model_published(version):
+    # Les séances en direct du ticker repartent de l'historique de la nouvelle version
+    market_stream.reset(version.name, version.forecaster.data)
+
+model_registry = ModelRegistry(on_evict=evict_model, on_publish=model_published)
+
+def build_forecaster(ticker):
+    # Nouvelle version du modèle d'un ticker : cours à jour, artefact rechargé, ou réajustement si les données ont changé
+    if ticker == 'ADBE':
+        return fit_forecast_model(load_adobe_data(), **{name: resources.get(name) for name in optional_regressors})
+    return forecast_service.load(ticker)
+
+def fit_watchlist():
+    results = forecast_service.run(watchlist[1:])
+    # Modèles chargés dans le processus du serveur : les callbacks en arrière-plan, exécutés dans des processus
+    # issus de celui-ci, en héritent au lieu de recharger chaque artefact
+    for ticker in watchlist[1:]:
+        if ticker not in forecast_service.errors:
+            model_registry.publish(ticker, forecast_service.load(ticker))
+    return results
+
+# Séances en direct : par défaut, le fetcher des cours est interrogé (Yahoo Finance, ou données synthétiques avec
+# MARKET_DATA_OFFLINE) ; STREAM_FEED=simulated les simule localement à partir de la dernière séance (développement)
+def stream_history(ticker):
+    # Historique affiché par les graphiques : cours d'Adobe, ou données du modèle courant des autres tickers
+    if ticker == 'ADBE':
+        return resources.get('adobe_data')
+    with model_registry.acquire(ticker) as version:
+        return version.forecaster.data
+
+stream_feed = SimulatedFeed() if os.environ.get('STREAM_FEED') == 'simulated' else FetcherFeed(market_fetcher)
+market_stream = MarketStream(stream_feed, stream_history, interval=stream_interval or 5)
+
+# Volatilité GARCH(1,1) des rendements de chaque ticker (GARCH_MODEL=gjr pour le modèle asymétrique GJR).
+# Les paramètres enregistrés servent de point de départ au réajustement quand de nouveaux cours arrivent.
+garch_kind = os.environ.get('GARCH_MODEL', 'garch')
+
+@lru_cache(maxsize=len(watchlist))
+def fit_volatility(ticker, fingerprint):
+    # fingerprint : empreinte du modèle de prévision, qui change avec les données du ticker.
+    # La version correspondante est tenue par le callback appelant (model_registry.acquire)
+    forecast_model = model_registry.lookup(ticker, fingerprint).forecaster
+    returns = log_returns(forecast_model.data.set_index('Date')['Close'])
+    return GarchModel(garch_kind).fit_or_load(returns, os.path.join('models', 'garch', f'{ticker}.json'))
+
+# Intervalles Monte Carlo : MC_PATHS trajectoires simulées ensemble, graine fixe pour des tables stables
+mc_paths = int(os.environ.get('MC_PATHS', 2000))
+
+@lru_cache(maxsize=64)
+def simulate_bands(ticker, fingerprint, p, innovations):
+    forecast_model = model_registry.lookup(ticker, fingerprint).forecaster
+    rng = np.random.default_rng(0)
+    if innovations == 'garch':
+        shocks = fit_volatility(ticker, fingerprint).simulate(p, mc_paths, rng)
     else:
-        return 'Neutral'
+        shocks = forecast_model.bootstrap_shocks(p, mc_paths, rng)
+    return forecast_model.simulation_bands(*forecast_model.simulate(p, shocks))
+
+def load_correlations(adobe_data, sp_data, cac_data):
+    # Rendements logarithmiques des tickers suivis et des indices, alignés sur l'union des séances
+    returns = {'ADBE': adobe_data['LogReturn'], 'SP': sp_data['LogReturn'], 'CAC': cac_data['LogReturn']}
+    # Les autres tickers ne sont pas publiés dans shared_datasets : leur nom y désigne déjà les données de prévision
+    returns.update({ticker: prepare_market_data(market_store.get(ticker, start_date, end_date))['LogReturn']
+                    for ticker in watchlist[1:]})
+    return CorrelationEngine(pd.DataFrame(returns).sort_index(), watchlist, ['SP', 'CAC'])
+
+# Modèle LSTM de LSTM_Stock.ipynb, exporté en models/lstm_<ticker>.npz et servi en NumPy (sans PyTorch).
+# Sans fichier exporté pour un ticker, seule la prévision Prophet est affichée.
+# LSTM_HISTORY : nombre de séances récentes prévues à un jour, en plus de la séance suivante
+lstm_history = int(os.environ.get('LSTM_HISTORY', 250))
+
+@lru_cache(maxsize=len(watchlist))
+def lstm_model(ticker):
+    path = lstm_path('models', ticker)
+    return LstmForecaster(path) if os.path.exists(path) else None
+
+@lru_cache(maxsize=len(watchlist))
+def lstm_predictions(ticker, fingerprint):
+    # Toutes les fenêtres de séquences en une passe du modèle
+    forecast_model = model_registry.lookup(ticker, fingerprint).forecaster
+    data = forecast_model.data
+    features = lstm_features(data, resources.get('sp_data')['Close'], resources.get('cac_data')['Close'],
+                             macro_store.features(data.index), fit_volatility(ticker, fingerprint).volatility())
+    return lstm_model(ticker).predict(features, lstm_history)
+
+def run_backtest(adobe_data, *regressors):
+    # Backtest walk-forward à fenêtre croissante du modèle servi (mêmes régresseurs optionnels) ;
+    # seuls les nouveaux plis sont ajustés d'un démarrage à l'autre
+    data, features = forecast_inputs(adobe_data, **dict(zip(optional_regressors, regressors)))
+    return Backtest(data, horizon=10, step=63, initial_rows=2016, features=features,
+                    cache_dir=os.path.join('cache', 'backtest'),
+                    max_workers=forecast_service.max_workers, mp_context=process_context).run()
+
+
+def load_news(news_refresh):
+    # Articles publiés depuis la veille, lus dans le stockage local
+    date_considere = (datetime.today() - timedelta(days=1)).date()
+    return news_store.read(start=date_considere).dropna()
+
+def load_sentiment_scorer():
+    # Initialisation de l'analyseur de sentiment (lexique VADER local, scores en cache par article)
+    return SentimentScorer(os.path.join('cache', 'sentiment.sqlite'), mp_context=process_context)
+
+def score_news(scrapped_data, sentiment_scorer):
+    # Appliquer l'analyse de sentiment sur les titres et descriptions, par lot
+    scrapped_data = scrapped_data.copy()
+    scrapped_data['Sentiment'] = sentiment_scorer.classify(scrapped_data['Title'] + ' ' + scrapped_data['Description'])
+    return scrapped_data
+
+def load_daily_sentiment(news_refresh, sentiment_scorer):
+    # Sentiment agrégé par jour : seules les journées ayant reçu de nouveaux articles sont analysées
+    daily_sentiment = DailySentiment(news_store, sentiment_scorer)
+    daily_sentiment.update()
+    return daily_sentiment.series()
+
+
+# Toutes les données et modèles sont construits en arrière-plan : le serveur répond dès son lancement.
+# Les composants optionnels (actualités, liste de suivi, backtest...) ne conditionnent pas la disponibilité
+resources = Resources()
+resources.register('adobe_data', load_adobe_data)
+resources.register('sp_data', lambda: load_market_data('^GSPC'))
+resources.register('cac_data', lambda: load_market_data('^FCHI'))
+resources.register('df_sentiment', load_macro_sentiment)
+resources.register('news_refresh', news_ingestor.refresh, optional=True)
+resources.register('scrapped_data', load_news, depends=['news_refresh'], optional=True)
+resources.register('sentiment_scorer', load_sentiment_scorer, optional=True)
+resources.register('scored_news', score_news, depends=['scrapped_data', 'sentiment_scorer'], optional=True)
+resources.register('daily_sentiment', load_daily_sentiment, depends=['news_refresh', 'sentiment_scorer'], optional=True)
+resources.register('macro_features', load_macro_features, depends=['adobe_data'], optional=True)
+# Régresseurs optionnels du modèle d'Adobe, passés par nom à fit_forecast_model
+optional_regressors = [name for name, enabled in (('daily_sentiment', news_regressor), ('macro_features', macro_regressors)) if enabled]
+# Le modèle d'Adobe est publié dans le registre à chaque construction (démarrage, nouveau sentiment journalier...)
+resources.register('forecast_model',
+                   lambda adobe_data, *regressors: model_registry.publish(
+                       'ADBE', fit_forecast_model(adobe_data, **dict(zip(optional_regressors, regressors)))).forecaster,
+                   depends=['adobe_data'] + optional_regressors)
+resources.register('watchlist_forecasts', fit_watchlist, optional=True)
+resources.register('backtest', run_backtest, depends=['adobe_data'] + optional_regressors, optional=True)
+resources.register('correlations', load_correlations, depends=['adobe_data', 'sp_data', 'cac_data'], optional=True)
+# Sous Windows, les processus du pool réimportent ce module sous le nom __mp_main__ : ils ne doivent rien relancer
+if __name__ != '__mp_main__':
+    resources.start()
+    # Après chaque rafraîchissement, les articles et les analyses qui en dépendent sont reconstruits
+    news_scheduler = NewsScheduler(news_ingestor, interval=float(os.environ.get('NEWS_REFRESH', 3600)),
+                                   on_refresh=lambda summary: (resources.rebuild('scrapped_data'),
+                                                               resources.rebuild('daily_sentiment')))
+    news_scheduler.start()
+    # MODEL_RELOAD : période (secondes) de reconstruction des modèles sur les cours à jour, 0 pour la désactiver
+    model_reload = float(os.environ.get('MODEL_RELOAD', 6 * 3600))
+    if model_reload:
+        model_registry.watch(watchlist, build_forecaster, model_reload)
+    if stream_interval:
+        market_stream.start()
+
+
+@app.server.route('/healthz')
+def healthz():
+    # Le processus répond : état détaillé de chaque composant
+    return jsonify(status='ok', components=resources.status())
+
+@app.server.route('/readyz')
+def readyz():
+    # Prêt lorsque les composants nécessaires à l'interface sont construits ; les composants optionnels
+    # en attente ou en échec sont signalés sans faire échouer la sonde
+    ready = resources.ready(*resources.required())
+    status = resources.status()
+    pending = [name for name in resources.optional if status[name]['state'] in ('pending', 'running')]
+    failed = [name for name in resources.optional if status[name]['state'] == 'failed']
+    return jsonify(ready=ready, pending=sorted(pending), failed=sorted(failed), components=status), 200 if ready else 503
+
+# Versions des modèles en service ; POST /models/<ticker>/reload construit une nouvelle version (ex. après train.py)
+@app.server.route('/models')
+def models_status():
+    return jsonify(versions=model_registry.status(), errors=model_registry.errors)
+
+@app.server.route('/models/<ticker>/reload', methods=['POST'])
+def reload_model(ticker):
+    if ticker not in watchlist:
+        return jsonify(error=f"ticker inconnu : {ticker}"), 404
+    model_registry.reload(ticker, build_forecaster, ticker)
+    return jsonify(ticker=ticker, loading=True), 202
+
+# Métriques du processus au format texte de Prometheus : durée et taille des réponses de chaque callback,
+# étapes de ProphetForecast et taux de succès des caches.
+# PROFILE_CALLBACKS=1 autorise le profilage d'une requête (en-tête X-Profile ou cookie profile=1) dans cache/profiles.
+instrument_callbacks(app, os.path.join('cache', 'profiles') if os.environ.get('PROFILE_CALLBACKS') else None)
+
+@app.server.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
-# Appliquer l'analyse de sentiment sur les titres et descriptions
-scrapped_data['Sentiment'] = scrapped_data['Title'] + ' ' + scrapped_data['Description']
-scrapped_data['Sentiment'] = scrapped_data['Sentiment'].apply(classify_sentiment)
-
-
-sentiment_counts = scrapped_data['Sentiment'].value_counts()
-
-# Créer le dataframe sentiment_data
-sentiment_data = pd.DataFrame({
-    'Sentiment': sentiment_counts.index,
-    'Count': sentiment_counts.values
-})
+@app.callback(
+    Output('ready-components', 'data'),
+    Output('readiness-poll', 'disabled'),
+    Input('readiness-poll', 'n_intervals'),
+    State('ready-components', 'data')
+)
+def poll_readiness(n_intervals, current):
+    # Les callbacks dépendant de ready-components sont relancés dès qu'un composant devient disponible
+    status = resources.status()
+    ready = sorted(name for name, info in status.items() if info['state'] == 'ready')
+    settled = all(info['state'] in ('ready', 'failed') for info in status.values())
+    return (dash.no_update if ready == current else ready), settled
+
+def pending_message(*names):
+    # Message d'attente, ou d'indisponibilité si la construction d'un composant a échoué
+    failed = [name for name in names if resources.status()[name]['state'] == 'failed']
+    return f"Données indisponibles : {', '.join(failed)}" if failed else "Chargement des données..."
+
+def placeholder_figure(message="Chargement des données..."):
+    fig = go.Figure()
+    fig.update_layout(xaxis={'visible': False}, yaxis={'visible': False},
+                      annotations=[{'text': message, 'showarrow': False, 'font': {'size': 16}}])
+    return fig
 
 
 # Callback pour mettre à jour le contenu de la page en fonction du chemin d'URL
@@ -239,98 +443,144 @@ def render_page_content(pathname):
 
 ############################ ANALYSE TECHNIQUE #################################
 
+# Nombre de graphiques conservés par callback pour les plages d'années et zooms déjà affichés
+FIGURE_CACHE_SIZE = 64
+
+# Index année → première ligne, construit une seule fois par jeu de données
+year_indexes = {}
+year_indexes_lock = threading.Lock()
+
+def year_bounds(year_range):
+    start_year = 2010 if year_range is None else year_range[0]
+    end_year = pd.to_datetime('today').year if year_range is None else year_range[1]
+    return start_year, end_year
+
+def select_years(name, start_year, end_year):
+    # Lignes des années sélectionnées, par tranche positionnelle
+    data = resources.get(name)
+    with year_indexes_lock:
+        if name not in year_indexes:
+            year_indexes[name] = YearIndex(data['Year'] if 'Year' in data else data.index.year)
+    return data.iloc[year_indexes[name].rows(start_year, end_year)]
+
+
 @app.callback(
     Output('year-range-slider', 'min'),
     Output('year-range-slider', 'max'),
     Output('year-range-slider', 'value'),
     Output('year-range-slider', 'marks'),
-    Input('load-data-button', 'n_clicks')
+    Input('load-data-button', 'n_clicks'),
+    Input('ready-components', 'data')
 )
-def update_range_slider(n_clicks):
+def update_range_slider(n_clicks, ready):
+    if not resources.ready('adobe_data'):
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    adobe_data = resources.get('adobe_data')
     min_year = adobe_data.index.year.min()
     max_year = adobe_data.index.year.max()
     marks = {str(year): str(year) for year in range(min_year, max_year + 1)}
     return min_year, max_year, [min_year, max_year], marks
 
+def zoom_window(graph_id, relayout_data, reset_by):
+    # Les graphiques n'envoient qu'environ MAX_POINTS points par trace ; un zoom (relayoutData) redemande le détail
+    # de la plage affichée. Un changement de `reset_by` revient à l'affichage complet.
+    # Retourne (rendu nécessaire, plage zoomée)
+    triggered = dash.ctx.triggered_id
+    if triggered == graph_id:
+        return is_zoom_event(relayout_data), viewport(relayout_data)
+    return True, None if triggered in reset_by else viewport(relayout_data)
+
 @app.callback(
-    Output('adobe-graph', 'figure'),
-    [Input('year-range-slider', 'value')]
+    Output('adobe-graph', 'figure'), Output('adobe-stream-position', 'data'),
+    [Input('year-range-slider', 'value'), Input('adobe-graph', 'relayoutData'), Input('ready-components', 'data')]
 )
-def update_adobe_graph(year_range):
-    start_year = 2010 if year_range is None else year_range[0]
-    end_year = pd.to_datetime('today').year if year_range is None else year_range[1]
-    filtered_data = adobe_data[(adobe_data.index.year >= start_year) & (adobe_data.index.year <= end_year)]
+def update_adobe_graph(year_range, relayout_data, ready):
+    # Un graphique reconstruit ne contient que l'historique : les séances en direct postérieures lui sont renvoyées
+    if not resources.ready('adobe_data'):
+        return placeholder_figure(pending_message('adobe_data')), None
+    render, window = zoom_window('adobe-graph', relayout_data, reset_by=('year-range-slider',))
+    if not render:
+        return dash.no_update, dash.no_update
+    return adobe_graph_figure(*year_bounds(year_range), window), resources.get('adobe_data').index[-1].isoformat()
+
+# Les graphiques déjà construits sont réutilisés lors des allers-retours du curseur d'années
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def adobe_graph_figure(start_year, end_year, window):
+    filtered_data = select_years('adobe_data', start_year, end_year)
+    return adobe_figure(filtered_data, window, uirevision=str([start_year, end_year]), extendable=bool(stream_interval))
 
-    fig = go.Figure()
-    fig.add_trace(go.Candlestick(
-        x=filtered_data.index,
-        open=filtered_data['Open'],
-        high=filtered_data['High'],
-        low=filtered_data['Low'],
-        close=filtered_data['Close'],
-        name='Candlestick'
-    ))
-
-    fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['Close'], mode='lines', name='Close'))
-
-    fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['MA10Day'], mode='lines', name='MA10'))
-    fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['MA30Day'], mode='lines', name='MA30'))
-    fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['MA50Day'], mode='lines', name='MA50'))
-    
-    # Ajout de l'EMA10
-    fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['EMA10Day'], mode='lines', name='EMA10'))
-
-    fig.update_layout(title='Adobe Stock Analysis', xaxis_rangeslider_visible=False)
-    return fig
+@app.callback(
+    Output('adobe-graph', 'extendData'), Output('adobe-stream-position', 'data', allow_duplicate=True),
+    Input('adobe-stream', 'n_intervals'), State('adobe-stream-position', 'data'), State('year-range-slider', 'value'),
+    prevent_initial_call=True
+)
+def stream_adobe_graph(n_intervals, after, year_range):
+    # Nouvelles séances d'Adobe et leurs indicateurs, si la plage d'années affichée va jusqu'à la fin de l'historique
+    if not resources.ready('adobe_data') or year_bounds(year_range)[1] < resources.get('adobe_data').index[-1].year:
+        return dash.no_update, dash.no_update
+    bars, last = market_stream.series('ADBE').since(after)
+    if bars.empty:
+        return dash.no_update, dash.no_update
+    return adobe_extend(bars), last
 
 @app.callback(
     Output('index-graph', 'figure'),
-    [Input('year-range-slider', 'value'), Input('index-select', 'value'), Input('radio-analyse', 'value')]
+    [Input('year-range-slider', 'value'), Input('index-select', 'value'), Input('radio-analyse', 'value'),
+     Input('index-graph', 'relayoutData'), Input('ready-components', 'data')]
 )
-def update_index_graph(year_range, index, radio):
+def update_index_graph(year_range, index, radio, relayout_data, ready):
+    if not resources.ready('adobe_data', 'sp_data', 'cac_data'):
+        return placeholder_figure(pending_message('adobe_data', 'sp_data', 'cac_data'))
+    render, window = zoom_window('index-graph', relayout_data, reset_by=('year-range-slider',))
+    if not render:
+        return dash.no_update
+    return index_graph_figure(*year_bounds(year_range), index, radio, window)
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def index_graph_figure(start_year, end_year, index, radio, window):
     # Choix des données en fonction de l'index sélectionné
-    index_data = {'SP': sp_data, 'CAC': cac_data}
-    data = index_data.get(index, sp_data)
+    name = {'SP': 'sp_data', 'CAC': 'cac_data'}.get(index, 'sp_data')
 
-    # Filtrer les données en fonction de la plage d'années
-    start_year = 2010 if year_range is None else year_range[0]
-    end_year = pd.to_datetime('today').year if year_range is None else year_range[1]
-    filtered_data = data[(data.index.year >= start_year) & (data.index.year <= end_year)]
-    
-    # Filtrer également les données d'Adobe
-    filtered_adobe_data = adobe_data[(adobe_data.index.year >= start_year) & (adobe_data.index.year <= end_year)]
+    # Filtrer les données de l'indice et d'Adobe en fonction de la plage d'années
+    filtered_data = select_years(name, start_year, end_year)
+    filtered_adobe_data = select_years('adobe_data', start_year, end_year)
 
     # Choisir le type d'analyse à afficher (LogReturn ou autres)
-    fig = go.Figure()
-
-    # Ajouter les traces pour l'indice sélectionné
-    if radio == 'rend':
-        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['LogReturn'], mode='lines', name=f'{index} LogReturn'))
-    else:
-        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['NormalizedClose'], mode='lines', name=f'{index} Close Price'))
-
-    # Ajouter les traces pour Adobe (LogReturn ou Close)
-    if radio == 'rend':
-        fig.add_trace(go.Scatter(x=filtered_adobe_data.index, y=filtered_adobe_data['LogReturn'], mode='lines', name='Adobe LogReturn'))
-    else:
-        fig.add_trace(go.Scatter(x=filtered_adobe_data.index, y=filtered_adobe_data['NormalizedClose'], mode='lines', name='Adobe Close Price'))
-
-    # Mise à jour de la mise en page du graphique
-    fig.update_layout(title=f'{index} Index vs Adobe', xaxis_rangeslider_visible=False)
+    return index_figure(filtered_data, filtered_adobe_data, index, radio, window, uirevision=str([start_year, end_year]))
 
-    return fig
+@app.callback(
+    Output('correlation-graph', 'figure'),
+    [Input('year-range-slider', 'value'), Input('index-select', 'value'), Input('correlation-ticker', 'value'),
+     Input('correlation-windows', 'value'), Input('ready-components', 'data')]
+)
+def update_correlation_graph(year_range, index, ticker, windows, ready):
+    if not resources.ready('correlations'):
+        return placeholder_figure(pending_message('correlations'))
+    if not windows:
+        return placeholder_figure("Sélectionnez au moins une fenêtre")
+    return correlation_graph_figure(*year_bounds(year_range), index, ticker, tuple(sorted(windows)))
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def correlation_graph_figure(start_year, end_year, index, ticker, windows):
+    # Séries calculées sur tout l'historique (une fois par couple et fenêtre), puis restreintes aux années choisies
+    rolling = resources.get('correlations').rolling_years(ticker, index, windows, start_year, end_year)
+    return correlation_figure(rolling, ticker, index, uirevision=str([start_year, end_year]))
 
 # Callback pour mettre à jour le graphique et le tableau en fonction des années sélectionnées
 @app.callback(
     [Output('line-chart', 'figure'),
      Output('data-table', 'data'), Output('data-table', 'columns')],
-    [Input('year-range-slider', 'value')]
+    [Input('year-range-slider', 'value'), Input('ready-components', 'data')]
 )
-def update_graph_and_table(year_range):
-    start_year, end_year = year_range
-    
+def update_graph_and_table(year_range, ready):
+    if not resources.ready('df_sentiment'):
+        return placeholder_figure(pending_message('df_sentiment')), [], []
+    return macro_graph_and_table(*year_bounds(year_range))
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def macro_graph_and_table(start_year, end_year):
     # Filtrer les données selon la plage d'années
-    filtered_data = df_sentiment[(df_sentiment['Year'] >= start_year) & (df_sentiment['Year'] <= end_year)]
+    filtered_data = select_years('df_sentiment', start_year, end_year)
 
     # Graphique de séries temporelles
     fig = px.line(filtered_data, 
@@ -346,6 +596,52 @@ def update_graph_and_table(year_range):
 
 ############################ MODELE DEPLOYE #################################
 
+# Les callbacks lourds s'exécutent en arrière-plan, chacun dans un processus issu du serveur (file d'attente diskcache
+# locale), avec progression et annulation : une longue prévision ne bloque plus le serveur. Leurs résultats restent
+# sur disque, indexés par les entrées et l'empreinte des modèles, et servent aux requêtes suivantes de toutes les sessions.
+# BACKGROUND_CALLBACKS=0 les exécute dans le serveur ; CALLBACK_CACHE_EXPIRE fixe la durée de vie des résultats (secondes).
+background_callbacks = os.environ.get('BACKGROUND_CALLBACKS', '1') != '0'
+callback_cache = diskcache.Cache(os.path.join('cache', 'callbacks'))
+CALLBACK_CACHE_EXPIRE = int(os.environ.get('CALLBACK_CACHE_EXPIRE', 86400))
+# Intervalle d'interrogation du résultat par le navigateur (millisecondes)
+BACKGROUND_INTERVAL = 250
+
+def heavy_callback(outputs, inputs, manager, progress, progress_default, cancel, running):
+    # Le callback reçoit en premier argument la fonction de progression, sans effet hors arrière-plan
+    def decorator(func):
+        if background_callbacks:
+            return app.callback(outputs, inputs, background=True, manager=manager, progress=progress,
+                                progress_default=progress_default, cancel=cancel, running=running,
+                                interval=BACKGROUND_INTERVAL)(func)
+        # update_wrapper : le callback garde le nom de la fonction (métriques par callback)
+        app.callback(outputs, inputs)(update_wrapper(partial(func, lambda value: None), func))
+        return func
+    return decorator
+
+def warm_up_figures():
+    # plotly importe ses validateurs à la première utilisation de chaque propriété. Un processus d'arrière-plan créé
+    # pendant qu'une requête du serveur importe l'un d'eux hérite du verrou d'import tenu et reste bloqué :
+    # tous les graphiques sont construits une fois au démarrage, avant la première requête
+    dates = pd.bdate_range('2024-01-01', periods=5)
+    prices = pd.DataFrame({column: np.arange(5.0) + 1 for column in
+                           ['Open', 'High', 'Low', 'Close', 'MA10Day', 'MA30Day', 'MA50Day', 'EMA10Day',
+                            'LogReturn', 'NormalizedClose']}, index=dates)
+    band = pd.DataFrame({'lower': prices['Close'], 'upper': prices['Close']})
+    figures = [adobe_figure(prices), index_figure(prices, prices, '^GSPC', 'rend'), placeholder_figure(),
+               predict_figure(prices, pd.DataFrame({'ds': dates, 'yhat': prices['Close']}), '', bands={'a': band, 'b': band}),
+               volatility_figure(pd.DataFrame({'Sigma': prices['Close']}), prices['Close'], ''),
+               go.Figure(go.Pie(labels=['a'], values=[1], marker=dict(colors=['#000000'])))]
+    for fig in figures:
+        pickle.dumps(fig)
+        fig.to_json()
+
+if background_callbacks:
+    warm_up_figures()
+
+def forecast_versions():
+    # Empreintes des versions courantes des modèles : une nouvelle version invalide les résultats en cache
+    return sorted(model_registry.fingerprints().items()), garch_kind, mc_paths
+
 @app.callback(
     Output("future-days", "value"),
     Input('load-data-button', 'n_clicks') 
@@ -354,50 +650,159 @@ def initialize_days(_):
     return 10
 
 
+def predict_needs(ticker):
+    # Composants nécessaires à la prévision d'un ticker
+    return ('adobe_data', 'forecast_model') if ticker == 'ADBE' else ('watchlist_forecasts',)
+
 @app.callback(
-    [Output('predict-graph', 'figure'),  Output('predict-table', 'data'), Output('predict-table', 'columns')],
-    [Input('load-data-button', 'n_clicks'), Input("future-days", "value")]
+    Output('predict-ready', 'data'),
+    Input('ready-components', 'data'), Input('ticker-select', 'value'), State('predict-ready', 'data')
 )
-def update_adobe_predict(n_clicks, p):
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(x=adobe_data.index, y=adobe_data['Close'], mode='lines', name='Close'))
-
+def update_predict_ready(ready, ticker, current):
+    # La prévision n'est relancée que lorsque ses propres composants deviennent prêts : les composants optionnels
+    # construits plus tard (backtest, corrélations, actualités) ne changent pas les entrées du callback en arrière-plan,
+    # donc ni sa clé de cache ni la file des tâches
+    ready = resources.ready(*predict_needs(ticker or 'ADBE'))
+    return dash.no_update if ready == current else ready
+
+
+predict_manager = ForkSafeDiskcacheManager(callback_cache, cache_by=[forecast_versions], expire=CALLBACK_CACHE_EXPIRE)
+
+@heavy_callback(
+    [Output('predict-graph', 'figure'),  Output('predict-table', 'data'), Output('predict-table', 'columns'),
+     Output('volatility-graph', 'figure'), Output('predict-model', 'data'), Output('predict-stream-position', 'data')],
+    [Input('load-data-button', 'n_clicks'), Input("future-days", "value"), Input('ticker-select', 'value'),
+     Input('band-select', 'value'), Input('predict-graph', 'relayoutData'), Input('predict-ready', 'data')],
+    manager=predict_manager,
+    progress=[Output('predict-progress', 'value'), Output('predict-progress', 'label')],
+    progress_default=[0, ''],
+    cancel=[Input('predict-cancel', 'n_clicks')],
+    running=[(Output('predict-cancel', 'disabled'), False, True)],
+)
+def update_adobe_predict(set_progress, n_clicks, p, ticker, band_mode, relayout_data, ready):
+    ticker = ticker or 'ADBE'
+    needed = predict_needs(ticker)
+    if not resources.ready(*needed) or p is None:
+        return placeholder_figure(pending_message(*needed)), [], [], placeholder_figure(pending_message(*needed)), None, None
+    if p < 1:
+        message = "Entrez un nombre de jours supérieur ou égal à 1"
+        return placeholder_figure(message), [], [], placeholder_figure(message), None, None
+    if ticker in forecast_service.errors or not model_registry.ready(ticker):
+        message = f"{ticker} : {forecast_service.errors.get(ticker) or model_registry.errors.get(ticker, 'modèle indisponible')}"
+        return placeholder_figure(message), [], [], placeholder_figure(message), None, None
+    render, window = zoom_window('predict-graph', relayout_data, reset_by=('ticker-select',))
+    if not render:
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    # La version courante sert toute la prévision, même si une nouvelle version est publiée pendant le calcul
+    # (une tâche en arrière-plan, issue du serveur par fork, garde de toute façon les modèles de l'instant du fork)
+    with model_registry.acquire(ticker) as version:
+        return predict_outputs(set_progress, version, p, ticker, band_mode, window)
+
+def predict_outputs(set_progress, version, p, ticker, band_mode, window):
+    forecast_model = version.forecaster
+    history = forecast_model.data
+
+    set_progress((10, 'Forecast'))
     forecast = forecast_model.predict(p)
-    
-    # Ajouter une barre verticale pour la date d'aujourd'hui
-    today = datetime.today().date()
-    fig.add_vline(x=today, line_width=2, line_dash="dash", line_color="red")
-
-    fig.add_trace(go.Scatter(x=forecast.ds, y=forecast['yhat'], mode='lines', name='Prediction'))
 
-    fig.update_layout(title='Adobe Stock Prediction', xaxis_rangeslider_visible=False)
+    # Intervalle de prix GARCH autour des prix prévus sur l'horizon
+    set_progress((50, 'Volatility'))
+    volatility = fit_volatility(ticker, forecast_model.fingerprint)
+    future = forecast.tail(p).set_index('ds')
+    lower, upper = volatility.bands(future['yhat'])
+    bands = {'GARCH 95%': pd.DataFrame({'lower': lower, 'upper': upper}, index=future.index)}
+
+    # Mode Monte Carlo : les intervalles de la table sont les quantiles des trajectoires simulées
+    if band_mode in ('bootstrap', 'garch'):
+        set_progress((70, 'Monte Carlo'))
+        simulated = simulate_bands(ticker, forecast_model.fingerprint, p, band_mode).set_index('ds')
+        bands['Monte Carlo'] = simulated[['yhat_lower', 'yhat_upper']].set_axis(['lower', 'upper'], axis=1)
+        forecast = forecast.copy()
+        forecast.loc[forecast.index[-p:], ['yhat_lower', 'yhat_upper']] = simulated[['yhat_lower', 'yhat_upper']].to_numpy()
+
+    # Prévisions à un jour du LSTM à côté de la courbe de Prophet, si un modèle a été exporté pour le ticker
+    lines = {}
+    if lstm_model(ticker) is not None and resources.ready('sp_data', 'cac_data'):
+        set_progress((80, 'LSTM'))
+        lines['LSTM (1 day)'] = lstm_predictions(ticker, forecast_model.fingerprint)
+
+    set_progress((90, 'Figures'))
+    name = 'Adobe' if ticker == 'ADBE' else ticker
+    fig = predict_figure(history, forecast, f'{name} Stock Prediction', window, uirevision=ticker, bands=bands, lines=lines)
+    fig_volatility = volatility_figure(volatility.volatility(), pd.Series(np.sqrt(volatility.forecast(p)), index=future.index),
+                                       f'{name} GARCH Volatility', window, uirevision=ticker)
+
+    # Préparer les données du tableau, sans modifier la prévision renvoyée par le modèle
+    table = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(p).round(3)
+    table = table.assign(ds=table['ds'].astype(str), garch_lower=lower.round(3), garch_upper=upper.round(3))
+
+    table_data = table.to_dict('records')
+    columns = [{"name": i, "id": i} for i in table.columns]
+
+
+    # La figure ne contient que l'historique du modèle : les séances en direct postérieures lui sont renvoyées.
+    # Le résultat est mis en cache : seules l'empreinte du modèle et la fin de ses données en font partie
+    return (fig , table_data, columns, fig_volatility, {'ticker': ticker, 'fingerprint': version.fingerprint},
+            pd.Timestamp(history.index[-1]).isoformat())
+
+
+@app.callback(Output('predict-version', 'children'), Input('predict-model', 'data'))
+def update_predict_version(served_by):
+    # Libellé lu dans le registre à chaque affichage (hors cache) : numéro et date de chargement de la version en service
+    if not served_by:
+        return ''
+    try:
+        return f"Served by {model_registry.lookup(served_by['ticker'], served_by['fingerprint']).label()}"
+    except KeyError:
+        return f"Served by {served_by['ticker']} ({served_by['fingerprint']}, version remplacée)"
 
-    # Préparer les données du tableau
-    forecast['ds'] = forecast['ds'].astype(str)
-    forecast[['yhat', 'yhat_lower', 'yhat_upper']] = forecast[['yhat', 'yhat_lower', 'yhat_upper']].round(3)
 
-
-    table_data = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(p).to_dict('records')
-    columns = [{"name": i, "id": i} for i in ['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+@app.callback(
+    Output('predict-graph', 'extendData'), Output('predict-stream-position', 'data', allow_duplicate=True),
+    Input('predict-stream', 'n_intervals'), State('predict-stream-position', 'data'), State('ticker-select', 'value'),
+    prevent_initial_call=True
+)
+def stream_predict_graph(n_intervals, after, ticker):
+    # Nouvelles séances du ticker affiché ajoutées à la courbe des cours, à côté des prévisions
+    ticker = ticker or 'ADBE'
+    if not model_registry.ready(ticker):
+        return dash.no_update, dash.no_update
+    bars, last = market_stream.series(ticker).since(after)
+    if bars.empty:
+        return dash.no_update, dash.no_update
+    return predict_extend(bars), last
 
 
-    return fig , table_data, columns
+@app.callback(
+    Output('model-metrics', 'children'),
+    [Input('load-data-button', 'n_clicks'), Input('ready-components', 'data')]
+)
+def update_model_metrics(n_clicks, ready):
+    if not resources.ready('backtest'):
+        failed = resources.status()['backtest']['state'] == 'failed'
+        return model.metrics_group(None, pending_message('backtest') if failed else "Backtest in progress...")
+    return model.metrics_group(resources.get('backtest').metrics())
 
 
 
 ############################ CALIBRATION BY NEWS #################################
 
+# Nombre maximal de mots affichés dans le nuage
+WORD_CLOUD_SIZE = 200
+
 @app.callback(
-    [Output('word-graph', 'children'),
-     Output('sentiment-graph', 'figure'),
-     Output('scrapped-table', 'data'),
-     Output('scrapped-table', 'columns'),
-     Output('day-table', 'data'),
-     Output('day-table', 'columns')],
-    [Input('load-data-button', 'n_clicks')]
+    Output('word-graph', 'children'),
+    [Input('news-date-range', 'start_date'), Input('news-date-range', 'end_date'), Input('ready-components', 'data')]
 )
-def update_news_calibration(n_clicks):
+def update_word_cloud(start_date, end_date, ready):
+    if not resources.ready('news_refresh'):
+        return html.Div(pending_message('news_refresh'))
+    # Les fréquences de la période sont la somme des comptes journaliers de l'index, sans relire les articles
+    df_words = news_store.term_counts(start_date, end_date, limit=WORD_CLOUD_SIZE)
+    if df_words.empty:
+        return html.Div("Aucun article sur cette période.")
+    df_words['Count'] = df_words['Count']*10
+
     # Nuage de mots
     wordcloud = DashWordcloud(
         list=[[word, count] for word, count in zip(df_words['Word'], df_words['Count'])],
@@ -409,6 +814,25 @@ def update_news_calibration(n_clicks):
         shape='circle',
         hover=True
     )
+    return html.Div([wordcloud])
+
+@app.callback(
+    [Output('sentiment-graph', 'figure'),
+     Output('scrapped-table', 'data'),
+     Output('scrapped-table', 'columns'),
+     Output('day-table', 'data'),
+     Output('day-table', 'columns')],
+    [Input('load-data-button', 'n_clicks'), Input('news-date-range', 'start_date'), Input('news-date-range', 'end_date'),
+     Input('ready-components', 'data')]
+)
+def update_news_calibration(n_clicks, start_date, end_date, ready):
+    needed = ('daily_sentiment', 'scored_news', 'forecast_model')
+    if not resources.ready(*needed):
+        return placeholder_figure(pending_message(*needed)), [], [], [], []
+    # Répartition des sentiments sur la période choisie, lue dans la série journalière déjà calculée
+    counts = resources.get('daily_sentiment').loc[start_date:end_date, ['positive', 'negative', 'neutral']].sum()
+    sentiment_data = pd.DataFrame({'Sentiment': counts.index.str.capitalize(), 'Count': counts.values})
+    scrapped_data = resources.get('scored_news')
 
     color_map = {
         'Positive': '#00FF00',  # Vert pour Positive
@@ -423,18 +847,28 @@ def update_news_calibration(n_clicks):
     fig_sentiment.update_layout(title='Sentiment Analysis')
 
     # Données pour la table
-    forecast = forecast_model.predict(1)
-    forecast[['yhat', 'yhat_lower', 'yhat_upper']] = forecast[['yhat', 'yhat_lower', 'yhat_upper']].round(3)
+    with model_registry.acquire('ADBE') as version:
+        forecast = version.forecaster.predict(1)[['yhat', 'yhat_lower', 'yhat_upper']].tail(1).round(3)
 
 
-    table_data_pred = forecast[['yhat', 'yhat_lower', 'yhat_upper']].tail(1).to_dict('records')
+    table_data_pred = forecast.to_dict('records')
     columns_pred = [{"name": i, "id": i} for i in ['yhat', 'yhat_lower', 'yhat_upper']]
 
     table_data = scrapped_data.to_dict('records')
     table_columns = [{'name': col, 'id': col} for col in scrapped_data.columns]
     
     
-    return html.Div([wordcloud]), fig_sentiment, table_data, table_columns, table_data_pred, columns_pred
+    return fig_sentiment, table_data, table_columns, table_data_pred, columns_pred
+
+
+# Caches suivis par /metrics, lus au moment de l'export
+for cached_function in (adobe_graph_figure, index_graph_figure, correlation_graph_figure, macro_graph_and_table,
+                        fit_volatility, simulate_bands, lstm_predictions):
+    metrics.register_cache(cached_function.__name__, lambda f=cached_function: f.cache_info()[:2])
+metrics.register_cache('correlations', lambda: (resources.get('correlations').hits, resources.get('correlations').misses)
+                       if resources.ready('correlations') else (0, 0))
+metrics.register_cache('forecasts', lambda: (forecast_cache.hits, forecast_cache.misses))
+metrics.register_cache('predict_results', lambda: (predict_manager.hits, predict_manager.misses))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,84 @@
+# Corrélations et bêtas glissants de 500 tickers contre un indice sur 3700 séances, pour 4 fenêtres.
+# pandas rolling (float64), fenêtres explicites par sliding_window_view (coût proportionnel à la fenêtre) et
+# sommes cumulées de components.correlation (coût indépendant de la fenêtre) ; écart maximal à pandas.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_correlation
+import time
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from components.correlation import ROLLING_WINDOWS, rolling_beta_correlation
+
+TICKERS = 500
+DAYS = 3700
+REPEATS = 3
+
+
+def best(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def synthetic_returns(seed=0):
+    # Rendements d'un indice et de tickers de bêtas variés ; tickers introduits en cours de période
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0003, 0.012, DAYS)
+    betas = rng.uniform(0.3, 1.8, TICKERS)
+    assets = market[:, None] * betas + rng.normal(0, 0.02, (DAYS, TICKERS))
+    listing = rng.integers(0, DAYS // 2, TICKERS) * (rng.random(TICKERS) < 0.2)
+    assets[np.arange(DAYS)[:, None] < listing] = np.nan
+    return assets, market
+
+
+def pandas_rolling(assets, market, windows):
+    frame, index = pd.DataFrame(assets), pd.Series(market)
+    return {window: (frame.rolling(window).corr(index).to_numpy(),
+                     (frame.rolling(window).cov(index) / index.rolling(window).var().to_numpy()[:, None]).to_numpy())
+            for window in windows}
+
+
+def explicit_windows(assets, market, windows):
+    # Moments calculés fenêtre par fenêtre sur des vues glissantes (float32)
+    assets, market = assets.astype(np.float32), market.astype(np.float32)
+    results = {}
+    for window in windows:
+        a = sliding_window_view(assets, window, axis=0)
+        m = sliding_window_view(market, window)[:, None, :]
+        da, dm = a - a.mean(axis=2, keepdims=True), m - m.mean(axis=2, keepdims=True)
+        covariance = (da * dm).mean(axis=2)
+        variance_m = (dm * dm).mean(axis=2)
+        head = np.full((window - 1, assets.shape[1]), np.nan, dtype=np.float32)
+        results[window] = (np.vstack([head, covariance / np.sqrt((da * da).mean(axis=2) * variance_m)]),
+                           np.vstack([head, covariance / variance_m]))
+    return results
+
+
+def max_error(results, reference):
+    return max(np.nanmax(np.abs(values - expected)) for window in reference
+               for values, expected in zip(results[window], reference[window]))
+
+
+def main():
+    assets, market = synthetic_returns()
+    print(f"{TICKERS} tickers x {DAYS} séances, fenêtres {ROLLING_WINDOWS}, meilleur de {REPEATS} passages")
+    elapsed, reference = best(lambda: pandas_rolling(assets, market, ROLLING_WINDOWS))
+    print(f"{'pandas rolling (float64)':<34} {elapsed:>8.3f} s")
+    elapsed, results = best(lambda: explicit_windows(assets, market, ROLLING_WINDOWS[:2]))
+    print(f"{'fenêtres explicites (21, 63)':<34} {elapsed:>8.3f} s  écart max {max_error(results, {w: reference[w] for w in ROLLING_WINDOWS[:2]}):.1e}")
+    elapsed, results = best(lambda: rolling_beta_correlation(assets, market, ROLLING_WINDOWS))
+    print(f"{'sommes cumulées':<34} {elapsed:>8.3f} s  écart max {max_error(results, reference):.1e}")
+
+    print("Coût par fenêtre (une fenêtre à la fois)")
+    for window in (5, 21, 252):
+        explicit, _ = best(lambda: explicit_windows(assets, market, [window]))
+        cumulative, _ = best(lambda: rolling_beta_correlation(assets, market, [window]))
+        print(f"  fenêtre {window:>5} : explicites {explicit:>8.3f} s   sommes cumulées {cumulative:>8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
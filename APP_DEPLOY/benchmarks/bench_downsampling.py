@@ -0,0 +1,55 @@
+# Taille de la réponse JSON et latence des graphiques de séries longues, avec et sans réduction LTTB / OHLC.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_downsampling
+import time
+
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+from benchmarks.common import synthetic_ohlcv, with_indicators
+from components.datasets import prepare_market_data
+from components.figures import adobe_figure, index_figure, predict_figure
+from components.prophet import ProphetForecast
+
+# Environ seize ans de jours ouvrés, comme l'historique Adobe depuis 2010
+HISTORY_LENGTH = 4200
+ZOOM_DAYS = 250
+
+
+def timed(func, repeat=5):
+    # Construction du graphique puis sérialisation, comme pour la réponse d'un callback Dash
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = to_json_plotly(func())
+        best = min(best, time.perf_counter() - start)
+    return best, len(payload.encode())
+
+
+def main():
+    adobe = with_indicators(synthetic_ohlcv(HISTORY_LENGTH))
+    index = prepare_market_data(synthetic_ohlcv(HISTORY_LENGTH, seed=1))
+    forecaster = ProphetForecast(adobe.copy())
+    forecaster.fit_model()
+    forecast = forecaster.predict(10)
+    window = (adobe.index[-ZOOM_DAYS], adobe.index[-1])
+
+    figures = {
+        'adobe-graph': lambda **kw: adobe_figure(adobe, **kw),
+        'index-graph': lambda **kw: index_figure(index, adobe, 'SP', 'norm', **kw),
+        'predict-graph': lambda **kw: predict_figure(adobe, forecast, 'Adobe Stock Prediction', **kw),
+    }
+    cases = {
+        'complet': {'points': None},
+        'réduit': {},
+        f'zoom {ZOOM_DAYS} j': {'window': window},
+    }
+
+    print(f"{'graphique':<14} {'rendu':<12} {'taille':>10} {'latence':>10}")
+    for name, build in figures.items():
+        for case, kwargs in cases.items():
+            seconds, size = timed(lambda: build(**kwargs))
+            print(f"{name:<14} {case:<12} {size / 1024:>8.0f}ko {seconds * 1000:>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
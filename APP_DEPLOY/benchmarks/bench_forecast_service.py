@@ -0,0 +1,44 @@
+# Débit (tickers/minute) de ForecastService selon le nombre de processus, sur des données synthétiques.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_forecast_service [nombre de tickers]
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import benchmarks.common  # noqa: F401  (journaux cmdstanpy réduits)
+from components.forecast_service import ForecastService
+from components.market_data import MarketDataStore, FixtureFetcher
+
+START = '2016-01-01'
+
+
+def worker_counts():
+    counts, n = [], 1
+    while n < os.cpu_count():
+        counts.append(n)
+        n *= 2
+    return counts + [os.cpu_count()]
+
+
+def main():
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    tickers = [f'SYN{i:03d}' for i in range(n_tickers)]
+    end = pd.to_datetime('today')
+    print(f"{n_tickers} tickers, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'seconds':>9} {'tickers/min':>12} {'errors':>7}")
+
+    for workers in worker_counts():
+        # Répertoires neufs : chaque passe ajuste réellement tous les modèles
+        with tempfile.TemporaryDirectory() as tmp:
+            store = MarketDataStore(os.path.join(tmp, 'market'), FixtureFetcher())
+            service = ForecastService(store, START, end, models_dir=os.path.join(tmp, 'models'), max_workers=workers)
+            start = time.perf_counter()
+            service.run(tickers)
+            elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>8.1f}s {len(service.results) * 60 / elapsed:>12.1f} {len(service.errors):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Estimation GARCH(1,1) native contre la sortie des notebooks R (data/volatilite_estimee.csv) :
+# accord des volatilités, durée d'ajustement à froid et à chaud, récursion de variance vectorisée contre boucle Python,
+# et mise à jour O(1) de la variance à l'arrivée d'un rendement.
+# Les rendements sont ceux exportés par les notebooks (SquaredReturnsVolatility.csv à la racine du dépôt : carrés des
+# rendements logarithmiques d'Adobe). Le signe des rendements n'y figure pas : seul le GARCH symétrique à moyenne nulle,
+# qui ne dépend que des carrés, est comparé. Le GJR est mesuré sur une série simulée.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_garch
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from components.volatility import GarchModel, linear_recursion
+
+R_OUTPUT = os.path.join('data', 'volatilite_estimee.csv')
+R_RETURNS = os.path.join('..', 'SquaredReturnsVolatility.csv')
+NEW_RETURNS = 20
+REPEAT = 20
+
+
+def timed(func, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def python_recursion(c, beta, s0):
+    out, s = np.empty(len(c)), s0
+    for i, value in enumerate(c):
+        s = value + beta * s
+        out[i] = s
+    return out
+
+
+def simulate_gjr(n, seed=0):
+    rng = np.random.default_rng(seed)
+    eps, sigma2 = np.empty(n), 0.5
+    for i in range(n):
+        eps[i] = np.sqrt(sigma2) * rng.standard_normal()
+        sigma2 = 0.02 + (0.04 + 0.08 * (eps[i] < 0)) * eps[i] ** 2 + 0.9 * sigma2
+    return pd.Series(eps / 100, index=pd.bdate_range('2010-01-04', periods=n))
+
+
+def compare(kind, mean, returns, reference=None):
+    model, cold = timed(lambda: GarchModel(kind, mean).fit(returns))
+    previous = GarchModel(kind, mean).fit(returns.iloc[:-NEW_RETURNS])
+    warm_model, warm = timed(lambda: GarchModel(kind, mean).fit(returns, start=previous.params))
+    params = ', '.join(f'{name}={value:.4f}' for name, value in model.params.items())
+    print(f"{kind:<6} {len(returns)} rendements : {params}")
+    print(f"       ajustement à froid {cold * 1000:6.1f}ms ({model.iterations} itérations), "
+          f"à chaud après {NEW_RETURNS} nouveaux rendements {warm * 1000:6.1f}ms ({warm_model.iterations} itérations)")
+    if reference is not None:
+        sigma = model.volatility()['Sigma'].reindex(reference.index)
+        relative = np.abs(sigma / reference - 1)
+        print(f"       accord avec R : corrélation {np.corrcoef(sigma, reference)[0, 1]:.4f}, écart relatif médian "
+              f"{relative.median():.2%}, p95 {relative.quantile(0.95):.2%}")
+    return model
+
+
+def main():
+    reference = pd.read_csv(R_OUTPUT, index_col='Date', parse_dates=True)['Sigma'].dropna()
+    squared = pd.read_csv(R_RETURNS, index_col=0, parse_dates=True)['ADBE.Adjusted']
+    model = compare('garch', 'zero', np.sqrt(squared), reference)
+    compare('gjr', 'constant', simulate_gjr(len(squared)))
+
+    c = np.random.default_rng(1).random(len(squared))
+    _, blocks = timed(lambda: linear_recursion(c, 0.93, 1.0), repeat=200)
+    _, loop = timed(lambda: python_recursion(c, 0.93, 1.0))
+    print(f"récursion de variance sur {len(c)} jours : blocs {blocks * 1e6:.0f}µs, boucle Python {loop * 1e6:.0f}µs")
+
+    returns = np.sqrt(squared)
+    _, update = timed(lambda: model.update(returns.iloc[-1]), repeat=10000)
+    _, full = timed(lambda: model.variance(model.params, model.eps, model.backcast), repeat=200)
+    print(f"nouveau rendement : mise à jour O(1) {update * 1e6:.1f}µs, recalcul de l'historique {full * 1e6:.0f}µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# Débit du moteur d'indicateurs comparé au package ta (calcul complet et mise à jour incrémentale).
+# L'équivalence avec ta est vérifiée par tests/test_indicators.py.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_indicators
+import time
+
+import pandas as pd
+from ta.trend import SMAIndicator, EMAIndicator, MACD
+from ta.momentum import RSIIndicator
+
+from benchmarks.common import synthetic_ohlcv
+from components.indicators import IndicatorEngine
+
+HISTORY_LENGTHS = [1000, 4000, 16000, 64000]
+
+
+def ta_indicators(close):
+    # Référence : calcul historique de calculate_indicators avec le package ta
+    values = {f'RSI{w}Day': RSIIndicator(close, window=w).rsi() for w in (3, 9, 14, 30)}
+    values.update({f'MA{w}Day': SMAIndicator(close, window=w).sma_indicator() for w in (10, 30, 50)})
+    values['EMA10Day'] = EMAIndicator(close, window=10).ema_indicator()
+    macd = MACD(close)
+    values['MACD'] = macd.macd()
+    values['Signal'] = macd.macd_signal()
+    return {name: series.to_numpy() for name, series in values.items()}
+
+
+def best_of(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'history':>8} {'ta':>10} {'engine':>10} {'speedup':>8} {'updates/s':>11}")
+    for n in HISTORY_LENGTHS:
+        close = synthetic_ohlcv(n)['Close'].to_numpy()
+        ta_time = best_of(lambda: ta_indicators(pd.Series(close)))
+        engine_time = best_of(lambda: IndicatorEngine().compute(close))
+
+        engine = IndicatorEngine()
+        engine.compute(close)
+        start = time.perf_counter()
+        for c in close[-1000:]:
+            engine.update(c)
+        update_rate = 1000 / (time.perf_counter() - start)
+        print(f"{n:>8} {ta_time * 1000:>8.2f}ms {engine_time * 1000:>8.2f}ms {ta_time / engine_time:>7.1f}x {update_rate:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
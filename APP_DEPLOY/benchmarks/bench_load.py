@@ -0,0 +1,133 @@
+# Test de charge des prévisions (update_adobe_predict) avec plusieurs utilisateurs simultanés, callbacks exécutés
+# dans le serveur (BACKGROUND_CALLBACKS=0) puis en arrière-plan (DiskcacheManager).
+# Deux sessions successives envoient les mêmes requêtes : la seconde mesure la réutilisation des résultats.
+# Pendant la charge, une sonde mesure la latence d'un callback léger (graphique Adobe) pour voir si le serveur reste réactif.
+# Chaque serveur démarre dans un répertoire temporaire (modèles et backtest copiés, caches de prévision vides).
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_load
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.bench_slider import CALLBACKS, wait_ready
+from benchmarks.bench_startup import free_port
+
+USERS = 8
+REQUESTS_PER_USER = 6
+TICKERS = ['ADBE', 'MSFT', 'AAPL']
+HORIZONS = [5, 10, 20, 30, 60]
+BAND_MODES = ['prophet', 'bootstrap', 'garch']
+POLL_INTERVAL = 0.25
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PREDICT = {
+    'output': '..predict-graph.figure...predict-table.data...predict-table.columns...volatility-graph.figure...'
+              'predict-model.data...predict-stream-position.data..',
+    'outputs': [{'id': 'predict-graph', 'property': 'figure'}, {'id': 'predict-table', 'property': 'data'},
+                {'id': 'predict-table', 'property': 'columns'}, {'id': 'volatility-graph', 'property': 'figure'},
+                {'id': 'predict-model', 'property': 'data'}, {'id': 'predict-stream-position', 'property': 'data'}],
+}
+
+
+def predict_body(ticker, horizon, band_mode):
+    return dict(PREDICT, inputs=[
+        {'id': 'load-data-button', 'property': 'n_clicks', 'value': None},
+        {'id': 'future-days', 'property': 'value', 'value': horizon},
+        {'id': 'ticker-select', 'property': 'value', 'value': ticker},
+        {'id': 'band-select', 'property': 'value', 'value': band_mode},
+        {'id': 'predict-graph', 'property': 'relayoutData', 'value': None},
+        {'id': 'predict-ready', 'property': 'data', 'value': True},
+    ], changedPropIds=['future-days.value'], state=[])
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=300) as response:
+        return response.status, response.read()
+
+
+def call(base, body):
+    # Requête d'un callback comme le navigateur : en arrière-plan, la réponse initiale donne la tâche à interroger
+    start = time.perf_counter()
+    status, payload = post(f'{base}/_dash-update-component', body)
+    data = json.loads(payload) if status == 200 else {}
+    if 'cacheKey' in data:
+        poll = f"{base}/_dash-update-component?cacheKey={data['cacheKey']}&job={data['job']}"
+        while True:
+            time.sleep(POLL_INTERVAL)
+            status, payload = post(poll, body)
+            if status != 200 or 'response' in json.loads(payload):
+                break
+    return time.perf_counter() - start
+
+
+def probe(base, stop, latencies):
+    callback = CALLBACKS['adobe-graph']
+    body = {'output': callback['output'], 'outputs': callback['outputs'], 'inputs': callback['inputs']([2012, 2020]),
+            'changedPropIds': ['year-range-slider.value'], 'state': []}
+    while not stop.is_set():
+        latencies.append(call(base, body))
+        time.sleep(0.1)
+
+
+def session(base, requests):
+    stop, probe_latencies = threading.Event(), []
+    prober = threading.Thread(target=probe, args=(base, stop, probe_latencies))
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=USERS) as executor:
+        latencies = np.array(list(executor.map(lambda user: [call(base, body) for body in user], requests))).ravel()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+    return latencies, elapsed, np.array(probe_latencies)
+
+
+def run_server(background, requests):
+    workdir = tempfile.mkdtemp(prefix='bench_load_')
+    os.symlink(os.path.join(APP_DIR, 'data'), os.path.join(workdir, 'data'))
+    shutil.copytree(os.path.join(APP_DIR, 'models'), os.path.join(workdir, 'models'))
+    if os.path.isdir(os.path.join(APP_DIR, 'cache', 'backtest')):
+        shutil.copytree(os.path.join(APP_DIR, 'cache', 'backtest'), os.path.join(workdir, 'cache', 'backtest'))
+
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, MARKET_DATA_OFFLINE='1', NEWS_OFFLINE='1', BACKGROUND_CALLBACKS='1' if background else '0',
+               PYTHONPATH=APP_DIR)
+    server = subprocess.Popen([sys.executable, '-c', f'import app; app.app.run(port={port}, debug=False)'],
+                              cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_ready(base, ['adobe_data', 'forecast_model', 'watchlist_forecasts', 'backtest']):
+            print("serveur non disponible")
+            return
+        mode = 'arrière-plan' if background else 'serveur'
+        for name in ('session 1', 'session 2'):
+            latencies, elapsed, probes = session(base, requests)
+            print(f"{mode:<13} {name:<10} {len(latencies) / elapsed:6.2f} req/s  p50 {np.median(latencies) * 1000:6.0f}ms  "
+                  f"p95 {np.percentile(latencies, 95) * 1000:6.0f}ms  sonde p95 {np.percentile(probes, 95) * 1000:6.0f}ms")
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    rng = random.Random(0)
+    requests = [[predict_body(rng.choice(TICKERS), rng.choice(HORIZONS), rng.choice(BAND_MODES))
+                 for _ in range(REQUESTS_PER_USER)] for _ in range(USERS)]
+    print(f"{USERS} utilisateurs x {REQUESTS_PER_USER} prévisions, {os.cpu_count()} processeur(s)")
+    for background in (False, True):
+        run_server(background, requests)
+
+
+if __name__ == '__main__':
+    main()
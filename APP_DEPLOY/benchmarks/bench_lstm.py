@@ -0,0 +1,94 @@
+# Inférence CPU du BiLSTM de LSTM_Stock.ipynb (31 variables, 2 couches bidirectionnelles de 40 unités, séquences
+# de 40 séances) avec components.lstm, sur des poids aléatoires de même architecture.
+# Latence d'une séquence et débit par taille de lot : séquences passées une à une, passe par lot avec allocations
+# à chaque opération, et LstmForecaster (lot entier, tampons préalloués).
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_lstm
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from components.lstm import LSTM_FEATURES, LstmForecaster
+
+HIDDEN = 40
+LAYERS = 2
+SEQ_LENGTH = 40
+BATCHES = [1, 16, 64, 256, 1024]
+REPEATS = 5
+
+
+def export_random_weights(path, seed=0):
+    # Même contenu que l'export du notebook : state_dict, bornes du scaler, variables, longueur des séquences
+    rng = np.random.default_rng(seed)
+    bound = 1 / np.sqrt(HIDDEN)
+    weights = {}
+    for layer in range(LAYERS):
+        for suffix in ('', '_reverse'):
+            size = len(LSTM_FEATURES) if layer == 0 else 2 * HIDDEN
+            weights[f'lstm.weight_ih_l{layer}{suffix}'] = rng.uniform(-bound, bound, (4 * HIDDEN, size)).astype(np.float32)
+            weights[f'lstm.weight_hh_l{layer}{suffix}'] = rng.uniform(-bound, bound, (4 * HIDDEN, HIDDEN)).astype(np.float32)
+            weights[f'lstm.bias_ih_l{layer}{suffix}'] = rng.uniform(-bound, bound, 4 * HIDDEN).astype(np.float32)
+            weights[f'lstm.bias_hh_l{layer}{suffix}'] = rng.uniform(-bound, bound, 4 * HIDDEN).astype(np.float32)
+    weights['fc.weight'] = rng.uniform(-bound, bound, (1, 2 * HIDDEN)).astype(np.float32)
+    weights['fc.bias'] = rng.uniform(-bound, bound, 1).astype(np.float32)
+    np.savez_compressed(path, **weights, data_min=np.zeros(len(LSTM_FEATURES)), data_max=np.ones(len(LSTM_FEATURES)),
+                        features=np.array(LSTM_FEATURES), seq_length=SEQ_LENGTH)
+    return weights
+
+
+def allocating_forward(weights, x):
+    # Passe par lot écrite directement : chaque opération alloue son résultat, les deux directions de la dernière
+    # couche parcourent toute la séquence
+    sigmoid = lambda z: 1 / (1 + np.exp(-z))
+    layer_input = x
+    for layer in range(LAYERS):
+        outputs = []
+        for suffix in ('', '_reverse'):
+            w_ih, w_hh = weights[f'lstm.weight_ih_l{layer}{suffix}'], weights[f'lstm.weight_hh_l{layer}{suffix}']
+            bias = weights[f'lstm.bias_ih_l{layer}{suffix}'] + weights[f'lstm.bias_hh_l{layer}{suffix}']
+            h = np.zeros((len(x), HIDDEN), dtype=np.float32)
+            c = np.zeros((len(x), HIDDEN), dtype=np.float32)
+            out = [None] * SEQ_LENGTH
+            for t in (range(SEQ_LENGTH) if suffix == '' else range(SEQ_LENGTH - 1, -1, -1)):
+                gates = layer_input[:, t] @ w_ih.T + h @ w_hh.T + bias
+                i, f, g, o = np.split(gates, 4, axis=1)
+                c = sigmoid(f) * c + sigmoid(i) * np.tanh(g)
+                h = sigmoid(o) * np.tanh(c)
+                out[t] = h
+            outputs.append(np.stack(out, axis=1))
+        layer_input = np.concatenate(outputs, axis=2)
+    return (layer_input[:, -1] @ weights['fc.weight'].T + weights['fc.bias'])[:, 0]
+
+
+def best(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'lstm.npz')
+        weights = export_random_weights(path)
+        engine = LstmForecaster(path)
+        print(f"modèle exporté : {os.path.getsize(path) / 1024:.0f} Kio, PyTorch importé : {'torch' in sys.modules}")
+
+    rng = np.random.default_rng(1)
+    print(f"{'lot':>5} {'une à une':>14} {'lot, allocations':>18} {'LstmForecaster':>16} {'séquences/s':>12}  écart max")
+    for batch in BATCHES:
+        x = rng.random((batch, SEQ_LENGTH, len(LSTM_FEATURES)), dtype=np.float32)
+        # Séquences une à une : mesurées jusqu'à 256 séquences
+        single = f"{best(lambda: [engine.forward(x[i:i + 1]) for i in range(batch)])[0] * 1e3:.2f} ms" if batch <= 256 else '-'
+        allocating, expected = best(lambda: allocating_forward(weights, x))
+        batched, result = best(lambda: engine.forward(x))
+        print(f"{batch:>5} {single:>14} {allocating * 1e3:>15.2f} ms {batched * 1e3:>13.2f} ms "
+              f"{batch / batched:>12.0f}  {np.abs(result - expected).max():.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Alignement des séries FRED mensuelles (data/fred) sur les séances de cotation, avec délai de publication.
+# Jointure « as-of » ligne par ligne (boucle Python), pd.merge_asof et searchsorted vectorisé de MacroFeatureStore ;
+# puis mises à jour du stockage : construction complète, sans changement, nouvelle publication mensuelle, nouvelle séance.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_macro
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from components.macro import MACRO_SERIES, MacroFeatureStore, asof, read_fred
+
+SOURCE_DIR = os.path.join('data', 'fred')
+DATES = pd.bdate_range('2010-01-04', '2024-12-31', name='Date')
+REPEATS = 5
+
+
+def best(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3, result
+
+
+def loop_asof(observations, dates):
+    # Référence : dernière observation publiée recherchée date par date
+    values = []
+    for date in dates:
+        published = observations[observations.index <= date]
+        values.append(published.iloc[-1] if len(published) else np.nan)
+    return np.array(values)
+
+
+def merge_asof(observations, dates):
+    frame = observations.rename('value').reset_index()
+    return pd.merge_asof(pd.DataFrame({'Date': dates}), frame, left_on='Date', right_on='Published')['value'].to_numpy()
+
+
+def main():
+    observations = {name: read_fred(os.path.join(SOURCE_DIR, f'{name}.csv'), lag) for name, lag in MACRO_SERIES.items()}
+    print(f"{len(observations)} séries, {len(DATES)} séances, meilleur de {REPEATS} passages")
+    reference = None
+    for label, join in (('boucle par date', loop_asof), ('pd.merge_asof', merge_asof), ('searchsorted', asof)):
+        elapsed, matrix = best(lambda: np.column_stack([join(values, DATES) for values in observations.values()]))
+        reference = matrix if reference is None else reference
+        assert np.allclose(matrix, reference, equal_nan=True)
+        print(f"{'alignement ' + label:<32} {elapsed:>9.2f} ms")
+
+    with tempfile.TemporaryDirectory() as source, tempfile.TemporaryDirectory() as cache:
+        for name in MACRO_SERIES:
+            shutil.copy(os.path.join(SOURCE_DIR, f'{name}.csv'), source)
+        store = MacroFeatureStore(source, cache)
+
+        def rebuild():
+            for name in os.listdir(cache):
+                os.remove(os.path.join(cache, name))
+            return store.update(DATES)
+
+        steps = [('construction complète', rebuild), ('sans changement', lambda: store.update(DATES))]
+        for label, update in steps:
+            elapsed, _ = best(update)
+            print(f"{'stockage ' + label:<32} {elapsed:>9.2f} ms  lignes recalculées {sum(store.updated_rows.values())}")
+
+        # Nouvelle publication de l'indice des prix, puis une séance de plus
+        with open(os.path.join(source, 'CPIAUCSL.csv'), 'a') as f:
+            f.write('2024-11-01,316.0\n')
+        start = time.perf_counter()
+        store.update(DATES)
+        print(f"{'stockage nouvelle publication':<32} {(time.perf_counter() - start) * 1e3:>9.2f} ms  lignes recalculées {sum(store.updated_rows.values())}")
+        start = time.perf_counter()
+        aligned = store.update(DATES.append(pd.DatetimeIndex(['2025-01-02'])))
+        print(f"{'stockage nouvelle séance':<32} {(time.perf_counter() - start) * 1e3:>9.2f} ms  lignes recalculées {sum(store.updated_rows.values())}")
+        full = MacroFeatureStore(source, os.path.join(cache, 'full')).update(aligned.index)
+        assert np.allclose(full.to_numpy(), aligned.to_numpy(), equal_nan=True)
+
+
+if __name__ == '__main__':
+    main()
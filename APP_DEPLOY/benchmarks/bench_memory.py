@@ -0,0 +1,69 @@
+# Mémoire par worker des jeux de données préparés : copie privée dans chaque processus (avant) contre projection
+# mémoire en lecture seule d'un fichier Arrow partagé (SharedDatasets).
+# Chaque worker charge tous les jeux, lit toutes leurs colonnes, puis mesure sa mémoire pendant que les autres
+# workers sont encore en vie : RSS (pages résidentes, partagées comprises), PSS (pages partagées divisées entre les
+# processus qui les utilisent) et USS (pages propres au processus), nettes de la mémoire mesurée avant le chargement.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_memory
+import multiprocessing
+import tempfile
+
+import numpy as np
+import psutil
+
+from benchmarks.common import synthetic_ohlcv, with_indicators
+from components.shared_data import SharedDatasets
+
+WORKERS = 4
+HISTORY_LENGTH = 4400
+# Jeux de l'application (Adobe, 4 tickers suivis, 2 indices) puis une liste de suivi étendue
+DATASET_COUNTS = [7, 100]
+
+
+def memory():
+    info = psutil.Process().memory_full_info()
+    return np.array([info.rss, info.pss, info.uss]) / 2**20
+
+
+def worker(directory, paths, shared, barrier, results):
+    datasets = SharedDatasets(directory)
+    before = memory()
+    # Avant : chaque worker prépare ses propres jeux à partir des cours
+    frames = [datasets.open(path) if shared else with_indicators(synthetic_ohlcv(HISTORY_LENGTH, seed=i))
+              for i, path in enumerate(paths)]
+    # Lecture de chaque colonne (sans copie) : toutes les pages sont résidentes au moment de la mesure
+    checksum = sum(float(np.nansum(frame[column].to_numpy())) for frame in frames for column in frame.select_dtypes('number'))
+    barrier.wait()
+    results.put((memory() - before, checksum))
+    barrier.wait()
+
+
+def measure(directory, paths, shared):
+    context = multiprocessing.get_context('spawn')
+    barrier, results = context.Barrier(WORKERS), context.Queue()
+    workers = [context.Process(target=worker, args=(directory, paths, shared, barrier, results)) for _ in range(WORKERS)]
+    for process in workers:
+        process.start()
+    measures = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    return np.mean([m for m, _ in measures], axis=0)
+
+
+def main():
+    print(f"{WORKERS} workers, {HISTORY_LENGTH} jours par jeu")
+    print(f"{'jeux':>5} {'taille':>9} {'mode':<9} {'RSS':>8} {'PSS':>8} {'USS':>8}  (Mio par worker)")
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = SharedDatasets(directory)
+        for count in DATASET_COUNTS:
+            frames = [with_indicators(synthetic_ohlcv(HISTORY_LENGTH, seed=i)) for i in range(count)]
+            paths = [datasets.path(f'T{i}', datasets.fingerprint(frame)) for i, frame in enumerate(frames)]
+            for i, frame in enumerate(frames):
+                datasets.publish(f'T{i}', frame)
+            size = sum(frame.memory_usage(deep=True).sum() for frame in frames) / 2**20
+            for mode, shared in (('copie', False), ('partagé', True)):
+                rss, pss, uss = measure(directory, paths, shared)
+                print(f"{count:>5} {size:>6.1f}Mio {mode:<9} {rss:>8.1f} {pss:>8.1f} {uss:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
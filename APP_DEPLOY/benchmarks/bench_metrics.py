@@ -0,0 +1,55 @@
+# Coût de l'instrumentation des callbacks (components.metrics) : requêtes /_dash-update-component sur une
+# application Dash minimale, sans puis avec instrument_callbacks, et durée d'un export /metrics.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_metrics
+import time
+
+import numpy as np
+from dash import Dash, Input, Output, dcc, html
+
+from components.metrics import instrument_callbacks, metrics
+
+REQUESTS = 2000
+REPEATS = 5
+
+
+def make_app(instrumented):
+    app = Dash(__name__)
+    app.layout = html.Div([dcc.Input(id='value', value='1'), html.Div(id='echo')])
+
+    @app.callback(Output('echo', 'children'), Input('value', 'value'))
+    def echo(value):
+        return value
+
+    if instrumented:
+        instrument_callbacks(app)
+    return app
+
+
+def per_request(app):
+    client = app.server.test_client()
+    client.get('/')
+    body = {'output': 'echo.children', 'outputs': {'id': 'echo', 'property': 'children'},
+            'inputs': [{'id': 'value', 'property': 'value', 'value': '1'}], 'changedPropIds': ['value.value'], 'state': []}
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            client.post('/_dash-update-component', json=body)
+        timings.append((time.perf_counter() - start) / REQUESTS)
+    return min(timings) * 1e6
+
+
+def main():
+    plain = per_request(make_app(False))
+    instrumented = per_request(make_app(True))
+    print(f"{REQUESTS} requêtes x {REPEATS}, meilleur passage")
+    print(f"{'sans instrumentation':<24} {plain:>8.1f} µs/requête")
+    print(f"{'avec instrumentation':<24} {instrumented:>8.1f} µs/requête  (+{instrumented - plain:.1f} µs)")
+    start = time.perf_counter()
+    for _ in range(100):
+        text = metrics.render()
+    print(f"{'export /metrics':<24} {(time.perf_counter() - start) * 1e4:>8.1f} µs ({len(text)} octets)")
+
+
+if __name__ == '__main__':
+    main()
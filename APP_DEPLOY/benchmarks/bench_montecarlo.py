@@ -0,0 +1,47 @@
+# Durée de la simulation Monte Carlo des intervalles de prévision selon le nombre de trajectoires et l'horizon,
+# avec résidus rééchantillonnés et innovations GARCH, comparée à une prévision récursive déterministe (predict).
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_montecarlo
+import time
+
+import numpy as np
+
+from benchmarks.common import synthetic_ohlcv, with_indicators
+from components.prophet import ProphetForecast
+from components.volatility import GarchModel, log_returns
+
+HISTORY_LENGTH = 3700
+PATHS = [500, 2000, 10000]
+HORIZONS = [5, 20, 60]
+
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    data = with_indicators(synthetic_ohlcv(HISTORY_LENGTH))
+    forecaster = ProphetForecast(data)
+    forecaster.fit_model()
+    garch = GarchModel().fit(log_returns(data['Close']))
+    rng = np.random.default_rng(0)
+
+    # Sans choc, une trajectoire simulée reproduit exactement la prévision récursive
+    _, prices = forecaster.simulate(HORIZONS[-1], np.zeros((1, HORIZONS[-1])))
+    print(f"écart trajectoire sans choc / predict : {np.max(np.abs(prices[0] - forecaster.predict(HORIZONS[-1])['yhat'].tail(HORIZONS[-1]).to_numpy())):.1e}")
+
+    print(f"{'trajectoires':>12} {'horizon':>8} {'predict':>9} {'bootstrap':>10} {'garch':>9}")
+    for horizon in HORIZONS:
+        single = timed(lambda: forecaster.forecast_steps(horizon))
+        for paths in PATHS:
+            bootstrap = timed(lambda: forecaster.simulation_bands(*forecaster.simulate(horizon, forecaster.bootstrap_shocks(horizon, paths, rng))))
+            innovations = timed(lambda: forecaster.simulation_bands(*forecaster.simulate(horizon, garch.simulate(horizon, paths, rng))))
+            print(f"{paths:>12} {horizon:>8} {single * 1000:>7.0f}ms {bootstrap * 1000:>8.0f}ms {innovations * 1000:>7.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
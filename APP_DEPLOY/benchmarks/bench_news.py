@@ -0,0 +1,48 @@
+# Ingestion des actualités contre un NewsAPI local à latence simulée : requêtes séquentielles (une connexion)
+# contre requêtes concurrentes sur la session partagée, puis rafraîchissement à stockage déjà rempli.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_news
+import os
+import tempfile
+import time
+
+from components.news import NewsClient, NewsIngestor, NewsStore
+from components.news_stub import NewsStubServer
+
+QUERIES = ['adobe', 'photoshop']
+DAYS = 14
+ARTICLES_PER_DAY = 250
+LATENCY = 0.1
+
+
+def ingest(url, directory, concurrency):
+    store = NewsStore(os.path.join(directory, f'news_{concurrency}.sqlite'))
+    ingestor = NewsIngestor(NewsClient('bench', base_url=url, concurrency=concurrency), store, queries=QUERIES, days=DAYS)
+    start = time.perf_counter()
+    summary = ingestor.refresh()
+    return ingestor, summary, time.perf_counter() - start
+
+
+def main():
+    stub = NewsStubServer(articles_per_day=ARTICLES_PER_DAY, latency=LATENCY, failures=2)
+    url = stub.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            print(f"{len(QUERIES)} requêtes x {DAYS} jours, {ARTICLES_PER_DAY} articles/jour, latence {LATENCY * 1000:.0f}ms")
+            for concurrency in (1, 4, 8):
+                before = stub.requests
+                ingestor, summary, seconds = ingest(url, directory, concurrency)
+                print(f"concurrence {concurrency} : {seconds:6.2f}s, {stub.requests - before} requêtes HTTP, "
+                      f"{summary['added']} articles, {len(summary['errors'])} échec(s)")
+
+            # Second rafraîchissement : seules les journées non terminées sont redemandées
+            before = stub.requests
+            start = time.perf_counter()
+            summary = ingestor.refresh()
+            print(f"rafraîchissement suivant : {time.perf_counter() - start:6.2f}s, {stub.requests - before} requêtes HTTP, "
+                  f"{summary['added']} nouvel(s) article(s)")
+    finally:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
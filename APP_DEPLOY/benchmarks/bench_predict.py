@@ -0,0 +1,35 @@
+# Coût par pas de la prévision récursive de ProphetForecast.predict selon la longueur de l'historique.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_predict
+import time
+
+from benchmarks.common import synthetic_ohlcv, with_indicators
+from components.prophet import ProphetForecast
+
+HISTORY_LENGTHS = [1000, 2000, 4000, 8000]
+SHORT, LONG = 5, 60
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'history':>8} {'predict(' + str(SHORT) + ')':>12} {'predict(' + str(LONG) + ')':>12} {'ms/step':>9}")
+    for n in HISTORY_LENGTHS:
+        forecaster = ProphetForecast(with_indicators(synthetic_ohlcv(n)))
+        forecaster.fit_model()
+
+        short = timed(forecaster.predict, SHORT)
+        long = timed(forecaster.predict, LONG)
+        # La différence élimine la prédiction complète finale et ne garde que le coût des pas récursifs
+        per_step = (long - short) / (LONG - SHORT)
+        print(f"{n:>8} {short:>11.3f}s {long:>11.3f}s {per_step * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Registre des modèles (components.registry) : coût d'une prise de référence (acquire) et remplacements de version
+# pendant que des threads servent des prévisions. Chaque requête tient sa version jusqu'à la fin : aucune ne doit
+# échouer, et une version remplacée n'est libérée qu'après la dernière requête qui l'utilise.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_registry
+import threading
+import time
+
+import numpy as np
+
+from components.registry import ModelRegistry
+
+THREADS = 8
+DURATION = 3.0
+SWAP_INTERVAL = 0.05
+ACQUIRES = 100000
+
+
+class Forecaster:
+    # Modèle factice : une prévision coûte un produit matriciel (~1 ms), comme predict sur un modèle chargé
+    def __init__(self, number):
+        self.fingerprint = f'{number:016x}'
+        self.weights = np.random.default_rng(number).standard_normal((200, 200))
+        self.released = False
+
+    def predict(self):
+        if self.released:
+            raise RuntimeError("version libérée pendant son utilisation")
+        return float((self.weights @ self.weights).sum())
+
+
+def acquire_cost(registry):
+    start = time.perf_counter()
+    for _ in range(ACQUIRES):
+        with registry.acquire('ADBE'):
+            pass
+    return (time.perf_counter() - start) / ACQUIRES * 1e6
+
+
+def main():
+    evicted = []
+
+    def on_evict(version):
+        version.forecaster.released = True
+        evicted.append(version.number)
+
+    registry = ModelRegistry(on_evict=on_evict)
+    registry.publish('ADBE', Forecaster(1))
+    print(f"acquire + release        {acquire_cost(registry):>8.2f} µs ({ACQUIRES} appels, sans concurrence)")
+
+    stop = threading.Event()
+    latencies, failures, live = [], [], []
+
+    def serve():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with registry.acquire('ADBE') as version:
+                    version.forecaster.predict()
+            except Exception as e:
+                failures.append(repr(e))
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=serve) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    number = 1
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        time.sleep(SWAP_INTERVAL)
+        number += 1
+        registry.reload('ADBE', Forecaster, number).result()
+        live.append(len(registry.status()['ADBE']))
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies = np.array(latencies) * 1e3
+    print(f"{THREADS} threads pendant {DURATION:.0f} s, une nouvelle version toutes les {SWAP_INTERVAL * 1e3:.0f} ms")
+    print(f"{'requêtes servies':<24} {len(latencies):>8}   en échec : {len(failures)}")
+    print(f"{'latence':<24} p50 {np.percentile(latencies, 50):.2f} ms   p99 {np.percentile(latencies, 99):.2f} ms")
+    print(f"{'versions publiées':<24} {number - 1:>8}   libérées : {len(evicted)}   "
+          f"en mémoire : max {max(live)}, fin {len(registry.status()['ADBE'])}")
+    registry.stop()
+
+
+if __name__ == '__main__':
+    main()
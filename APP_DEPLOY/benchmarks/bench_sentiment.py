@@ -0,0 +1,49 @@
+# Débit (articles/s) de l'analyse de sentiment : Series.apply article par article, SentimentScorer par lots
+# dans le processus ou sur un pool de processus, puis avec tous les scores déjà en cache.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_sentiment
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from components.news_stub import stub_articles
+from components.sentiment import SentimentScorer, classify, load_analyzer
+
+ARTICLES = 20000
+
+
+def synthetic_texts(n):
+    # Titres et descriptions du serveur NewsAPI local, rendus uniques comme des articles réels
+    day, texts = date(2024, 1, 1), []
+    while len(texts) < n:
+        texts.extend(f"{a['title']} ({len(texts) + i}) {a['description']}" for i, a in enumerate(stub_articles('adobe', day, 100)))
+        day += timedelta(days=1)
+    return pd.Series(texts[:n])
+
+
+def rate(func):
+    start = time.perf_counter()
+    func()
+    return ARTICLES / (time.perf_counter() - start)
+
+
+def main():
+    texts = synthetic_texts(ARTICLES)
+    sia = load_analyzer()
+    print(f"{ARTICLES} articles, {os.cpu_count()} processeur(s)")
+    print(f"Series.apply             : {rate(lambda: texts.apply(lambda t: classify(sia.polarity_scores(t)['compound']))):8.0f} articles/s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        scorer = SentimentScorer(os.path.join(directory, 'serial.sqlite'), parallel_threshold=float('inf'))
+        print(f"lots, sans cache         : {rate(lambda: scorer.classify(texts)):8.0f} articles/s")
+
+        scorer = SentimentScorer(os.path.join(directory, 'pool.sqlite'), parallel_threshold=0, max_workers=max(2, os.cpu_count()))
+        print(f"pool de processus        : {rate(lambda: scorer.classify(texts)):8.0f} articles/s")
+        print(f"cache (déjà analysés)    : {rate(lambda: scorer.classify(texts)):8.0f} articles/s "
+              f"({scorer.hits} hits, {scorer.misses} misses)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# Latence des callbacks de l'analyse technique pendant des glissements rapides du curseur d'années.
+# Filtrage par masque booléen contre tranche positionnelle de YearIndex, puis requêtes réelles au serveur Dash :
+# premier balayage (graphiques construits) et balayages suivants (graphiques mémorisés).
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_slider
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks.bench_startup import free_port, get
+from benchmarks.common import synthetic_ohlcv, with_indicators
+from components.year_index import YearIndex
+
+TIMEOUT = 300
+HISTORY_LENGTH = 4200
+SWEEPS = 3
+
+CALLBACKS = {
+    'adobe-graph': {
+        'output': 'adobe-graph.figure',
+        'outputs': {'id': 'adobe-graph', 'property': 'figure'},
+        'inputs': lambda years: [
+            {'id': 'year-range-slider', 'property': 'value', 'value': years},
+            {'id': 'adobe-graph', 'property': 'relayoutData', 'value': None},
+            {'id': 'ready-components', 'property': 'data', 'value': []},
+        ],
+    },
+    'index-graph': {
+        'output': 'index-graph.figure',
+        'outputs': {'id': 'index-graph', 'property': 'figure'},
+        'inputs': lambda years: [
+            {'id': 'year-range-slider', 'property': 'value', 'value': years},
+            {'id': 'index-select', 'property': 'value', 'value': 'SP'},
+            {'id': 'radio-analyse', 'property': 'value', 'value': 'rend'},
+            {'id': 'index-graph', 'property': 'relayoutData', 'value': None},
+            {'id': 'ready-components', 'property': 'data', 'value': []},
+        ],
+    },
+    'line-chart': {
+        'output': '..line-chart.figure...data-table.data...data-table.columns..',
+        'outputs': [{'id': 'line-chart', 'property': 'figure'}, {'id': 'data-table', 'property': 'data'},
+                    {'id': 'data-table', 'property': 'columns'}],
+        'inputs': lambda years: [
+            {'id': 'year-range-slider', 'property': 'value', 'value': years},
+            {'id': 'ready-components', 'property': 'data', 'value': []},
+        ],
+    },
+}
+
+
+def drag(first_year, last_year):
+    # Poignée de fin tirée d'un bout à l'autre puis ramenée, poignée de début fixe
+    ends = list(range(first_year + 1, last_year + 1))
+    return [[first_year, end] for end in ends + ends[::-1]]
+
+
+def time_slicing(repeat=2000):
+    data = with_indicators(synthetic_ohlcv(HISTORY_LENGTH))
+    years = YearIndex(data.index.year)
+    ranges = [(2012 + k % 5, 2018 + k % 7) for k in range(repeat)]
+
+    start = time.perf_counter()
+    for start_year, end_year in ranges:
+        data[(data.index.year >= start_year) & (data.index.year <= end_year)]
+    mask = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for start_year, end_year in ranges:
+        data.iloc[years.rows(start_year, end_year)]
+    positional = (time.perf_counter() - start) / repeat
+    print(f"filtrage {HISTORY_LENGTH} lignes : masque {mask * 1e6:.0f}µs, YearIndex {positional * 1e6:.0f}µs")
+
+
+def post(base, callback, years):
+    body = json.dumps({
+        'output': callback['output'],
+        'outputs': callback['outputs'],
+        'inputs': callback['inputs'](years),
+        'changedPropIds': ['year-range-slider.value'],
+        'state': [],
+    }).encode()
+    request = urllib.request.Request(f'{base}/_dash-update-component', data=body,
+                                     headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def wait_ready(base, names):
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIMEOUT:
+        status, body = get(f'{base}/healthz')
+        components = json.loads(body or b'{}').get('components', {})
+        if components and all(components[name]['state'] == 'ready' for name in names):
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def main():
+    time_slicing()
+
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, MARKET_DATA_OFFLINE='1', NEWS_OFFLINE='1')
+    server = subprocess.Popen(
+        [sys.executable, '-c', f'import app; app.app.run(port={port}, debug=False)'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_ready(base, ['adobe_data', 'sp_data', 'cac_data', 'df_sentiment']):
+            print("données non disponibles")
+            return
+        moves = drag(2010, int(time.strftime('%Y')))
+        print(f"{len(moves)} positions par balayage")
+        print(f"{'callback':<12} {'balayage':>9} {'moyenne':>9} {'p95':>9}")
+        for name, callback in CALLBACKS.items():
+            for sweep in range(SWEEPS):
+                latencies = np.array([post(base, callback, years) for years in moves]) * 1000
+                print(f"{name:<12} {sweep + 1:>9} {latencies.mean():>7.1f}ms {np.percentile(latencies, 95):>7.1f}ms")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Temps jusqu'au premier octet servi, jusqu'à la disponibilité (/readyz, composants nécessaires à l'interface)
+# et jusqu'à la fin de la construction de tous les composants au démarrage de l'application.
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_startup
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+TIMEOUT = 300
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+    except OSError:
+        return None, b''
+
+
+def main():
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, MARKET_DATA_OFFLINE='1', NEWS_OFFLINE='1')
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-c', f'import app; app.app.run(port={port}, debug=False)'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        first_byte = None
+        while time.perf_counter() - start < TIMEOUT:
+            status, _ = get(f'{base}/')
+            if status == 200:
+                first_byte = time.perf_counter() - start
+                break
+            time.sleep(0.05)
+        print(f"time to first byte : {first_byte:.2f}s" if first_byte else "time to first byte : timeout")
+
+        # Disponibilité (/readyz -> 200), puis fin de construction : tous les composants sont prêts, ou en échec
+        components, ready = {}, None
+        while time.perf_counter() - start < TIMEOUT:
+            status, body = get(f'{base}/readyz')
+            components = json.loads(body or b'{}').get('components', {})
+            if status == 200 and ready is None:
+                ready = time.perf_counter() - start
+            if components and all(c['state'] in ('ready', 'failed') for c in components.values()):
+                break
+            time.sleep(0.2)
+        print(f"ready (/readyz -> 200) : {ready:.2f}s" if ready else "ready (/readyz -> 200) : timeout")
+        print(f"all components settled : {time.perf_counter() - start:.2f}s (/readyz -> {status})")
+        for name, component in components.items():
+            seconds = f"{component['seconds']:.2f}s" if component['seconds'] is not None else '-'
+            print(f"  {name:<16} {component['state']:<8} {seconds:>8} {'optional' if component['optional'] else '':<8} {component['error'] or ''}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Mode streaming : octets envoyés et durée côté serveur par nouvelle séance, en reconstruisant les graphiques des cours
+# (indicateurs recalculés sur tout l'historique, figure complète) ou en n'envoyant que les nouveaux points (extendData,
+# indicateurs avancés séance par séance). Les séances viennent du flux simulé local (components.streaming).
+# Lancement depuis APP_DEPLOY : python -m benchmarks.bench_streaming
+import time
+
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+from benchmarks.common import synthetic_ohlcv, with_indicators
+from components.figures import adobe_figure, adobe_extend, predict_figure, predict_extend
+from components.market_data import OHLCV_COLUMNS
+from components.streaming import LiveSeries, SimulatedFeed
+
+# Environ seize ans de jours ouvrés, comme l'historique Adobe depuis 2010
+HISTORY_LENGTH = 4200
+UPDATES = 50
+
+
+def forecast_of(data):
+    # Prévision factice couvrant l'historique, de la forme renvoyée par ProphetForecast.predict
+    return pd.DataFrame({'ds': data.index, 'yhat': data['Close'].rolling(20, min_periods=1).mean().to_numpy()})
+
+
+def rebuild(raw, feed, figure):
+    # Chaque séance : indicateurs recalculés sur tout l'historique, figure complète renvoyée
+    sizes, start = [], time.perf_counter()
+    for _ in range(UPDATES):
+        raw = pd.concat([raw, feed.bars('ADBE', raw.iloc[-1])])
+        sizes.append(len(to_json_plotly(figure(with_indicators(raw[OHLCV_COLUMNS].copy()))).encode()))
+    return (time.perf_counter() - start) / UPDATES, sum(sizes) / UPDATES
+
+
+def stream(history, feed, extend):
+    # Chaque séance : indicateurs avancés d'un pas, seuls les nouveaux points sont envoyés ;
+    # l'état des indicateurs en fin d'historique est calculé une fois, à la création de la série
+    live = LiveSeries('ADBE', history, feed)
+    last, sizes, start = None, [], time.perf_counter()
+    for _ in range(UPDATES):
+        live.poll()
+        bars, last = live.since(last)
+        sizes.append(len(to_json_plotly(extend(bars)).encode()))
+    return (time.perf_counter() - start) / UPDATES, sum(sizes) / UPDATES
+
+
+def main():
+    raw = synthetic_ohlcv(HISTORY_LENGTH)
+    history = with_indicators(raw.copy())
+    feed = SimulatedFeed()
+    cases = [
+        ('adobe-graph', lambda data: adobe_figure(data, extendable=True), adobe_extend),
+        ('predict-graph', lambda data: predict_figure(data, forecast_of(data), 'Adobe Stock Prediction'), predict_extend),
+    ]
+    print(f"{HISTORY_LENGTH} séances d'historique, {UPDATES} nouvelles séances, une par mise à jour")
+    print(f"{'graphique':<15} {'mode':<12} {'octets/màj':>12} {'ms/màj':>10}")
+    for name, figure, extend in cases:
+        full_seconds, full_bytes = rebuild(raw, feed, figure)
+        stream_seconds, stream_bytes = stream(history, feed, extend)
+        print(f"{name:<15} {'figure':<12} {full_bytes:>12.0f} {full_seconds * 1e3:>10.2f}")
+        print(f"{name:<15} {'extendData':<12} {stream_bytes:>12.0f} {stream_seconds * 1e3:>10.2f}"
+              f"   (x{full_bytes / stream_bytes:.0f} moins d'octets)")
+
+
+if __name__ == '__main__':
+    main()
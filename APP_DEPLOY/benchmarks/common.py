@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from cmdstanpy.utils.logging import get_logger
+
+from components.datasets import prepare_forecast_data
+
+# Les journaux de cmdstanpy masqueraient les résultats des benchmarks
+get_logger().setLevel('WARNING')
+
+
+def synthetic_ohlcv(n, seed=0, start='2010-01-04'):
+    # Marche aléatoire géométrique sur les jours ouvrés, au format des données yfinance de l'application
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    df = pd.DataFrame({
+        'Close': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Open': close + rng.normal(0, 0.005, n) * close,
+        'Volume': rng.integers(1_000_000, 5_000_000, n),
+    }, index=pd.bdate_range(start, periods=n, name='Date'))
+    return df
+
+
+def with_indicators(df):
+    # Même préparation que les données Adobe de l'application
+    return prepare_forecast_data(df)
@@ -0,0 +1,53 @@
+import threading
+
+from dash import DiskcacheManager
+
+
+class ForkSafeDiskcacheManager(DiskcacheManager):
+    # DiskcacheManager crée le processus de chaque tâche par fork du serveur, qui sert les requêtes dans des threads.
+    # Un fork pendant qu'un autre thread est dans SQLite (lecture du résultat d'une tâche en cours) copie le verrou
+    # d'allocation de SQLite tenu : le processus fils reste bloqué à sa première écriture dans le cache.
+    # Les forks et les accès du serveur au cache sont donc sérialisés par un verrou commun au processus.
+    # Un résultat déjà en cache (mêmes entrées, mêmes valeurs de cache_by) est renvoyé sans créer de processus :
+    # la tâche 0 ne désigne aucun processus, le résultat est lu à la première interrogation du navigateur.
+    lock = threading.RLock()
+
+    def __init__(self, cache=None, cache_by=None, expire=None):
+        super().__init__(cache, cache_by, expire)
+        # Appels servis depuis le cache et appels ayant lancé une tâche
+        self.hits = 0
+        self.misses = 0
+
+    def call_job_fn(self, key, job_fn, args, context):
+        with self.lock:
+            if self.cache_by and self.handle.get(key) is not None:
+                self.hits += 1
+                return 0
+            self.misses += 1
+            return super().call_job_fn(key, job_fn, args, context)
+
+    def terminate_job(self, job):
+        if job is None or int(job) == 0:
+            return
+        with self.lock:
+            return super().terminate_job(job)
+
+    def clear_cache_entry(self, key):
+        with self.lock:
+            return super().clear_cache_entry(key)
+
+    def get_progress(self, key):
+        with self.lock:
+            return super().get_progress(key)
+
+    def result_ready(self, key):
+        with self.lock:
+            return super().result_ready(key)
+
+    def get_result(self, key, job):
+        with self.lock:
+            return super().get_result(key, job)
+
+    def get_updated_props(self, key):
+        with self.lock:
+            return super().get_updated_props(key)
@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from diskcache import Cache
+
+from components.prophet import FORECAST_VERSION, ProphetForecast
+
+
+def run_fold(train, horizon, features):
+    # Exécuté dans un processus du pool : ajustement sur la fenêtre d'entraînement et prévision récursive
+    forecaster = ProphetForecast(train, features=features)
+    forecaster.fit_model()
+    return forecaster.predict(horizon)[['ds', 'yhat']].tail(horizon)
+
+
+class Backtest:
+    # Backtest walk-forward de ProphetForecast : à chaque date de coupure, ajustement sur la fenêtre d'entraînement
+    # (croissante ou glissante) puis comparaison des `horizon` jours prévus aux cours réels.
+    # Les coupures sont ancrées sur le début de l'historique : après un ajout de données, les plis existants
+    # gardent la même fenêtre et leurs prévisions sont relues depuis le cache disque.
+    # initial_rows : nombre de séances (lignes de data) de la première fenêtre d'entraînement, et longueur des
+    # fenêtres glissantes ; features : régresseurs du modèle évalué (DEFAULT_FEATURES si None)
+    def __init__(self, data, horizon=10, step=63, initial_rows=2016, window='expanding', features=None,
+                 max_workers=None, cache_dir='cache/backtest', target='Close', mp_context=None):
+        if window not in ('expanding', 'rolling'):
+            raise ValueError("window doit valoir 'expanding' ou 'rolling'")
+        self.data = data
+        self.horizon = horizon
+        self.step = step
+        self.initial_rows = initial_rows
+        self.window = window
+        self.features = features
+        self.max_workers = max_workers or os.cpu_count()
+        self.mp_context = mp_context
+        self.cache = Cache(cache_dir)
+        self.target = target
+        self.predictions = None
+        self.fitted_folds = 0
+        self.last_updated = None
+
+    def folds(self):
+        # Positions (début, coupure) des fenêtres d'entraînement dont la période de test est complète
+        folds = []
+        for cutoff in range(self.initial_rows, len(self.data) - self.horizon + 1, self.step):
+            start = 0 if self.window == 'expanding' else cutoff - self.initial_rows
+            folds.append((start, cutoff))
+        return folds
+
+    def fold_key(self, train):
+        # Données d'entraînement, régresseurs et version du calcul de la prévision : un pli calculé par une version
+        # précédente de la prévision récursive n'est pas relu
+        forecaster = ProphetForecast(train.copy(), features=self.features)
+        forecaster.preprocess_data()
+        return (forecaster.data_fingerprint(), tuple(forecaster.features), FORECAST_VERSION, self.horizon)
+
+    def run(self):
+        trains = {fold: self.data.iloc[fold[0]:fold[1]].copy() for fold in self.folds()}
+        keys = {fold: self.fold_key(train) for fold, train in trains.items()}
+        results = {fold: self.cache.get(key) for fold, key in keys.items()}
+        missing = [fold for fold, result in results.items() if result is None]
+
+        # Seuls les plis absents du cache sont ajustés, en parallèle
+        if missing:
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context) as executor:
+                futures = {fold: executor.submit(run_fold, trains[fold], self.horizon, self.features) for fold in missing}
+                for fold, future in futures.items():
+                    results[fold] = future.result()
+                    self.cache.set(keys[fold], results[fold])
+        self.fitted_folds = len(missing)
+
+        # Les prévisions sont confrontées aux cours réels des jours de bourse de la période de test
+        actual = self.data[self.target].rename('y')
+        predictions = []
+        for (start, cutoff), forecast in sorted(results.items()):
+            fold = forecast.merge(actual, left_on='ds', right_index=True, how='inner')
+            fold.insert(0, 'cutoff', self.data.index[cutoff - 1])
+            fold['step'] = np.arange(1, len(fold) + 1)
+            predictions.append(fold)
+        self.predictions = pd.concat(predictions, ignore_index=True) if predictions else None
+        self.last_updated = datetime.now()
+        return self
+
+    def metrics(self):
+        if self.predictions is None or self.predictions.empty:
+            return None
+        error = self.predictions['yhat'] - self.predictions['y']
+        return {
+            'rmse': float(np.sqrt(np.mean(error ** 2))),
+            'mae': float(np.mean(np.abs(error))),
+            'mape': float(np.mean(np.abs(error / self.predictions['y'])) * 100),
+            'folds': int(self.predictions['cutoff'].nunique()),
+            'training_period': (self.data.index[0], self.predictions['cutoff'].max()),
+            'test_period': (self.predictions['ds'].min(), self.predictions['ds'].max()),
+            'last_updated': self.last_updated,
+        }
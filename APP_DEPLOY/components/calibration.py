@@ -28,6 +28,17 @@ class Calibration:
             )
         
         
+    def date_gestion(self):
+        # Période du nuage de mots, par défaut les articles depuis la veille
+        today = datetime.today().date()
+        return dcc.DatePickerRange(
+                id='news-date-range',
+                start_date=today - timedelta(days=1),
+                end_date=today,
+                max_date_allowed=today,
+                display_format='DD/MM/YYYY'
+            )
+
     def render(self):
         row = html.Div(
                 [
@@ -35,7 +46,7 @@ class Calibration:
                     dbc.Row(
                         [
                             # Colonne de gauche avec le RangeSlider et un graphique
-                            dbc.Col([ html.Br(), html.Div(id="word-graph")], width=6),
+                            dbc.Col([ html.Br(), self.date_gestion(), html.Div(id="word-graph")], width=6),
                             dbc.Col([dcc.Graph(id='sentiment-graph'),
                                      dash_table.DataTable(id="day-table", filter_action="native", filter_options={"placeholder_text": "Filter..."}, page_size=10)], width=6),
                         ]
@@ -0,0 +1,99 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from components.year_index import YearIndex
+
+# Fenêtres glissantes proposées, en séances : un mois, un trimestre, un semestre, un an
+ROLLING_WINDOWS = (21, 63, 126, 252)
+
+
+def window_sums(cumulative, window):
+    # Sommes sur les fenêtres [t - window + 1, t] à partir des sommes cumulées précédées d'une ligne de zéros
+    return cumulative[window:] - cumulative[:-window]
+
+
+def rolling_beta_correlation(assets, market, windows):
+    # Corrélation et bêta glissants de chaque colonne de `assets` (séances x tickers) contre `market` (séances),
+    # pour plusieurs fenêtres. Les moments sont lus dans des sommes cumulées calculées une fois : chaque fenêtre
+    # coûte O(séances x tickers), quelle que soit sa longueur. Rendements et résultats en float32 ; les sommes
+    # cumulées et les moments sont en float64 : en float32, la différence de deux sommes cumulées perd la précision
+    # d'une fenêtre courte à mesure que l'historique s'allonge. Les rendements sont centrés au préalable.
+    # Une fenêtre contenant une valeur manquante (ticker pas encore coté, séance sans cours) donne NaN.
+    # Retourne {fenêtre: (corrélations, bêtas)}, tableaux séances x tickers
+    assets = np.asarray(assets, dtype=np.float32)
+    market = np.broadcast_to(np.asarray(market, dtype=np.float32)[:, None], assets.shape)
+    valid = np.isfinite(assets) & np.isfinite(market)
+    a = np.where(valid, assets - np.nanmean(assets, axis=0), 0).astype(np.float32)
+    m = np.where(valid, market - np.nanmean(market[:, :1]), 0).astype(np.float32)
+
+    def cumulative(values):
+        out = np.zeros((len(values) + 1, values.shape[1]), dtype=np.float64)
+        np.cumsum(values, axis=0, dtype=np.float64, out=out[1:])
+        return out
+
+    count, sum_a, sum_m = cumulative(valid), cumulative(a), cumulative(m)
+    sum_aa, sum_mm, sum_am = cumulative(a * a), cumulative(m * m), cumulative(a * m)
+
+    results = {}
+    for window in windows:
+        if window > len(assets):
+            empty = np.full(assets.shape, np.nan, dtype=np.float32)
+            results[window] = (empty, empty.copy())
+            continue
+        mean_a, mean_m = window_sums(sum_a, window) / window, window_sums(sum_m, window) / window
+        covariance = window_sums(sum_am, window) / window - mean_a * mean_m
+        variance_a = window_sums(sum_aa, window) / window - mean_a * mean_a
+        variance_m = window_sums(sum_mm, window) / window - mean_m * mean_m
+        complete = window_sums(count, window) == window
+        with np.errstate(divide='ignore', invalid='ignore'):
+            beta = np.where(complete & (variance_m > 0), covariance / variance_m, np.nan)
+            correlation = np.where(complete, covariance / np.sqrt(variance_a * variance_m), np.nan)
+        # Les window - 1 premières séances n'ont pas de fenêtre complète
+        head = np.full((window - 1, assets.shape[1]), np.nan, dtype=np.float32)
+        results[window] = (np.vstack([head, np.clip(correlation, -1, 1).astype(np.float32)]),
+                           np.vstack([head, beta.astype(np.float32)]))
+    return results
+
+
+class CorrelationEngine:
+    # Corrélations et bêtas glissants des tickers suivis contre les indices.
+    # returns : rendements logarithmiques, une colonne par ticker ou indice, indexés par date.
+    # Un calcul traite tous les tickers et toutes les fenêtres manquantes d'un indice à la fois ; le résultat est
+    # conservé par (ticker, indice, fenêtre), avec l'index des années des séances de l'indice.
+    def __init__(self, returns, tickers, indices):
+        self.returns = returns
+        self.tickers = list(tickers)
+        self.indices = list(indices)
+        self.cache = {}
+        self.year_indexes = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, index, windows):
+        # Séances de l'indice : un ticker coté un jour de fermeture de l'indice n'entre pas dans la fenêtre
+        returns = self.returns[self.returns[index].notna()]
+        self.year_indexes[index] = YearIndex(returns.index.year)
+        results = rolling_beta_correlation(returns[self.tickers].to_numpy(), returns[index].to_numpy(), windows)
+        for window, (correlation, beta) in results.items():
+            for column, ticker in enumerate(self.tickers):
+                self.cache[(ticker, index, window)] = pd.DataFrame(
+                    {'Correlation': correlation[:, column], 'Beta': beta[:, column]}, index=returns.index)
+
+    def rolling(self, ticker, index, windows):
+        # {fenêtre: DataFrame Correlation / Beta} du couple (ticker, indice)
+        with self.lock:
+            missing = [window for window in windows if (ticker, index, window) not in self.cache]
+            self.hits += len(windows) - len(missing)
+            self.misses += len(missing)
+            if missing:
+                self.compute(index, missing)
+            return {window: self.cache[(ticker, index, window)] for window in windows}
+
+    def rolling_years(self, ticker, index, windows, start_year, end_year):
+        # Séries glissantes restreintes aux années choisies, par tranche positionnelle
+        rolling = self.rolling(ticker, index, windows)
+        rows = self.year_indexes[index].rows(start_year, end_year)
+        return {window: df.iloc[rows] for window, df in rolling.items()}
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from components.indicators import IndicatorEngine
+
+
+def prepare_market_data(data):
+    # Calcul du rendement logarithmique
+    data['LogReturn'] = np.log(data['Close'] / data['Close'].shift(1))
+
+    # Normalisation Min-Max des prix de clôture
+    data['NormalizedClose'] = (data['Close'] - data['Close'].min()) / (data['Close'].max() - data['Close'].min())
+    return data
+
+
+# Calcul des indicateurs techniques
+def calculate_indicators(df):
+    # RSI, moyennes mobiles, EMA10 et MACD/Signal calculés en une passe vectorisée
+    for name, values in IndicatorEngine().compute(df['Close']).items():
+        df[name] = values
+
+    return df
+
+
+def prepare_forecast_data(data):
+    # Données d'entrée de ProphetForecast : cours, indicateurs et colonne de date
+    data = calculate_indicators(prepare_market_data(data))
+    data['Date'] = pd.to_datetime(data.index)
+    return data
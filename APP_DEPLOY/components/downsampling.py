@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# Nombre de points par trace envoyés au navigateur, de l'ordre de la largeur en pixels d'un graphique
+MAX_POINTS = 1000
+# Part des points réservée à chacune des zones hors de la plage zoomée, conservées pour le contexte et le déplacement
+CONTEXT_SHARE = 0.1
+
+
+def lttb(x, y, threshold):
+    # Indices des points retenus par Largest-Triangle-Three-Buckets : premier et dernier points conservés,
+    # puis dans chaque intervalle le point formant le plus grand triangle avec le point retenu précédent
+    # et la moyenne de l'intervalle suivant
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    bounds = np.append(np.linspace(1, n - 1, threshold - 1).astype(int), n)
+    # Les moyennes des intervalles ne dépendent pas des points retenus : elles sont calculées en une fois
+    sizes = np.diff(bounds)
+    avg_x = (np.add.reduceat(x, bounds[:-1]) / sizes).tolist()
+    avg_y = (np.add.reduceat(y, bounds[:-1]) / sizes).tolist()
+
+    # Les intervalles ne comptent que quelques points : une boucle scalaire évite le surcoût des appels NumPy
+    xs, ys, bounds = x.tolist(), y.tolist(), bounds.tolist()
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        xa, ya = xs[a], ys[a]
+        dx, dy = xa - avg_x[i + 1], avg_y[i + 1] - ya
+        best = -1.0
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(dx * (ys[j] - ya) + (xs[j] - xa) * dy)
+            if area > best:
+                best, a = area, j
+        indices.append(a)
+    indices.append(n - 1)
+    return np.array(indices)
+
+
+def segments(index, window, points):
+    # Découpage en zones (avant, plage zoomée, après) avec le nombre de points attribué à chacune
+    if window is None:
+        return [(slice(0, len(index)), points)]
+    lo, hi = index.searchsorted(window[0]), index.searchsorted(window[1], side='right')
+    context = max(3, int(points * CONTEXT_SHARE))
+    return [(slice(0, lo), context), (slice(lo, hi), points), (slice(hi, len(index)), context)]
+
+
+def downsample_line(series, window=None, points=MAX_POINTS):
+    # Série réduite par LTTB, à pleine résolution de l'écran sur la plage zoomée ; les valeurs manquantes sont écartées
+    if points is None:
+        return series
+    series = series.dropna()
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.asarray(series.index, dtype=float)
+    positions = [np.arange(len(series))[part][lttb(x[part], series.values[part], n)] for part, n in segments(series.index, window, points)]
+    return series.iloc[np.concatenate(positions)] if positions else series
+
+
+def ohlc_buckets(df, threshold):
+    # Agrégation des bougies par intervalles consécutifs : ouverture du premier jour, plus haut, plus bas, clôture du dernier jour
+    n = len(df)
+    if threshold >= n or threshold < 1:
+        return df[['Open', 'High', 'Low', 'Close']]
+    starts = np.linspace(0, n, threshold + 1).astype(int)[:-1]
+    ends = np.append(starts[1:], n) - 1
+    return pd.DataFrame({
+        'Open': df['Open'].values[starts],
+        'High': np.maximum.reduceat(df['High'].values, starts),
+        'Low': np.minimum.reduceat(df['Low'].values, starts),
+        'Close': df['Close'].values[ends],
+    }, index=df.index[starts])
+
+
+def downsample_ohlc(df, window=None, points=MAX_POINTS):
+    if points is None:
+        return df[['Open', 'High', 'Low', 'Close']]
+    parts = [ohlc_buckets(df.iloc[part], n) for part, n in segments(df.index, window, points)]
+    return pd.concat(parts)
+
+
+def viewport(relayout_data):
+    # Plage [début, fin] de l'axe des abscisses zoomée dans le graphique, None pour l'affichage complet
+    relayout_data = relayout_data or {}
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        bounds = relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    elif 'xaxis.range' in relayout_data:
+        bounds = relayout_data['xaxis.range']
+    else:
+        return None
+    return pd.Timestamp(bounds[0]), pd.Timestamp(bounds[1])
+
+
+def is_zoom_event(relayout_data):
+    # Seuls un zoom, un déplacement ou un retour à l'échelle automatique de l'axe des abscisses demandent un nouveau rendu
+    return any(key.startswith('xaxis.range') or key == 'xaxis.autorange' for key in (relayout_data or {}))
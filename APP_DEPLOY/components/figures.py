@@ -0,0 +1,132 @@
+from datetime import datetime
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from components.downsampling import MAX_POINTS, downsample_line, downsample_ohlc
+
+# Graphiques des séries longues. Chaque trace passe par la couche de réduction (components/downsampling) :
+# `window` est la plage zoomée à afficher en détail, `points=None` envoie les séries complètes.
+# Les dates sont passées en datetime64 : plotly évite ainsi la copie d'un tableau d'objets Timestamp.
+
+# Remplissage des intervalles de prévision, dans l'ordre où ils sont passés
+BAND_COLORS = ['rgba(209, 7, 55, 0.15)', 'rgba(44, 62, 80, 0.2)']
+
+# Courbes d'adobe_figure tracées après les bougies : colonne, nom
+ADOBE_LINES = [('Close', 'Close'), ('MA10Day', 'MA10'), ('MA30Day', 'MA30'), ('MA50Day', 'MA50'), ('EMA10Day', 'EMA10')]
+# Attributs des traces d'adobe_figure étendus en mode streaming
+ADOBE_EXTEND_KEYS = ('x', 'open', 'high', 'low', 'close', 'y')
+
+
+def adobe_figure(data, window=None, points=MAX_POINTS, uirevision=None, extendable=False):
+    candles = downsample_ohlc(data, window, points)
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(
+        x=candles.index.values,
+        open=candles['Open'],
+        high=candles['High'],
+        low=candles['Low'],
+        close=candles['Close'],
+        name='Candlestick'
+    ))
+
+    for column, name in ADOBE_LINES:
+        series = downsample_line(data[column], window, points)
+        fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', name=name))
+
+    # uirevision conserve le zoom de l'utilisateur lorsque le graphique est recalculé pour la plage zoomée
+    fig.update_layout(title='Adobe Stock Analysis', xaxis_rangeslider_visible=False, uirevision=uirevision)
+    if not extendable:
+        return fig
+    # Plotly.extendTraces étend les mêmes attributs sur toutes les traces visées et refuse un attribut absent :
+    # chaque trace reçoit un tableau vide pour ceux qu'elle n'utilise pas (ignorés au rendu)
+    figure = fig.to_dict()
+    for trace in figure['data']:
+        for key in ADOBE_EXTEND_KEYS:
+            trace.setdefault(key, [])
+    return figure
+
+
+def adobe_extend(bars):
+    # Nouvelles séances ajoutées à adobe_figure(extendable=True) par la propriété extendData du graphique :
+    # [attributs à étendre, traces visées]. Seuls les nouveaux points sont envoyés
+    x = bars.index.values
+    lines = len(ADOBE_LINES)
+    update = {'x': [x] * (1 + lines), 'y': [[]] + [bars[column].values for column, _ in ADOBE_LINES]}
+    for key, column in (('open', 'Open'), ('high', 'High'), ('low', 'Low'), ('close', 'Close')):
+        update[key] = [bars[column].values] + [[]] * lines
+    return [update, list(range(1 + lines))]
+
+
+def index_figure(index_data, adobe_data, index, radio, window=None, points=MAX_POINTS, uirevision=None):
+    # LogReturn pour les rendements, NormalizedClose pour la standardisation
+    column, label = ('LogReturn', 'LogReturn') if radio == 'rend' else ('NormalizedClose', 'Close Price')
+    fig = go.Figure()
+
+    series = downsample_line(index_data[column], window, points)
+    fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', name=f'{index} {label}'))
+    series = downsample_line(adobe_data[column], window, points)
+    fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', name=f'Adobe {label}'))
+
+    fig.update_layout(title=f'{index} Index vs Adobe', xaxis_rangeslider_visible=False, uirevision=uirevision)
+    return fig
+
+
+def predict_figure(history, forecast, title, window=None, points=MAX_POINTS, uirevision=None, bands=None, lines=None):
+    fig = go.Figure()
+
+    series = downsample_line(history['Close'], window, points)
+    fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', name='Close'))
+
+    # Ajouter une barre verticale pour la date d'aujourd'hui
+    today = datetime.today().date()
+    fig.add_vline(x=today, line_width=2, line_dash="dash", line_color="red")
+
+    # Les prévisions couvrent tout l'historique ajusté puis l'horizon demandé
+    series = downsample_line(forecast.set_index('ds')['yhat'], window, points)
+    fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', name='Prediction'))
+
+    # Prévisions d'autres modèles : nom -> série indexée par date
+    for name, values in (lines or {}).items():
+        series = downsample_line(values, window, points)
+        fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', line=dict(dash='dot'), name=name))
+
+    # Intervalles de prix sur l'horizon de prévision : nom -> DataFrame lower / upper indexé par date
+    for (name, band), color in zip((bands or {}).items(), BAND_COLORS):
+        fig.add_trace(go.Scatter(x=band.index.values, y=band['upper'].values, mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=band.index.values, y=band['lower'].values, mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor=color, name=name))
+
+    fig.update_layout(title=title, xaxis_rangeslider_visible=False, uirevision=uirevision)
+    return fig
+
+
+def predict_extend(bars):
+    # Nouvelles séances ajoutées à la courbe des cours de predict_figure (première trace) par extendData
+    return [{'x': [bars.index.values], 'y': [bars['Close'].values]}, [0]]
+
+
+def volatility_figure(volatility, forecast, title, window=None, points=MAX_POINTS, uirevision=None):
+    # Volatilité conditionnelle journalière estimée (en %) puis prévue sur l'horizon
+    fig = go.Figure()
+    series = downsample_line(volatility['Sigma'] * 100, window, points)
+    fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', name='Sigma'))
+    fig.add_trace(go.Scatter(x=forecast.index.values, y=forecast.values * 100, mode='lines', line=dict(dash='dot'),
+                             name='Forecast'))
+    fig.update_layout(title=title, yaxis_title='Daily volatility (%)', xaxis_rangeslider_visible=False,
+                      uirevision=uirevision, height=300)
+    return fig
+
+
+def correlation_figure(rolling, ticker, index, points=MAX_POINTS, uirevision=None):
+    # Corrélation (en haut) et bêta (en bas) glissants du ticker contre l'indice, une courbe par fenêtre
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.08, subplot_titles=('Correlation', 'Beta'))
+    colors = ['#d10737', '#2c3e50', '#18bc9c', '#f39c12']
+    for (window, df), color in zip(sorted(rolling.items()), colors * len(rolling)):
+        for row, column in ((1, 'Correlation'), (2, 'Beta')):
+            series = downsample_line(df[column], None, points)
+            fig.add_trace(go.Scatter(x=series.index.values, y=series.values, mode='lines', line=dict(color=color),
+                                     name=f'{window}d', legendgroup=str(window), showlegend=row == 1), row=row, col=1)
+    fig.update_layout(title=f'{ticker} vs {index} Rolling Correlation and Beta', uirevision=uirevision, height=500)
+    return fig
@@ -0,0 +1,41 @@
+from diskcache import Cache
+
+
+class ForecastCache:
+    # Cache LRU borné des prévisions, partagé sur disque entre les callbacks et les workers.
+    # Une entrée est indexée par (empreinte du modèle ajusté, horizon) et contient les lignes futures
+    # prédites ainsi que l'état de la récursion, ce qui permet de prolonger un horizon plus court.
+    def __init__(self, directory='cache/forecasts', size_limit=256 * 2**20):
+        self.cache = Cache(directory, size_limit=size_limit, eviction_policy='least-recently-used', tag_index=True)
+        # Recherches de ce processus : horizon couvert par le cache, ou prévision (au moins en partie) à calculer
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, fingerprint, p):
+        # Plus petit horizon en cache couvrant p, sinon le plus long horizon inférieur (préfixe à prolonger)
+        horizons = self.cache.get(('horizons', fingerprint), [])
+        longer = [h for h in horizons if h >= p]
+        shorter = [h for h in horizons if h < p]
+
+        for horizon in sorted(longer) + sorted(shorter, reverse=True):
+            entry = self.cache.get((fingerprint, horizon))
+            if entry is not None:
+                if horizon >= p:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                return (horizon,) + entry
+        self.misses += 1
+        return None
+
+    def store(self, fingerprint, horizon, future_forecast, state):
+        with self.cache.transact():
+            self.cache.set((fingerprint, horizon), (future_forecast, state), tag=fingerprint)
+            horizons = self.cache.get(('horizons', fingerprint), [])
+            self.cache.set(('horizons', fingerprint), sorted(set(horizons) | {horizon}), tag=fingerprint)
+
+    def invalidate(self, fingerprint):
+        self.cache.evict(fingerprint)
+
+    def clear(self):
+        self.cache.clear()
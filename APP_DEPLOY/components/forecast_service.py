@@ -0,0 +1,83 @@
+import math
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from components.datasets import prepare_forecast_data
+from components.market_data import MarketDataStore
+from components.prophet import ProphetForecast, artifact_path
+
+
+class TickerTimeout(Exception):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise TickerTimeout()
+
+
+def forecast_ticker(ticker, store_dir, fetcher, start, end, models_dir, horizon, timeout):
+    # Exécuté dans un processus du pool : chargement des cours, ajustement (ou artefact existant) et prévision.
+    # Le délai par ticker est imposé par SIGALRM lorsque la plateforme le permet.
+    alarm = timeout and hasattr(signal, 'SIGALRM')
+    if alarm:
+        signal.signal(signal.SIGALRM, raise_timeout)
+        signal.alarm(math.ceil(timeout))
+    try:
+        start_time = time.perf_counter()
+        data = prepare_forecast_data(MarketDataStore(store_dir, fetcher).get(ticker, start, end))
+        forecaster = ProphetForecast(data)
+        refit = forecaster.fit_or_load(artifact_path(models_dir, ticker))
+        forecast = forecaster.predict(horizon)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(horizon)
+        return {'forecast': forecast, 'refit': refit, 'seconds': time.perf_counter() - start_time}
+    finally:
+        if alarm:
+            signal.alarm(0)
+
+
+class ForecastService:
+    # Ajustement et prévision d'une liste de tickers en parallèle sur un ProcessPoolExecutor.
+    # Les modèles ajustés sont enregistrés comme artefacts, puis rechargés à la demande dans le processus de l'application.
+    # datasets (SharedDatasets) : les cours préparés de ces modèles sont alors partagés en lecture seule entre processus.
+    def __init__(self, store, start, end, models_dir='models', max_workers=None, timeout=600, cache=None, mp_context=None,
+                 datasets=None):
+        self.store = store
+        self.start = start
+        self.end = end
+        self.models_dir = models_dir
+        self.max_workers = max_workers or os.cpu_count()
+        self.timeout = timeout
+        self.cache = cache
+        self.mp_context = mp_context
+        self.datasets = datasets
+        self.results = {}
+        self.errors = {}
+
+    def run(self, tickers, horizon=10):
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context) as executor:
+            futures = {
+                executor.submit(forecast_ticker, ticker, self.store.directory, self.store.fetcher,
+                                self.start, self.end, self.models_dir, horizon, self.timeout): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    self.results[ticker] = future.result()
+                    self.errors.pop(ticker, None)
+                except TickerTimeout:
+                    self.errors[ticker] = f"délai de {self.timeout}s dépassé"
+                except Exception as e:
+                    self.errors[ticker] = repr(e)
+        return self.results
+
+    def load(self, ticker):
+        # Nouveau ProphetForecast du ticker sur les cours à jour, rechargé depuis son artefact (réajusté si les données
+        # ont changé) ; le registre des modèles de l'application en garde les versions
+        data = prepare_forecast_data(self.store.get(ticker, self.start, self.end))
+        if self.datasets is not None:
+            data = self.datasets.publish(ticker, data)
+        forecaster = ProphetForecast(data, cache=self.cache)
+        forecaster.fit_or_load(artifact_path(self.models_dir, ticker))
+        return forecaster
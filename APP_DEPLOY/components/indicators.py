@@ -0,0 +1,198 @@
+from collections import deque
+
+import numpy as np
+
+# Amplitude maximale des poids decay ** -k à l'intérieur d'un bloc du filtre exponentiel vectorisé
+MAX_WEIGHT_EXPONENT = 150
+
+
+def ewm(values, alpha):
+    # Moyenne exponentielle non ajustée (ewm(adjust=False) de pandas), démarrant à la première valeur valide.
+    # La récurrence y[t] = (1 - alpha) * y[t-1] + alpha * x[t] est résolue par blocs : à l'intérieur d'un bloc
+    # par une somme cumulée pondérée, puis la dernière valeur du bloc est propagée au bloc suivant.
+    # La taille des blocs est la plus grande qui garde les poids decay ** -k représentables.
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return out
+
+    x = values[valid[0]:]
+    decay = 1 - alpha
+    block_size = max(1, min(len(x), int(MAX_WEIGHT_EXPONENT * np.log(10) / -np.log(decay))))
+    steps = np.arange(block_size)
+    weights = decay ** -steps
+    powers = decay ** steps
+    carry = x[0]
+
+    for start in range(0, len(x), block_size):
+        chunk = x[start:start + block_size]
+        m = len(chunk)
+        block = alpha * powers[:m] * np.cumsum(chunk * weights[:m]) + decay * powers[:m] * carry
+        out[valid[0] + start:valid[0] + start + m] = block
+        carry = block[-1]
+    return out
+
+
+def warm_up(values, periods):
+    # Masque les premières valeurs, comme min_periods dans pandas
+    values = values.copy()
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid):
+        values[valid[0]:valid[0] + periods - 1] = np.nan
+    return values
+
+
+def sma(close, window):
+    close = np.asarray(close, dtype=float)
+    out = np.full(close.shape, np.nan)
+    if len(close) >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(close, window).mean(axis=1)
+    return out
+
+
+def rsi_from_averages(up, down):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(down == 0, 100.0, 100 - 100 / (1 + up / down))
+
+
+class IndicatorEngine:
+    # Indicateurs techniques de l'application (RSI, SMA, EMA, MACD/Signal) avec les conventions du package ta.
+    # compute() calcule tout l'historique de façon vectorisée et positionne l'état en fin de série ;
+    # update() avance ensuite chaque indicateur en temps constant pour chaque nouveau cours de clôture.
+    def __init__(self, rsi_windows=(3, 9, 14, 30), sma_windows=(10, 30, 50), ema_windows=(10,), macd_windows=(12, 26, 9)):
+        self.rsi_windows = rsi_windows
+        self.sma_windows = sma_windows
+        self.ema_windows = ema_windows
+        self.macd_fast, self.macd_slow, self.macd_sign = macd_windows
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.last_close = None
+        self.gains = {}
+        self.windows = {w: deque(maxlen=w) for w in self.sma_windows}
+        self.sums = {w: 0.0 for w in self.sma_windows}
+        self.ema = {}
+        self.signal = None
+
+    def compute(self, close):
+        close = np.asarray(close, dtype=float)
+        self.reset()
+        if len(close) == 0:
+            return {}
+        values = {}
+
+        diff = np.diff(close, prepend=np.nan)
+        up = np.where(diff > 0, diff, 0.0)
+        down = np.where(diff < 0, -diff, 0.0)
+        for w in self.rsi_windows:
+            avg_up, avg_down = ewm(up, 1 / w), ewm(down, 1 / w)
+            values[f'RSI{w}Day'] = warm_up(rsi_from_averages(avg_up, avg_down), w)
+            self.gains[w] = (avg_up[-1], avg_down[-1])
+
+        for w in self.sma_windows:
+            values[f'MA{w}Day'] = sma(close, w)
+            self.windows[w].extend(close[-w:])
+            self.sums[w] = sum(self.windows[w])
+
+        ema = {w: ewm(close, 2 / (w + 1)) for w in set(self.ema_windows) | {self.macd_fast, self.macd_slow}}
+        self.ema = {w: series[-1] for w, series in ema.items()}
+        for w in self.ema_windows:
+            values[f'EMA{w}Day'] = warm_up(ema[w], w)
+
+        macd = warm_up(ema[self.macd_fast], self.macd_fast) - warm_up(ema[self.macd_slow], self.macd_slow)
+        signal = ewm(macd, 2 / (self.macd_sign + 1))
+        values['MACD'] = macd
+        values['Signal'] = warm_up(signal, self.macd_sign)
+        self.signal = signal[-1]
+
+        self.count = len(close)
+        self.last_close = close[-1]
+        return values
+
+    def update(self, close):
+        close = float(close)
+        self.count += 1
+        first = self.last_close is None
+        diff = 0.0 if first else close - self.last_close
+        self.last_close = close
+        values = {}
+
+        for w in self.rsi_windows:
+            up, down = self.gains.get(w, (0.0, 0.0))
+            up += (max(diff, 0.0) - up) / w
+            down += (max(-diff, 0.0) - down) / w
+            self.gains[w] = (up, down)
+            values[f'RSI{w}Day'] = float(rsi_from_averages(up, down)) if self.count >= w else np.nan
+
+        for w, window in self.windows.items():
+            if len(window) == w:
+                self.sums[w] -= window[0]
+            window.append(close)
+            self.sums[w] += close
+            values[f'MA{w}Day'] = self.sums[w] / w if self.count >= w else np.nan
+
+        for w in set(self.ema_windows) | {self.macd_fast, self.macd_slow}:
+            self.ema[w] = close if first else self.ema[w] + 2 / (w + 1) * (close - self.ema[w])
+            if w in self.ema_windows:
+                values[f'EMA{w}Day'] = self.ema[w] if self.count >= w else np.nan
+
+        # Le signal ne démarre qu'avec la première valeur valide du MACD
+        macd = self.ema[self.macd_fast] - self.ema[self.macd_slow]
+        if self.count >= self.macd_slow:
+            self.signal = macd if self.signal is None or np.isnan(self.signal) else self.signal + 2 / (self.macd_sign + 1) * (macd - self.signal)
+            values['MACD'] = macd
+            values['Signal'] = self.signal if self.count >= self.macd_slow + self.macd_sign - 1 else np.nan
+        else:
+            values['MACD'] = values['Signal'] = np.nan
+        return values
+
+
+class PathIndicators:
+    # Mise à jour des indicateurs d'IndicatorEngine sur plusieurs trajectoires de prix simulées à la fois :
+    # l'état (moyennes des hausses et baisses, fenêtres des moyennes mobiles, EMA, signal) est un tableau par trajectoire,
+    # initialisé à l'état de fin d'historique du moteur. L'historique doit couvrir la plus longue fenêtre.
+    def __init__(self, engine, paths):
+        self.engine = engine
+        self.count = engine.count
+        self.last_close = np.full(paths, engine.last_close)
+        self.gains = {w: (np.full(paths, up), np.full(paths, down)) for w, (up, down) in engine.gains.items()}
+        # Fenêtres circulaires : la colonne position contient le cours le plus ancien
+        self.windows = {w: np.tile(np.asarray(window, dtype=float), (paths, 1)) for w, window in engine.windows.items()}
+        self.sums = {w: self.windows[w].sum(axis=1) for w in self.windows}
+        self.position = 0
+        self.ema = {w: np.full(paths, value) for w, value in engine.ema.items()}
+        self.signal = np.full(paths, engine.signal)
+
+    def update(self, close):
+        engine = self.engine
+        self.count += 1
+        diff = close - self.last_close
+        self.last_close = close
+        values = {}
+
+        for w in engine.rsi_windows:
+            up, down = self.gains[w]
+            up = up + (np.maximum(diff, 0.0) - up) / w
+            down = down + (np.maximum(-diff, 0.0) - down) / w
+            self.gains[w] = (up, down)
+            values[f'RSI{w}Day'] = rsi_from_averages(up, down)
+
+        for w, window in self.windows.items():
+            column = self.position % w
+            self.sums[w] = self.sums[w] - window[:, column] + close
+            window[:, column] = close
+            values[f'MA{w}Day'] = self.sums[w] / w
+        self.position += 1
+
+        for w in self.ema:
+            self.ema[w] = self.ema[w] + 2 / (w + 1) * (close - self.ema[w])
+            if w in engine.ema_windows:
+                values[f'EMA{w}Day'] = self.ema[w]
+
+        macd = self.ema[engine.macd_fast] - self.ema[engine.macd_slow]
+        self.signal = self.signal + 2 / (engine.macd_sign + 1) * (macd - self.signal)
+        values['MACD'] = macd
+        values['Signal'] = self.signal
+        return values
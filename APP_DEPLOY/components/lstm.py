@@ -0,0 +1,190 @@
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Variables d'entrée du BiLSTM de LSTM_Stock.ipynb, dans l'ordre de l'entraînement ; la première est la cible
+LSTM_FEATURES = ['Close', 'Volume', 'MAV5Day', 'RSI3Day', 'RSI9Day', 'RSI14Day', 'RSI30Day', 'MA10Day', 'MA30Day',
+                 'MA50Day', 'EMA10Day', 'PriceChange', 'CloseOpenDiff', 'HighLowDiff', 'MACD', 'Signal', 'OBV',
+                 'SP_Close', 'CAC_Close', 'EMVMACROBUS', 'CPIAUCSL', 'EXPINF1YR', 'LNS12032195', 'UMCSENT',
+                 'Sigma', 'Sigma2', 'sovereign_debt_crisis', 'oil_shock', 'trade_war', 'covid_pandemic', 'war_ukraine']
+
+# Périodes de crise du notebook (indicatrices), fin incluse ; None : période en cours
+CRISIS_PERIODS = {
+    'sovereign_debt_crisis': ('2010-01-01', '2012-12-31'),
+    'oil_shock': ('2014-01-01', '2016-12-31'),
+    'trade_war': ('2018-01-01', '2019-12-31'),
+    'covid_pandemic': ('2020-01-01', '2022-12-31'),
+    'war_ukraine': ('2022-02-24', None),
+}
+
+
+def lstm_path(directory, ticker):
+    return os.path.join(directory, f"lstm_{re.sub(r'[^A-Za-z0-9.-]', '_', ticker)}.npz")
+
+
+def lstm_features(data, sp_close, cac_close, macro, volatility):
+    # Tableau d'entrée du modèle, une ligne par séance du ticker, construit comme dans le notebook :
+    # data : cours et indicateurs (prepare_forecast_data), sp_close / cac_close : clôtures des indices (dernière
+    # valeur connue les jours de fermeture), macro : séries FRED alignées, volatility : Sigma / Sigma2 journaliers
+    index = data.index
+    close = data['Close']
+    direction = np.where(close < close.shift(1), -1.0, 1.0)
+    features = pd.DataFrame({
+        'MAV5Day': data['Volume'].rolling(5).mean(),
+        'PriceChange': close.diff(),
+        'CloseOpenDiff': close - data['Open'],
+        'HighLowDiff': data['High'] - data['Low'],
+        'OBV': (direction * data['Volume']).cumsum(),
+        'SP_Close': sp_close.reindex(index.union(sp_close.index)).ffill().reindex(index),
+        'CAC_Close': cac_close.reindex(index.union(cac_close.index)).ffill().reindex(index),
+    }, index=index)
+    features = pd.concat([data, features, macro.reindex(index), volatility[['Sigma', 'Sigma2']].reindex(index)], axis=1)
+    for name, (start, end) in CRISIS_PERIODS.items():
+        features[name] = ((index >= pd.Timestamp(start)) & (index <= pd.Timestamp(end or index.max()))).astype(float)
+    return features[LSTM_FEATURES]
+
+
+def sigmoid(x):
+    # En place : 1 / (1 + exp(-x)) ; exp peut déborder pour x très négatif (résultat 0)
+    with np.errstate(over='ignore'):
+        np.negative(x, out=x)
+        np.exp(x, out=x)
+    x += 1
+    np.reciprocal(x, out=x)
+
+
+class LstmForecaster:
+    # Inférence CPU en NumPy du BiLSTM (nn.LSTM bidirectionnel batch_first + couche linéaire) exporté par
+    # LSTM_Stock.ipynb : poids de state_dict, bornes du MinMaxScaler, variables et longueur des séquences (.npz).
+    # Une passe traite un lot de séquences (tickers, fenêtres glissantes, entrées Monte Carlo) : les projections
+    # d'entrée de toute la séquence sont un seul produit matriciel par direction, la récurrence avance tout le lot
+    # à chaque pas. Les tampons sont alloués une fois pour max_batch séquences ; les lots plus grands sont découpés.
+    def __init__(self, path, max_batch=512):
+        with np.load(path) as arrays:
+            weights = {name: arrays[name] for name in arrays.files}
+        self.features = [str(name) for name in weights.pop('features')]
+        self.seq_length = int(weights.pop('seq_length'))
+        self.data_min = weights.pop('data_min').astype(np.float32)
+        self.data_range = (weights.pop('data_max') - self.data_min).astype(np.float32)
+        self.data_range[self.data_range == 0] = 1
+        self.hidden = weights['lstm.weight_hh_l0'].shape[1]
+        self.input_size = weights['lstm.weight_ih_l0'].shape[1]
+        self.layers = [[self.direction(weights, f'l{layer}{suffix}') for suffix in ('', '_reverse')]
+                       for layer in range(sum(name.startswith('lstm.weight_ih_l') and not name.endswith('_reverse')
+                                              for name in weights))]
+        self.fc_weight = np.ascontiguousarray(weights['fc.weight'].T, dtype=np.float32)
+        self.fc_bias = weights['fc.bias'].astype(np.float32)
+        self.max_batch = max_batch
+        self.allocate(max_batch)
+        # Les tampons sont partagés : une passe à la fois
+        self.lock = threading.Lock()
+
+    def direction(self, weights, suffix):
+        # Portes de PyTorch dans l'ordre (entrée, oubli, cellule, sortie), réordonnées en (entrée, oubli, sortie, cellule) :
+        # une sigmoïde sur les 3H premières colonnes, une tangente hyperbolique sur les H dernières
+        h = self.hidden
+        order = np.r_[0:2 * h, 3 * h:4 * h, 2 * h:3 * h]
+        w_ih = np.ascontiguousarray(weights[f'lstm.weight_ih_{suffix}'][order].T, dtype=np.float32)
+        w_hh = np.ascontiguousarray(weights[f'lstm.weight_hh_{suffix}'][order].T, dtype=np.float32)
+        bias = (weights[f'lstm.bias_ih_{suffix}'] + weights[f'lstm.bias_hh_{suffix}'])[order].astype(np.float32)
+        return w_ih, w_hh, bias
+
+    def allocate(self, batch):
+        # Tampons à plat, vus en tableaux contigus de la taille du lot courant
+        t, h = self.seq_length, self.hidden
+        # Entrées et sorties des couches, échangées d'une couche à la suivante
+        self.sequences = [np.empty(t * batch * max(self.input_size, 2 * h), dtype=np.float32) for _ in range(2)]
+        self.projections = np.empty(t * batch * 4 * h, dtype=np.float32)
+        self.gates = np.empty(batch * 4 * h, dtype=np.float32)
+        self.state = np.empty((4, batch * h), dtype=np.float32)
+        self.last = np.empty(batch * 2 * h, dtype=np.float32)
+
+    def view(self, buffer, *shape):
+        return buffer[:int(np.prod(shape))].reshape(shape)
+
+    def recurrence(self, projections, w_hh, outputs, reverse):
+        # Récurrence d'une direction sur le lot ; écrit h de chaque pas dans outputs[t] si outputs n'est pas None.
+        # Retourne h au dernier pas traité
+        t_count, batch, _ = projections.shape
+        h = self.hidden
+        hidden, cell, gated, scratch = (self.view(row, batch, h) for row in self.state)
+        gates = self.view(self.gates, batch, 4 * h)
+        hidden.fill(0)
+        cell.fill(0)
+        times = range(t_count - 1, -1, -1) if reverse else range(t_count)
+        for t in times:
+            np.matmul(hidden, w_hh, out=gates)
+            gates += projections[t]
+            sigmoid(gates[:, :3 * h])
+            np.tanh(gates[:, 3 * h:], out=gates[:, 3 * h:])
+            # c = f * c + i * g ; h = o * tanh(c)
+            np.multiply(gates[:, h:2 * h], cell, out=cell)
+            np.multiply(gates[:, :h], gates[:, 3 * h:], out=scratch)
+            cell += scratch
+            np.tanh(cell, out=gated)
+            np.multiply(gates[:, 2 * h:3 * h], gated, out=hidden)
+            if outputs is not None:
+                outputs[t] = hidden
+        return hidden
+
+    def forward_batch(self, x):
+        # x : lot x séquence x variables, déjà normalisé ; retourne la sortie normalisée de chaque séquence
+        batch, t_count, _ = x.shape
+        h = self.hidden
+        current, spare = self.sequences
+        layer_input = self.view(current, t_count, batch, self.input_size)
+        np.copyto(layer_input, x.transpose(1, 0, 2))
+        last = self.view(self.last, batch, 2 * h)
+
+        for number, directions in enumerate(self.layers):
+            final = number == len(self.layers) - 1
+            size = layer_input.shape[2]
+            outputs = None if final else self.view(spare, t_count, batch, 2 * h)
+            for d, (w_ih, w_hh, bias) in enumerate(directions):
+                reverse = d == 1
+                if final and reverse:
+                    # La sortie au dernier pas de la direction inverse est son premier pas : seule la dernière
+                    # entrée est projetée, à partir d'un état nul
+                    projections = self.view(self.projections, 1, batch, 4 * h)
+                    np.matmul(layer_input[-1], w_ih, out=projections[0])
+                else:
+                    projections = self.view(self.projections, t_count, batch, 4 * h)
+                    np.matmul(layer_input.reshape(t_count * batch, size), w_ih, out=projections.reshape(t_count * batch, 4 * h))
+                projections += bias
+                hidden = self.recurrence(projections, w_hh, None if final else outputs[:, :, d * h:(d + 1) * h], reverse)
+                if final:
+                    last[:, d * h:(d + 1) * h] = hidden
+            # La sortie de la couche devient l'entrée de la suivante, sans copie
+            layer_input, current, spare = outputs, spare, current
+        return last @ self.fc_weight + self.fc_bias
+
+    def forward(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        result = np.empty(len(x), dtype=np.float32)
+        with self.lock:
+            for start in range(0, len(x), self.max_batch):
+                result[start:start + self.max_batch] = self.forward_batch(x[start:start + self.max_batch])[:, 0]
+        return result
+
+    def scale(self, values):
+        return (np.asarray(values, dtype=np.float32) - self.data_min) / self.data_range
+
+    def unscale(self, values):
+        # La cible est la première variable (Close)
+        return values * self.data_range[0] + self.data_min[0]
+
+    def predict(self, features, count):
+        # Prévisions à un jour des `count` dernières séances et de la séance suivant l'historique, en une passe :
+        # chaque prévision utilise les seq_length séances qui la précèdent. Retourne une série indexée par date cible
+        features = features[self.features].dropna()
+        values = self.scale(features.to_numpy())
+        count = min(count, len(values) - self.seq_length)
+        if count < 0:
+            return pd.Series(dtype=float, name='LSTM')
+        windows = np.lib.stride_tricks.sliding_window_view(values, self.seq_length, axis=0)[-(count + 1):]
+        predictions = self.unscale(self.forward(windows.transpose(0, 2, 1)))
+        dates = features.index[len(features) - count:].append(pd.DatetimeIndex([features.index[-1] + pd.tseries.offsets.BDay(1)]))
+        return pd.Series(predictions.astype(float), index=dates, name='LSTM')
@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Séries FRED mensuelles (data/fred/<série>.csv, DATE = début du mois observé) et délai de publication estimé depuis
+# le début du mois : une observation n'est utilisable qu'à partir de sa date de publication
+MACRO_SERIES = {
+    'CPIAUCSL': pd.DateOffset(months=1, days=14),     # Indice des prix, publié vers le milieu du mois suivant
+    'UMCSENT': pd.DateOffset(days=27),                 # Confiance des consommateurs (Michigan), finale en fin de mois
+    'EXPINF1YR': pd.DateOffset(days=14),               # Anticipations d'inflation à 1 an (Cleveland Fed), mi-mois
+    'EMVMACROBUS': pd.DateOffset(months=1, days=7),    # Volatilité liée à l'actualité macro, début du mois suivant
+    'LNS12032195': pd.DateOffset(months=1, days=7),    # Emploi (temps partiel subi), rapport du premier vendredi suivant
+}
+
+
+def read_fred(path, lag):
+    # Observations d'une série FRED indexées par date de publication ; les valeurs manquantes ('.') sont écartées
+    df = pd.read_csv(path, na_values='.', parse_dates=['DATE']).dropna()
+    values = df.iloc[:, 1].astype(float).to_numpy()
+    return pd.Series(values, index=pd.DatetimeIndex(df['DATE'] + lag, name='Published')).sort_index()
+
+
+def asof(observations, dates):
+    # Dernière observation publiée au plus tard à chaque date (NaN avant la première publication)
+    position = observations.index.searchsorted(dates, side='right') - 1
+    values = observations.to_numpy()[np.maximum(position, 0)]
+    values[position < 0] = np.nan
+    return values
+
+
+def first_change(old, new):
+    # Date de publication de la première observation ajoutée, révisée ou retirée ; None si les séries sont identiques
+    both = old.index.union(new.index)
+    old, new = old.reindex(both).to_numpy(), new.reindex(both).to_numpy()
+    changed = ~((old == new) | (np.isnan(old) & np.isnan(new)))
+    return both[changed.argmax()] if changed.any() else None
+
+
+class MacroFeatureStore:
+    # Séries macroéconomiques lues à leur fréquence native et alignées sur les dates de cotation par jointure « as-of » :
+    # chaque date reçoit la dernière valeur publiée à cette date, sans fuite d'une publication future dans l'historique.
+    # La matrice alignée est conservée sur disque (Arrow) avec les observations qui l'ont produite. À la mise à jour,
+    # une colonne n'est recalculée qu'à partir de la publication de sa première observation nouvelle ou révisée,
+    # et seules les nouvelles dates de cotation sont ajoutées.
+    def __init__(self, source_dir='data/fred', cache_dir='cache/macro', series=None):
+        self.source_dir = source_dir
+        self.cache_dir = cache_dir
+        self.series = series or MACRO_SERIES
+        os.makedirs(cache_dir, exist_ok=True)
+        # Lignes recalculées par colonne lors de la dernière mise à jour
+        self.updated_rows = {}
+
+    def observations(self):
+        return {name: read_fred(os.path.join(self.source_dir, f'{name}.csv'), lag) for name, lag in self.series.items()}
+
+    def read_arrow(self, name):
+        path = os.path.join(self.cache_dir, f'{name}.arrow')
+        if not os.path.exists(path):
+            return None
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    def write_arrow(self, name, df):
+        # Fichier temporaire puis remplacement atomique, comme MarketDataStore
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        path = os.path.join(self.cache_dir, f'{name}.arrow')
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def read_cache(self):
+        # Matrice alignée (index : dates de cotation) et observations par série de la mise à jour précédente
+        matrix, stored = self.read_arrow('aligned'), self.read_arrow('observations')
+        if matrix is None or stored is None:
+            return None, {}
+        matrix = matrix.set_index('Date')
+        known = {name: group.set_index('Published')['value'] for name, group in stored.groupby('series')}
+        return matrix, known
+
+    def write_cache(self, matrix, observations):
+        self.write_arrow('aligned', matrix.reset_index())
+        self.write_arrow('observations', pd.concat(
+            [pd.DataFrame({'series': name, 'Published': values.index, 'value': values.to_numpy()})
+             for name, values in observations.items()], ignore_index=True))
+
+    def update(self, dates):
+        # Matrice dates de cotation x séries, recalculée seulement là où les observations ou les dates ont changé
+        dates = pd.DatetimeIndex(dates, name='Date')
+        observations = self.observations()
+        cached, known = self.read_cache()
+        # Le cache n'est réutilisable que si ses dates sont un préfixe des dates demandées
+        reusable = (cached is not None and len(cached) <= len(dates) and dates[:len(cached)].equals(cached.index)
+                    and list(cached.columns) == list(observations))
+        matrix = np.full((len(dates), len(observations)), np.nan)
+        if reusable:
+            matrix[:len(cached)] = cached.to_numpy()
+
+        self.updated_rows = {}
+        for column, (name, values) in enumerate(observations.items()):
+            start = 0
+            if reusable and name in known:
+                changed = first_change(known[name], values)
+                start = len(cached) if changed is None else min(dates.searchsorted(changed), len(cached))
+            matrix[start:, column] = asof(values, dates[start:])
+            self.updated_rows[name] = int(len(dates) - start)
+
+        aligned = pd.DataFrame(matrix, index=dates, columns=list(observations))
+        if not reusable or any(self.updated_rows.values()):
+            self.write_cache(aligned, observations)
+        return aligned
+
+    def features(self, dates, names=None):
+        # Colonnes choisies comme régresseurs (toutes par défaut)
+        aligned = self.update(dates)
+        return aligned[list(names)] if names else aligned
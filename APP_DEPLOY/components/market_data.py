@@ -0,0 +1,127 @@
+import os
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import yfinance as yf
+
+OHLCV_COLUMNS = ['Close', 'High', 'Low', 'Open', 'Volume']
+
+
+class YahooFetcher:
+    # Téléchargement des cours journaliers depuis Yahoo Finance (borne de fin exclue)
+    def fetch(self, ticker, start, end):
+        df = yf.download(ticker, start=start, end=end, progress=False)
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        return df.reindex(columns=OHLCV_COLUMNS)
+
+
+class FixtureFetcher:
+    # Cours synthétiques déterministes par ticker, pour démarrer et tester l'application sans réseau
+    def __init__(self, origin='2000-01-03'):
+        self.origin = pd.Timestamp(origin)
+
+    def fetch(self, ticker, start, end):
+        # La trajectoire est générée depuis une origine fixe, donc identique quelle que soit la plage demandée
+        dates = pd.bdate_range(self.origin, pd.Timestamp(end) - pd.Timedelta(days=1), name='Date')
+        # Tirages ligne par ligne : la valeur d'une date ne dépend pas de la fin de la plage
+        z = np.random.default_rng(zlib.crc32(ticker.encode())).standard_normal((len(dates), 4))
+        close = 50 * np.exp(np.cumsum(0.0004 + 0.02 * z[:, 0]))
+        spread = 0.01 * np.abs(z[:, 1]) * close
+        df = pd.DataFrame({
+            'Close': close,
+            'High': close + spread,
+            'Low': close - spread,
+            'Open': close * (1 + 0.005 * z[:, 2]),
+            'Volume': np.round(3_000_000 * np.exp(0.3 * z[:, 3])),
+        }, index=dates)
+        return df[df.index >= pd.Timestamp(start)]
+
+
+class MarketDataStore:
+    # Stockage local des cours OHLCV au format Arrow (un fichier par ticker), lu par projection mémoire.
+    # Le fetcher n'est sollicité que pour compléter les dates absentes du stockage.
+    def __init__(self, directory='data/market', fetcher=None):
+        self.directory = directory
+        self.fetcher = fetcher or YahooFetcher()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, ticker):
+        return os.path.join(self.directory, re.sub(r'[^A-Za-z0-9.-]', '_', ticker) + '.arrow')
+
+    def read(self, ticker):
+        # Cours stockés et plage [début, fin[ déjà couverte par les téléchargements précédents
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            empty = pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype=float)
+            return empty, None
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas().set_index('Date')
+        metadata = table.schema.metadata
+        return df, (pd.Timestamp(metadata[b'coverage_start'].decode()), pd.Timestamp(metadata[b'coverage_end'].decode()))
+
+    def write(self, ticker, df, coverage):
+        # Écriture dans un fichier temporaire puis remplacement atomique : les autres workers lisent toujours un fichier complet
+        table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'coverage_start': coverage[0].isoformat().encode(),
+            b'coverage_end': coverage[1].isoformat().encode(),
+        })
+        path = self.path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def missing_ranges(self, coverage, start, end):
+        # Plages [début, fin[ à télécharger : avant et après la plage déjà couverte
+        if coverage is None:
+            return [(start, end)]
+        ranges = []
+        if start < coverage[0]:
+            ranges.append((start, coverage[0]))
+        if len(pd.bdate_range(coverage[1], end - pd.Timedelta(days=1))):
+            ranges.append((coverage[1], end))
+        return ranges
+
+    def update(self, ticker, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        stored, coverage = self.read(ticker)
+        previous_coverage = coverage
+        fetched = []
+        for range_start, range_end in self.missing_ranges(coverage, start, end):
+            try:
+                df = self.fetcher.fetch(ticker, range_start, range_end).dropna(how='all')
+                # yfinance renvoie un tableau vide, sans erreur, quand le téléchargement échoue
+                if df.empty:
+                    raise ValueError(f"aucun cours reçu du {range_start:%Y-%m-%d} au {range_end:%Y-%m-%d}")
+            except Exception as e:
+                # Sans réseau, les données déjà stockées restent servies
+                if coverage is None:
+                    raise
+                print(f"Mise à jour de {ticker} impossible ({e}), utilisation des données locales.")
+                continue
+            df = df[OHLCV_COLUMNS].astype(float)
+            df.index = pd.DatetimeIndex(df.index, name='Date').tz_localize(None)
+            fetched.append(df)
+            # La plage n'est couverte que jusqu'au dernier cours reçu : les séances suivantes (non encore publiées)
+            # seront redemandées
+            covered = (range_start, min(range_end, df.index.max().normalize() + pd.Timedelta(days=1)))
+            coverage = (min(covered[0], coverage[0]), max(covered[1], coverage[1])) if coverage else covered
+
+        if fetched:
+            new = pd.concat(fetched)
+            stored = new if stored.empty else pd.concat([stored, new])
+            stored = stored[~stored.index.duplicated(keep='last')].sort_index()
+        if coverage != previous_coverage:
+            self.write(ticker, stored, coverage)
+        return stored
+
+    def get(self, ticker, start, end):
+        stored = self.update(ticker, start, end)
+        return stored[(stored.index >= pd.Timestamp(start)) & (stored.index < pd.Timestamp(end).normalize())].copy()
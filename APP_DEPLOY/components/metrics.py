@@ -0,0 +1,139 @@
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import flask
+
+# Bornes des histogrammes : durées en secondes, tailles de réponse en octets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6)
+
+
+class Histogram:
+    # Histogramme cumulatif au sens de Prometheus, une série par combinaison de valeurs des labels
+    def __init__(self, name, description, labels, buckets):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            # [effectif par borne, somme, nombre d'observations]
+            series = self.series.setdefault(label_values, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                series[0][i] += value <= bound
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            for label_values, (counts, total, count) in sorted(self.series.items()):
+                labels = ','.join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+                for bound, c in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{labels},le="{bound:g}"}} {c}')
+                lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'{self.name}_sum{{{labels}}} {total:.6f}')
+                lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+
+class Metrics:
+    # Registre des métriques du processus, exposé au format texte de Prometheus.
+    # Les caches sont lus au moment de l'export : stats() renvoie (succès, échecs).
+    def __init__(self):
+        self.histograms = []
+        self.caches = {}
+
+    def histogram(self, name, description, labels, buckets=LATENCY_BUCKETS):
+        histogram = Histogram(name, description, labels, buckets)
+        self.histograms.append(histogram)
+        return histogram
+
+    def register_cache(self, name, stats):
+        self.caches[name] = stats
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines += histogram.render()
+        for metric, position, description in (('cache_hits_total', 0, 'Cache lookups served from the cache'),
+                                              ('cache_misses_total', 1, 'Cache lookups that had to compute the value')):
+            lines += [f'# HELP {metric} {description}', f'# TYPE {metric} counter']
+            lines += [f'{metric}{{cache="{name}"}} {stats()[position]}' for name, stats in sorted(self.caches.items())]
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+callback_seconds = metrics.histogram('dash_callback_duration_seconds',
+                                     'Wall time of Dash callback requests, serialization included',
+                                     ('callback', 'phase'))
+callback_bytes = metrics.histogram('dash_callback_response_bytes', 'Serialized callback response size',
+                                   ('callback', 'phase'), SIZE_BUCKETS)
+prophet_stage_seconds = metrics.histogram('prophet_stage_duration_seconds', 'Time spent in ProphetForecast stages',
+                                          ('stage',))
+
+
+def stage(name):
+    return prophet_stage_seconds.time(name)
+
+
+def instrument_callbacks(dash_app, profile_dir=None):
+    # Mesure chaque requête /_dash-update-component : durée et taille de la réponse, par callback.
+    # phase='poll' : interrogations du résultat d'un callback en arrière-plan, 'call' sinon.
+    # Si profile_dir est fourni, une requête portant l'en-tête X-Profile (ou le cookie profile) est profilée avec
+    # cProfile ; le fichier .prof écrit dans profile_dir est indiqué dans l'en-tête X-Profile de la réponse.
+    server = dash_app.server
+
+    def callback_name(output):
+        entry = dash_app.callback_map.get(output)
+        return entry['callback'].__name__ if entry else output
+
+    @server.before_request
+    def start_callback_timer():
+        if not flask.request.path.endswith('/_dash-update-component'):
+            return
+        flask.g.callback_start = time.perf_counter()
+        if profile_dir and (flask.request.headers.get('X-Profile') or flask.request.cookies.get('profile')):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Un autre profileur est déjà actif (Python 3.12+ : un seul par processus) : requête non profilée
+                return
+            flask.g.profiler = profiler
+
+    @server.after_request
+    def record_callback(response):
+        start = flask.g.pop('callback_start', None)
+        if start is None:
+            return response
+        profiler = flask.g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        name = callback_name((flask.request.get_json(silent=True) or {}).get('output', ''))
+        phase = 'poll' if 'cacheKey' in flask.request.args else 'call'
+        callback_seconds.observe(elapsed, name, phase)
+        callback_bytes.observe(response.calculate_content_length() or 0, name, phase)
+
+        if profiler is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+            path = os.path.join(profile_dir, f'{name}-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}.prof')
+            profiler.dump_stats(path)
+            response.headers['X-Profile'] = path
+        return response
@@ -7,8 +7,14 @@ import numpy as np
 import plotly.express as px
 
 class Model:
-    def __init__(self):
+    def __init__(self, tickers=('ADBE',), stream_interval=None):
         
+        self.ticker_select = dbc.Select(
+            id='ticker-select',
+            options=[{'label': ticker, 'value': ticker} for ticker in tickers],
+            value=tickers[0]
+        )
+
         self.button_mesure = html.Div(
                 [
                     dbc.RadioItems(
@@ -27,18 +33,51 @@ class Model:
                 className="radio-group",
             )
 
-        self.tab_group =  dbc.ListGroup(
+        # Intervalles de la table des prévisions : Prophet, ou quantiles de trajectoires simulées
+        self.band_select = dbc.Select(
+            id='band-select',
+            options=[
+                {'label': 'Prophet', 'value': 'prophet'},
+                {'label': 'Monte Carlo (bootstrap)', 'value': 'bootstrap'},
+                {'label': 'Monte Carlo (GARCH)', 'value': 'garch'},
+            ],
+            value='prophet'
+        )
+
+        # Mode streaming : nouvelles séances ajoutées à la courbe des cours (stream_interval en secondes, None : désactivé)
+        self.stream = [dcc.Interval(id='predict-stream', interval=int((stream_interval or 1) * 1000), disabled=stream_interval is None),
+                       dcc.Store(id='predict-stream-position', data=None)]
+        # Composants nécessaires à la prévision du ticker affiché prêts (callback update_predict_ready)
+        self.ready = dcc.Store(id='predict-ready', data=False)
+        # Modèle ayant calculé la prévision affichée (ticker et empreinte), libellé par update_predict_version
+        self.served_by = dcc.Store(id='predict-model', data=None)
+
+        # Métriques alimentées par le backtest walk-forward (callback update_model_metrics)
+        self.tab_group = html.Div(self.metrics_group(None), id='model-metrics')
+        
+    def metrics_group(self, metrics, message="Backtest in progress..."):
+        if metrics is None:
+            return dbc.ListGroup(
                     [
                         dbc.ListGroupItem("Model Performance Metrics", active=True),
-                        dbc.ListGroupItem("RMSE: 7.20"),
-                        dbc.ListGroupItem("MAE: 4.76"),
-                        dbc.ListGroupItem("MAPE: 0.90%"),
-                        dbc.ListGroupItem("Training Period: Jan 2010 - Dec 2023"),
-                        dbc.ListGroupItem("Test Period: Jan 2024 - Oct 2024"),
-                        dbc.ListGroupItem("Last Updated: 04 Jan 2025")
+                        dbc.ListGroupItem(message),
                     ]
-                )      
-        
+                )
+
+        period = lambda bounds: f"{bounds[0]:%b %Y} - {bounds[1]:%b %Y}"
+        return dbc.ListGroup(
+                    [
+                        dbc.ListGroupItem("Model Performance Metrics", active=True),
+                        dbc.ListGroupItem(f"RMSE: {metrics['rmse']:.2f}"),
+                        dbc.ListGroupItem(f"MAE: {metrics['mae']:.2f}"),
+                        dbc.ListGroupItem(f"MAPE: {metrics['mape']:.2f}%"),
+                        dbc.ListGroupItem(f"Training Period: {period(metrics['training_period'])}"),
+                        dbc.ListGroupItem(f"Test Period: {period(metrics['test_period'])}"),
+                        dbc.ListGroupItem(f"Walk-forward Folds: {metrics['folds']}"),
+                        dbc.ListGroupItem(f"Last Updated: {metrics['last_updated']:%d %b %Y}")
+                    ]
+                )
+
     def render(self):
         row = html.Div(
                 [
@@ -46,9 +85,19 @@ class Model:
                     dbc.Row(
                         [
                             # Colonne de gauche avec le RangeSlider et un graphique
-                            dbc.Col([dcc.Graph(id='predict-graph')], width=9),
-                            dbc.Col([html.Br(), html.H5("Number of Future Days :", style={"color": "#2c3e50", "fontWeight": "normal" }) ,
-                                     dbc.Input(id="future-days",debounce=True, type='number', placeholder="Valid input...", valid=True, className="mb-3"),
+                            dbc.Col([dcc.Graph(id='predict-graph'), dcc.Graph(id='volatility-graph')] + self.stream + [self.ready, self.served_by], width=9),
+                            dbc.Col([html.Br(), html.H5("Ticker :", style={"color": "#2c3e50", "fontWeight": "normal" }),
+                                     self.ticker_select, html.Br(),
+                                     html.H5("Number of Future Days :", style={"color": "#2c3e50", "fontWeight": "normal" }) ,
+                                     dbc.Input(id="future-days",debounce=True, type='number', min=1, step=1, placeholder="Valid input...", valid=True, className="mb-3"),
+                                     html.H5("Intervals :", style={"color": "#2c3e50", "fontWeight": "normal" }),
+                                     self.band_select, html.Br(),
+                                     # Progression et annulation du calcul des prévisions en arrière-plan
+                                     dbc.Progress(id='predict-progress', value=0, striped=True, animated=True, className="mb-2"),
+                                     dbc.Button("Cancel", id='predict-cancel', color="secondary", size="sm", disabled=True,
+                                                className="mb-3"),
+                                     # Version du modèle qui a servi la dernière prévision affichée
+                                     html.Div(html.Small(id='predict-version', className="text-muted"), className="mb-3"),
                                      self.tab_group], width=3),
                         ]
                     ),
@@ -0,0 +1,288 @@
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+import pandas as pd
+
+NEWSAPI_URL = 'https://newsapi.org'
+# Réponses temporaires pour lesquelles la requête est relancée après une attente
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Prépositions retirées du nuage de mots
+STOP_WORDS = {'de', 'la', 'le', 'des', 'en', 'pour', 'avec', 'sans', 'sur', 'par', 'à', 'et', 'mais', 'ou'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    published_at TEXT NOT NULL,
+    query TEXT,
+    source TEXT,
+    title TEXT,
+    description TEXT,
+    url TEXT,
+    fetched_at TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at);
+CREATE TABLE IF NOT EXISTS fetches (
+    query TEXT,
+    day TEXT,
+    fetched_at TEXT,
+    complete INTEGER,
+    PRIMARY KEY (query, day)
+);
+CREATE TABLE IF NOT EXISTS term_counts (
+    day TEXT,
+    term TEXT,
+    count INTEGER,
+    PRIMARY KEY (day, term)
+);
+CREATE TABLE IF NOT EXISTS indexed_articles (
+    id TEXT PRIMARY KEY
+);
+"""
+
+
+def tokenize(text):
+    # Minuscules, lettres uniquement, sans prépositions ni mots de 4 caractères ou moins
+    words = re.sub(r'[^a-z\s]', '', text.lower()).split()
+    return [word for word in words if word not in STOP_WORDS and len(word) > 4]
+
+
+class NewsAPIError(Exception):
+    def __init__(self, status, code, message):
+        super().__init__(f"{status} {code} : {message}")
+        self.status = status
+        self.code = code
+
+
+def retry_delay(headers, attempt, backoff):
+    # Délai indiqué par le serveur (Retry-After en secondes), sinon attente exponentielle
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return backoff * 2 ** attempt
+
+
+class NewsClient:
+    # Client asynchrone de l'endpoint /v2/everything de NewsAPI : une session HTTP et son pool de connexions
+    # pour toutes les requêtes, délai par requête, reprises avec attente exponentielle et pagination
+    def __init__(self, api_key, base_url=NEWSAPI_URL, page_size=100, max_pages=5, timeout=10, retries=3, backoff=0.5,
+                 concurrency=4):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.concurrency = concurrency
+
+    async def get_page(self, session, params):
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.get(f'{self.base_url}/v2/everything', params=params) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.retries:
+                        delay = retry_delay(response.headers, attempt, self.backoff)
+                    else:
+                        data = await response.json(content_type=None)
+                        if response.status != 200:
+                            raise NewsAPIError(response.status, data.get('code'), data.get('message'))
+                        return data
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            await asyncio.sleep(delay)
+
+    async def fetch_day(self, session, query, day):
+        # Toutes les pages des articles d'une journée pour une requête
+        articles = []
+        for page in range(1, self.max_pages + 1):
+            params = {
+                'q': query,
+                'from': f'{day.isoformat()}T00:00:00',
+                'to': f'{day.isoformat()}T23:59:59',
+                'sortBy': 'publishedAt',
+                'pageSize': self.page_size,
+                'page': page,
+                'apiKey': self.api_key,
+            }
+            try:
+                data = await self.get_page(session, params)
+            except NewsAPIError as e:
+                # L'offre gratuite de NewsAPI limite le nombre de résultats accessibles par pagination
+                if e.code == 'maximumResultsReached' and articles:
+                    break
+                raise
+            articles.extend(data.get('articles') or [])
+            if not data.get('articles') or page * self.page_size >= data.get('totalResults', 0):
+                break
+        return articles
+
+    async def fetch_all(self, requests):
+        # requests : couples (requête, jour) ; retourne pour chacun la liste des articles ou l'exception rencontrée
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            results = await asyncio.gather(*[self.fetch_day(session, query, day) for query, day in requests],
+                                           return_exceptions=True)
+        return dict(zip(requests, results))
+
+
+def article_id(article):
+    key = article.get('url') or f"{article.get('title')}|{article.get('publishedAt')}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class NewsStore:
+    # Articles dédupliqués dans une base SQLite locale, avec le journal des journées déjà téléchargées
+    # et l'index de fréquence des termes par jour, tenu à jour à l'arrivée de chaque article
+    def __init__(self, path='data/news.sqlite'):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with closing(self.connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+            # Articles stockés avant la création de l'index
+            self.index_terms(conn, conn.execute(
+                'SELECT id, published_at, title, description FROM articles '
+                'WHERE id NOT IN (SELECT id FROM indexed_articles)').fetchall())
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add(self, query, articles):
+        # Retourne le nombre d'articles nouveaux ; un article déjà connu (même URL) est ignoré
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (article_id(a), a.get('publishedAt'), query, (a.get('source') or {}).get('name'),
+             a.get('title'), a.get('description'), a.get('url'), fetched_at)
+            for a in articles if a.get('publishedAt')
+        ]
+        with closing(self.connect()) as conn, conn:
+            new = [row for row in rows if conn.execute('INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)', row).rowcount]
+            self.index_terms(conn, [(row[0], row[1], row[4], row[5]) for row in new])
+            return len(new)
+
+    def index_terms(self, conn, articles):
+        # articles : (id, published_at, title, description) ; ajoute leurs termes aux comptes de leur jour de publication
+        counts = Counter()
+        for _, published_at, title, description in articles:
+            for term in tokenize(f"{title or ''} {description or ''}"):
+                counts[(published_at[:10], term)] += 1
+        conn.executemany('INSERT INTO term_counts VALUES (?, ?, ?) '
+                         'ON CONFLICT (day, term) DO UPDATE SET count = count + excluded.count',
+                         [(day, term, count) for (day, term), count in counts.items()])
+        conn.executemany('INSERT OR IGNORE INTO indexed_articles VALUES (?)', [(article[0],) for article in articles])
+
+    def term_counts(self, start=None, end=None, limit=None):
+        # Fréquence des termes des articles publiés du jour start au jour end inclus, par fusion des comptes journaliers
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('day >= ?')
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            clauses.append('day <= ?')
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        query = f'SELECT term AS Word, SUM(count) AS Count FROM term_counts {where} GROUP BY term ORDER BY Count DESC, term'
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        with closing(self.connect()) as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def mark_fetched(self, query, day, complete):
+        with closing(self.connect()) as conn, conn:
+            conn.execute('INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?)',
+                         (query, day.isoformat(), datetime.now(timezone.utc).isoformat(), int(complete)))
+
+    def complete_days(self, query):
+        # Journées téléchargées après leur fin : leurs articles ne changeront plus
+        with closing(self.connect()) as conn:
+            rows = conn.execute('SELECT day FROM fetches WHERE query = ? AND complete = 1', (query,)).fetchall()
+        return {datetime.fromisoformat(day).date() for day, in rows}
+
+    def read(self, start=None, end=None):
+        # Articles publiés dans [start, end[, du plus récent au plus ancien
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('published_at >= ?')
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            clauses.append('published_at < ?')
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with closing(self.connect()) as conn:
+            df = pd.read_sql_query(
+                f'SELECT published_at AS Date, title AS Title, description AS Description FROM articles {where} '
+                'ORDER BY published_at DESC', conn, params=params)
+        df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_localize(None)
+        return df
+
+
+class NewsIngestor:
+    # Téléchargement des journées manquantes des `days` derniers jours pour chaque requête, puis stockage.
+    # Une journée n'est plus redemandée une fois téléchargée après sa fin.
+    def __init__(self, client, store, queries=('adobe',), days=7):
+        self.client = client
+        self.store = store
+        self.queries = tuple(queries)
+        self.days = days
+        self.last_refresh = None
+
+    def pending(self, today):
+        days = [today - timedelta(days=k) for k in range(self.days)]
+        requests = []
+        for query in self.queries:
+            complete = self.store.complete_days(query)
+            requests.extend((query, day) for day in days if day not in complete)
+        return requests
+
+    def refresh(self):
+        today = datetime.now(timezone.utc).date()
+        requests = self.pending(today)
+        results = asyncio.run(self.client.fetch_all(requests)) if requests else {}
+
+        added, errors = 0, {}
+        for (query, day), result in results.items():
+            if isinstance(result, Exception):
+                errors[f'{query} {day}'] = repr(result)
+                continue
+            added += self.store.add(query, result)
+            self.store.mark_fetched(query, day, complete=day < today)
+        if errors:
+            print(f"Actualités : {len(errors)} requête(s) en échec, ex. {next(iter(errors.values()))}")
+
+        self.last_refresh = {'at': datetime.now(), 'requests': len(requests), 'added': added, 'errors': errors}
+        return self.last_refresh
+
+
+class NewsScheduler:
+    # Rafraîchissement périodique des actualités dans un thread d'arrière-plan ;
+    # on_refresh reçoit le bilan de chaque rafraîchissement
+    def __init__(self, ingestor, interval=3600, on_refresh=None):
+        self.ingestor = ingestor
+        self.interval = interval
+        self.on_refresh = on_refresh
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='news-scheduler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                summary = self.ingestor.refresh()
+                if self.on_refresh:
+                    self.on_refresh(summary)
+            except Exception as e:
+                print(f"Rafraîchissement des actualités en échec : {e!r}")
@@ -0,0 +1,128 @@
+import argparse
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Vocabulaire des articles générés : de quoi alimenter le nuage de mots et les trois classes de sentiment
+SUBJECTS = ['Adobe', 'Adobe Firefly', 'Photoshop', 'Adobe Express', 'Creative Cloud', 'Acrobat AI Assistant']
+EVENTS = [
+    ('beats earnings expectations and raises guidance', 'Investors welcome strong subscription growth'),
+    ('shares fall after weak revenue outlook', 'Analysts worry about slowing demand and fierce competition'),
+    ('unveils new generative features for designers', 'The update ships to subscribers next month'),
+    ('wins praise from creative professionals', 'Reviewers call the release a great improvement'),
+    ('faces lawsuit over subscription cancellation fees', 'Regulators criticise hidden terms and poor disclosure'),
+    ('announces partnership with cloud providers', 'The companies will integrate their platforms'),
+]
+
+
+def stub_articles(query, day, count):
+    # Articles déterministes d'une journée : mêmes titres et URL à chaque appel
+    rng = zlib.crc32(f'{query}|{day}'.encode())
+    articles = []
+    for i in range(count):
+        subject = SUBJECTS[(rng + i // len(EVENTS)) % len(SUBJECTS)]
+        title, description = EVENTS[(rng // 7 + i) % len(EVENTS)]
+        published = datetime.combine(day, datetime.min.time()) + timedelta(seconds=(86399 * (count - i)) // (count + 1))
+        articles.append({
+            'source': {'id': None, 'name': 'Stub News'},
+            'author': None,
+            'title': f'{subject} {title}',
+            'description': description,
+            'url': f'https://news.example/{query}/{day.isoformat()}/{i}',
+            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': None,
+        })
+    return articles
+
+
+class NewsStubServer:
+    # Serveur HTTP local imitant l'endpoint /v2/everything de NewsAPI (pagination, limites, erreurs temporaires),
+    # pour développer, tester et mesurer l'ingestion des actualités sans réseau
+    def __init__(self, host='127.0.0.1', port=0, articles_per_day=30, latency=0.0, failures=0, max_results=None):
+        self.articles_per_day = articles_per_day
+        self.latency = latency
+        # Nombre de premières requêtes rejetées avec un code 429, pour exercer les reprises
+        self.failures = failures
+        # Nombre maximal de résultats accessibles par pagination, comme l'offre gratuite de NewsAPI
+        self.max_results = max_results
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='news-stub', daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def respond(self, path):
+        with self.lock:
+            self.requests += 1
+            fail = self.requests <= self.failures
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            return 429, {'status': 'error', 'code': 'rateLimited', 'message': 'Stub rate limit'}
+
+        url = urlparse(path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path != '/v2/everything':
+            return 404, {'status': 'error', 'code': 'notFound', 'message': url.path}
+        if not params.get('apiKey'):
+            return 401, {'status': 'error', 'code': 'apiKeyMissing', 'message': 'Your API key is missing.'}
+
+        day = datetime.fromisoformat(params.get('from', datetime.now().isoformat())).date()
+        page, page_size = int(params.get('page', 1)), int(params.get('pageSize', 100))
+        if self.max_results is not None and (page - 1) * page_size >= self.max_results:
+            return 426, {'status': 'error', 'code': 'maximumResultsReached', 'message': 'Stub result limit'}
+        articles = stub_articles(params.get('q', ''), day, self.articles_per_day)
+        return 200, {
+            'status': 'ok',
+            'totalResults': len(articles),
+            'articles': articles[(page - 1) * page_size:page * page_size],
+        }
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = stub.respond(self.path)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 429:
+                    self.send_header('Retry-After', '0')
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == '__main__':
+    # Lancement autonome : python -m components.news_stub --port 8765, puis NEWS_API_URL=http://127.0.0.1:8765
+    parser = argparse.ArgumentParser(description="Serveur local imitant NewsAPI")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--articles-per-day', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+    stub = NewsStubServer(port=args.port, articles_per_day=args.articles_per_day, latency=args.latency)
+    print(f"NewsAPI local sur {stub.url}")
+    stub.server.serve_forever()
@@ -1,88 +1,263 @@
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+
+import numpy as np
 import pandas as pd
 from prophet import Prophet
-from ta.momentum import RSIIndicator
-from ta.trend import SMAIndicator, EMAIndicator
-from ta.trend import MACD
-import plotly.graph_objects as go
+from prophet.serialize import model_from_json, model_to_json
+from prophet.utilities import regressor_coefficients
+
+from components.indicators import IndicatorEngine, PathIndicators
+from components.metrics import prophet_stage_seconds, stage
+
+# Régresseurs par défaut : indicateurs techniques recalculés à chaque pas de la prévision récursive.
+# Les autres colonnes passées dans `features` (ex. sentiment des actualités) gardent leur dernière valeur connue.
+DEFAULT_FEATURES = ['EMA10Day', 'MA10Day', 'MA30Day', 'RSI14Day', 'RSI3Day', 'RSI9Day', 'MA50Day', 'Signal']
+
+# Version du calcul de la prévision récursive, incluse dans l'empreinte du modèle : la changer écarte les
+# prévisions en cache (disque, callbacks) calculées par une version précédente
+FORECAST_VERSION = 3
+
+
+def artifact_path(directory, ticker):
+    return os.path.join(directory, f"prophet_{re.sub(r'[^A-Za-z0-9.-]', '_', ticker)}.json")
+
 
 class ProphetForecast:
-    def __init__(self, data, date_col='Date', target='Close', features=None, exclude_weekends=True):
+    def __init__(self, data, date_col='Date', target='Close', features=None, exclude_weekends=True, cache=None):
         # Initialisation des variables
         self.date_col = date_col
         self.target = target
-        self.features = features or ['EMA10Day', 'MA10Day', 'MA30Day', 'RSI14Day', 'RSI3Day', 'RSI9Day', 'MA50Day', 'Signal']
+        self.features = features or list(DEFAULT_FEATURES)
         self.exclude_weekends = exclude_weekends
         self.data = data
         self.model = Prophet()
-        self.forecast = None
+        self.history_forecast = None
+        self.cache = cache
+        self.fingerprint = None
 
     def preprocess_data(self):
-        # Préparation des données
-        self.data[self.date_col] = pd.to_datetime(self.data[self.date_col])
-        self.data['ds'] = pd.to_datetime(self.data[self.date_col])
-        self.prophet_df = self.data[[self.date_col, self.target] + self.features].copy()
-        self.prophet_df = self.prophet_df.rename(columns={self.date_col: 'ds', self.target: 'y'})
-        self.prophet_df.dropna(inplace=True)
+        # Préparation des données dans une copie : self.data est partagé en lecture seule et n'est jamais modifié
+        with stage('preprocess'):
+            self.prophet_df = self.data[[self.date_col, self.target] + self.features].copy()
+            self.prophet_df = self.prophet_df.rename(columns={self.date_col: 'ds', self.target: 'y'})
+            self.prophet_df['ds'] = pd.to_datetime(self.prophet_df['ds'])
+            self.prophet_df.dropna(inplace=True)
 
     def add_regressors(self):
         for feature in self.features:
             self.model.add_regressor(feature)
 
     def fit_model(self):
+        # Un nouvel ajustement invalide les prévisions en cache du modèle précédent
+        if self.cache is not None and self.fingerprint is not None:
+            self.cache.invalidate(self.fingerprint)
+        if self.model.history is not None:
+            self.model = Prophet()
+
         self.preprocess_data()
         self.add_regressors()
-        self.model.fit(self.prophet_df)
+        with stage('fit'):
+            self.model.fit(self.prophet_df)
+        self.fingerprint = self.compute_fingerprint()
+        self.cache_history()
+
+    def data_fingerprint(self):
+        # Empreinte des données d'entraînement et de la liste des régresseurs
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(self.prophet_df, index=False).to_numpy().tobytes())
+        digest.update(','.join([self.target] + self.features).encode())
+        return digest.hexdigest()[:16]
+
+    def save_model(self, path):
+        # Artefact JSON : modèle sérialisé par Prophet et empreinte des données qui ont servi à l'ajuster
+        artifact = {'data_fingerprint': self.data_fingerprint(), 'features': self.features, 'model': model_to_json(self.model)}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(artifact, f)
+        os.replace(tmp_path, path)
+
+    def load_model(self, path):
+        # Charge l'artefact s'il a été ajusté sur les mêmes données ; renvoie False sinon
+        if not os.path.exists(path):
+            return False
+        self.preprocess_data()
+        with open(path) as f:
+            artifact = json.load(f)
+        if artifact['data_fingerprint'] != self.data_fingerprint():
+            return False
+
+        if self.cache is not None and self.fingerprint is not None:
+            self.cache.invalidate(self.fingerprint)
+        with stage('load'):
+            self.model = model_from_json(artifact['model'])
+        self.fingerprint = self.compute_fingerprint()
+        self.cache_history()
+        return True
+
+    def fit_or_load(self, path):
+        # Réajustement uniquement si les données ont changé depuis l'artefact enregistré
+        if self.load_model(path):
+            return False
+        self.fit_model()
+        self.save_model(path)
+        return True
+
+    def compute_fingerprint(self):
+        # Empreinte du modèle ajusté : données d'entraînement, régresseurs, paramètres estimés et version du calcul
+        digest = hashlib.sha256()
+        digest.update(self.data_fingerprint().encode())
+        digest.update(str(FORECAST_VERSION).encode())
+        for name, value in sorted(self.model.params.items()):
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        return digest.hexdigest()[:16]
+
+    def cache_history(self):
+        # Les dates historiques ne changent pas entre deux prédictions : leurs composantes sont calculées une seule fois
+        with stage('history'):
+            self.history_forecast = self.model.predict(self.prophet_df[['ds'] + self.features])
+        self.indicators = IndicatorEngine()
+        self.indicators.compute(self.data[self.target].dropna())
+        self.regressor_coefs = {
+            row.regressor: (row.regressor_mode, row.center, row.coef)
+            for row in regressor_coefficients(self.model).itertuples()
+        }
 
     def make_future_dataframe(self, p):
         # Générer un dataframe pour la prédiction
         future = self.model.make_future_dataframe(periods=p, freq='B' if self.exclude_weekends else 'D')
-        future = future.merge(self.data[['ds'] + self.features], on='ds', how='left')
+        future = future.merge(self.prophet_df[['ds'] + self.features], on='ds', how='left')
         future['y'] = self.data[(self.data['Date'] >= future['ds'].min()) & (self.data['Date'] <= future['ds'].max())]['Close']
         return future
 
     def update_indicators(self, df):
         # Calcul des indicateurs techniques
-        df['RSI3Day'] = RSIIndicator(df['y'], window=3).rsi()
-        df['RSI9Day'] = RSIIndicator(df['y'], window=9).rsi()
-        df['RSI14Day'] = RSIIndicator(df['y'], window=14).rsi()
-        df['MA10Day'] = SMAIndicator(df['y'], window=10).sma_indicator()
-        df['MA30Day'] = SMAIndicator(df['y'], window=30).sma_indicator()
-        df['MA50Day'] = SMAIndicator(df['y'], window=50).sma_indicator()
-        df['EMA10Day'] = EMAIndicator(df['y'], window=10).ema_indicator()
-
-        # MACD
-        macd = MACD(df['y'])
-        df['MACD'] = macd.macd()
-        df['Signal'] = macd.macd_signal()
+        for name, values in IndicatorEngine().compute(df['y']).items():
+            df[name] = values
         df.dropna(inplace=True)
         return df
 
-    def predict(self, p):
-        future = self.prophet_df[['ds'] + self.features].copy()
-        future['y'] = self.data[(self.data['Date'] >= future['ds'].min()) & (self.data['Date'] <= future['ds'].max())][self.target]
+    def future_dates(self, p):
+        last_date = self.prophet_df['ds'].iloc[-1]
+        if self.exclude_weekends:
+            return pd.bdate_range(last_date + pd.tseries.offsets.BDay(1), periods=p)
+        return pd.date_range(last_date + pd.Timedelta(days=1), periods=p)
+
+    def base_components(self, dates):
+        # Tendance et saisonnalités des dates futures, régresseurs fixés à leur centre (contribution nulle)
+        df = pd.DataFrame({'ds': dates})
+        for feature, (_, center, _) in self.regressor_coefs.items():
+            df[feature] = center
+        df = self.model.setup_dataframe(df)
+        components = self.model.predict_seasonal_components(df)
+        components['trend'] = self.model.predict_trend(df)
+        return components[['trend', 'additive_terms', 'multiplicative_terms']]
 
-        for i in range(p):
-            next_date = future['ds'].max() + pd.tseries.offsets.BDay(1 if self.exclude_weekends else 0)
+    def predict_yhat(self, base, row):
+        # yhat d'une ligne : composantes de base + contribution linéaire des régresseurs
+        additive, multiplicative = base.additive_terms, base.multiplicative_terms
+        for feature, (mode, center, coef) in self.regressor_coefs.items():
+            term = coef * (row[feature] - center)
+            if mode == 'additive':
+                additive += term
+            else:
+                multiplicative += term
+        return base.trend * (1 + multiplicative) + additive
+
+    def forecast_steps(self, p, start=0, state=None):
+        # Prévision récursive des pas start+1..p à partir de l'état (indicateurs, dernière ligne) atteint au pas start
+        indicators, last_row = state or (copy.deepcopy(self.indicators), self.prophet_df.iloc[-1])
+        dates = self.future_dates(p)[start:]
+        with stage('components'):
+            bases = self.base_components(dates)
+        rows = []
+        # Temps cumulé des mises à jour d'indicateurs, enregistré une fois par prévision
+        indicator_seconds = 0.0
+
+        for next_date, base in zip(dates, bases.itertuples()):
             new_row = {'ds': next_date}
+            new_row.update({feature: last_row[feature] for feature in self.features})
+
+            # Seule la nouvelle ligne est prédite à chaque pas
+            new_row['y'] = self.predict_yhat(base, new_row)
+            step_start = time.perf_counter()
+            values = indicators.update(new_row['y'])
+            indicator_seconds += time.perf_counter() - step_start
+
+            # La ligne porte les indicateurs mis à jour avec son propre cours, comme le recalcul complet de la boucle
+            # d'origine : ils servent à la prédiction finale et de régresseurs au pas suivant
+            new_row.update({feature: values[feature] for feature in self.features if feature in values})
+            rows.append(new_row)
+            last_row = new_row
+
+        prophet_stage_seconds.observe(indicator_seconds, 'indicators')
+        return pd.DataFrame(rows, columns=['ds'] + self.features), (indicators, last_row)
+
+    @stage('predict')
+    def predict(self, p):
+        cached = self.cache.lookup(self.fingerprint, p) if self.cache is not None else None
+
+        if cached is not None and cached[0] >= p:
+            # Un horizon plus long en cache contient déjà la prévision demandée
+            future_forecast = cached[1].head(p)
+        else:
+            # Sinon la récursion reprend là où s'arrête le plus long horizon plus court en cache
+            horizon, future_forecast, state = cached or (0, None, None)
+            with stage('recursion'):
+                future, state = self.forecast_steps(p, horizon, state)
+            if len(future):
+                with stage('future'):
+                    future_forecast = pd.concat([future_forecast, self.model.predict(future)], ignore_index=True)
+            if self.cache is not None and p > 0:
+                self.cache.store(self.fingerprint, p, future_forecast, state)
+
+        # Les lignes futures sont raccordées à l'historique en cache ; rien n'est écrit sur l'instance, partagée
+        # entre les callbacks concurrents
+        return pd.concat([self.history_forecast, future_forecast], ignore_index=True)
 
-            for feature in self.features:
-                if feature in future.columns:
-                    new_row[feature] = future[feature].iloc[-1]
+    def bootstrap_shocks(self, p, paths, rng):
+        # Écarts logarithmiques entre cours et ajustement sur l'historique, tirés avec remise pour chaque pas de chaque trajectoire
+        residuals = np.log(self.prophet_df['y'].to_numpy() / self.history_forecast['yhat'].to_numpy())
+        return rng.choice(residuals[np.isfinite(residuals)], size=(paths, p))
 
-            future = pd.concat([future, pd.DataFrame([new_row])], ignore_index=True)
-            forecast = self.model.predict(future[['ds'] + self.features])
-            new_prediction = forecast['yhat'].iloc[-1]
-            future.loc[future['ds'] == next_date, 'y'] = new_prediction
+    @stage('simulate')
+    def simulate(self, p, shocks):
+        # Prévision récursive sur toutes les trajectoires à la fois, pas à pas comme forecast_steps : le yhat des
+        # régresseurs du pas précédent, multiplié par exp(choc), met à jour les indicateurs de la trajectoire, et le
+        # cours simulé est le yhat réévalué sur ces indicateurs, multiplié par le même choc (sans choc : predict).
+        # shocks : tableau trajectoires x p (résidus rééchantillonnés, innovations GARCH...) ; retourne les cours simulés
+        paths = len(shocks)
+        dates = self.future_dates(p)
+        bases = self.base_components(dates)
+        indicators = PathIndicators(self.indicators, paths)
+        last_row = self.prophet_df.iloc[-1]
+        row = {feature: np.full(paths, float(last_row[feature])) for feature in self.features}
+        prices = np.empty((paths, p))
 
-            future = self.update_indicators(future)
+        for t, base in enumerate(bases.itertuples()):
+            growth = np.exp(shocks[:, t])
+            values = indicators.update(self.predict_yhat(base, row) * growth)
+            row.update({feature: values[feature] for feature in self.features if feature in values})
+            prices[:, t] = self.predict_yhat(base, row) * growth
+        return dates, prices
 
-        self.forecast = self.model.predict(future)
-        return self.forecast
+    def simulation_bands(self, dates, prices):
+        # Médiane et quantiles des trajectoires, au format de la table des prévisions (largeur d'intervalle de Prophet)
+        tail = (1 - self.model.interval_width) / 2
+        lower, median, upper = np.quantile(prices, [tail, 0.5, 1 - tail], axis=0)
+        return pd.DataFrame({'ds': dates, 'yhat': median, 'yhat_lower': lower, 'yhat_upper': upper})
 
-    def plot_forecast(self):
-        fig = self.model.plot(self.forecast)
+    def plot_forecast(self, forecast):
+        # forecast : tableau renvoyé par predict
+        fig = self.model.plot(forecast)
         fig.suptitle('Prédiction des prix de clôture avec Prophet')
         return fig
 
-    def get_forecast_table(self):
-        return self.forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(len(self.forecast))
\ No newline at end of file
+    def get_forecast_table(self, forecast):
+        return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
\ No newline at end of file
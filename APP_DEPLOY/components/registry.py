@@ -0,0 +1,146 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class ModelVersion:
+    # Version d'un modèle publiée dans le registre ; refs : callbacks en cours qui l'utilisent
+    def __init__(self, name, number, forecaster):
+        self.name = name
+        self.number = number
+        self.forecaster = forecaster
+        self.fingerprint = forecaster.fingerprint
+        self.loaded_at = datetime.now()
+        self.refs = 0
+        self.retired = False
+
+    def label(self):
+        return f"{self.name} v{self.number} ({self.fingerprint}, {self.loaded_at:%d %b %Y %H:%M:%S})"
+
+
+class ModelRegistry:
+    # Versions successives des modèles de prévision (ProphetForecast), par nom de ticker.
+    # Une nouvelle version est construite en arrière-plan (reload) puis publiée : le remplacement de la version
+    # courante est atomique, sous le verrou du registre. Un callback prend une référence sur la version courante
+    # (acquire) et la garde jusqu'à la fin de son exécution, même si une autre version est publiée entre-temps.
+    # Une version remplacée est retirée du registre quand sa dernière référence est rendue ; on_evict est alors appelé.
+    # on_publish est appelé avec chaque nouvelle version, une fois devenue la version courante.
+    def __init__(self, on_evict=None, on_publish=None, max_workers=1):
+        self.current = {}
+        self.versions = {}
+        self.numbers = {}
+        self.on_evict = on_evict
+        self.on_publish = on_publish
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='model-registry')
+        # Dernier chargement lancé et dernière erreur de chargement, par nom
+        self.pending = {}
+        self.errors = {}
+        self.stopped = threading.Event()
+        # Les tâches en arrière-plan des callbacks sont des processus issus du serveur par fork : un verrou tenu
+        # par un autre thread au moment du fork resterait bloqué dans le processus fils (sans fork sous Windows)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.reset_lock)
+
+    def reset_lock(self):
+        self.lock = threading.Lock()
+
+    def publish(self, name, forecaster):
+        # Un modèle identique (même empreinte) à la version courante n'en crée pas de nouvelle
+        evicted = []
+        with self.lock:
+            previous = self.current.get(name)
+            if previous is not None and previous.fingerprint == forecaster.fingerprint:
+                return previous
+            self.numbers[name] = self.numbers.get(name, 0) + 1
+            version = ModelVersion(name, self.numbers[name], forecaster)
+            self.versions.setdefault(name, {})[version.number] = version
+            self.current[name] = version
+            self.errors.pop(name, None)
+            if previous is not None:
+                previous.retired = True
+                if previous.refs == 0:
+                    evicted.append(self.remove(previous))
+        if self.on_publish:
+            self.on_publish(version)
+        for old in evicted:
+            self.evicted(old)
+        return version
+
+    def remove(self, version):
+        del self.versions[version.name][version.number]
+        return version
+
+    def evicted(self, version):
+        if self.on_evict:
+            self.on_evict(version)
+
+    def ready(self, name):
+        return name in self.current
+
+    @contextmanager
+    def acquire(self, name):
+        with self.lock:
+            version = self.current[name]
+            version.refs += 1
+        try:
+            yield version
+        finally:
+            with self.lock:
+                version.refs -= 1
+                evicted = self.remove(version) if version.retired and version.refs == 0 else None
+            if evicted is not None:
+                self.evicted(evicted)
+
+    def lookup(self, name, fingerprint):
+        # Version encore en service ayant cette empreinte (la courante, ou une version remplacée encore référencée)
+        with self.lock:
+            for version in self.versions.get(name, {}).values():
+                if version.fingerprint == fingerprint:
+                    return version
+        raise KeyError((name, fingerprint))
+
+    def reload(self, name, builder, *args):
+        # Construction d'une nouvelle version dans un thread du registre, publiée dès qu'elle est prête ;
+        # la version courante continue de servir pendant ce temps, et reste en place si la construction échoue
+        def run():
+            try:
+                return self.publish(name, builder(*args))
+            except Exception as e:
+                self.errors[name] = repr(e)
+                print(f"Chargement du modèle {name} en échec : {e!r}")
+                raise
+
+        # Un chargement déjà en cours pour ce nom n'est pas relancé
+        with self.lock:
+            if name not in self.pending or self.pending[name].done():
+                self.pending[name] = self.executor.submit(run)
+            return self.pending[name]
+
+    def watch(self, names, builder, interval):
+        # Rechargement périodique des modèles : builder(nom) construit la nouvelle version
+        def run():
+            while not self.stopped.wait(interval):
+                for name in names:
+                    self.reload(name, builder, name)
+        threading.Thread(target=run, name='model-reloader', daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def loading(self, name):
+        with self.lock:
+            return name in self.pending and not self.pending[name].done()
+
+    def fingerprints(self):
+        with self.lock:
+            return {name: version.fingerprint for name, version in self.current.items()}
+
+    def status(self):
+        with self.lock:
+            return {name: [{'version': version.number, 'fingerprint': version.fingerprint, 'refs': version.refs,
+                            'current': version is self.current.get(name), 'loaded_at': version.loaded_at.isoformat()}
+                           for version in versions.values()]
+                    for name, versions in self.versions.items()}
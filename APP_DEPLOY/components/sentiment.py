@@ -0,0 +1,206 @@
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+import nltk
+import pandas as pd
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+# Lexique VADER livré avec l'application (data/nltk_data/sentiment/vader_lexicon.zip) : aucun téléchargement
+NLTK_DATA = os.path.join('data', 'nltk_data')
+SCORE_COLUMNS = ['neg', 'neu', 'pos', 'compound']
+# Nombre de clés par requête de lecture du cache (limite des paramètres SQLite)
+LOOKUP_CHUNK = 500
+# Nom du régresseur de sentiment des actualités dans ProphetForecast
+SENTIMENT_FEATURE = 'NewsSentiment'
+# Clôture du marché de référence : un article publié après la clôture n'est connu qu'à la séance suivante
+MARKET_TIMEZONE = 'America/New_York'
+MARKET_CLOSE = pd.Timedelta(hours=16)
+
+
+def load_analyzer(nltk_data=NLTK_DATA):
+    nltk_data = os.path.abspath(nltk_data)
+    if nltk_data not in nltk.data.path:
+        nltk.data.path.insert(0, nltk_data)
+    return SentimentIntensityAnalyzer()
+
+
+def lexicon_fingerprint(nltk_data=NLTK_DATA):
+    # Les scores en cache ne valent que pour le lexique qui les a produits
+    with open(os.path.join(nltk_data, 'sentiment', 'vader_lexicon.zip'), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def classify(compound):
+    if compound >= 0.05:
+        return 'Positive'
+    elif compound <= -0.05:
+        return 'Negative'
+    else:
+        return 'Neutral'
+
+
+# Analyseur des processus du pool, chargé une fois par processus
+worker_analyzer = None
+
+
+def init_worker(nltk_data):
+    global worker_analyzer
+    worker_analyzer = load_analyzer(nltk_data)
+
+
+def score_batch(texts):
+    return [worker_analyzer.polarity_scores(text) for text in texts]
+
+
+class SentimentScorer:
+    # Scores VADER d'articles traités par lots. Chaque texte est mis en cache sur disque (SQLite, lectures et écritures
+    # groupées) par empreinte de son contenu : un article n'est jamais analysé deux fois.
+    # Les gros rattrapages sont répartis sur un pool de processus.
+    def __init__(self, path='cache/sentiment.sqlite', nltk_data=NLTK_DATA, max_workers=None, batch_size=500,
+                 parallel_threshold=5000, mp_context=None):
+        self.nltk_data = nltk_data
+        self.analyzer = load_analyzer(nltk_data)
+        self.version = lexicon_fingerprint(nltk_data)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with closing(self.connect()) as conn, conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, neg REAL, neu REAL, pos REAL, compound REAL)')
+        self.max_workers = max_workers or os.cpu_count()
+        self.mp_context = mp_context
+        self.batch_size = batch_size
+        # Nombre de textes à analyser à partir duquel le pool de processus est utilisé
+        self.parallel_threshold = parallel_threshold
+        self.hits = 0
+        self.misses = 0
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def text_key(self, text):
+        return f'{self.version}:{hashlib.sha256(text.encode()).hexdigest()}'
+
+    def lookup(self, keys):
+        found = {}
+        with closing(self.connect()) as conn:
+            for i in range(0, len(keys), LOOKUP_CHUNK):
+                chunk = keys[i:i + LOOKUP_CHUNK]
+                rows = conn.execute(f"SELECT key, neg, neu, pos, compound FROM scores WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                found.update((row[0], dict(zip(SCORE_COLUMNS, row[1:]))) for row in rows)
+        return found
+
+    def compute(self, texts):
+        if len(texts) < self.parallel_threshold or self.max_workers < 2:
+            return [self.analyzer.polarity_scores(text) for text in texts]
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context, initializer=init_worker, initargs=(self.nltk_data,)) as executor:
+            return [scores for batch in executor.map(score_batch, batches) for scores in batch]
+
+    def scores(self, texts):
+        # DataFrame neg / neu / pos / compound, une ligne par texte dans l'ordre reçu
+        texts = list(texts)
+        keys = {text: self.text_key(text) for text in texts}
+        cached = self.lookup(list(keys.values()))
+        results = {text: cached.get(key) for text, key in keys.items()}
+        missing = [text for text, result in results.items() if result is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            computed = self.compute(missing)
+            results.update(zip(missing, computed))
+            with closing(self.connect()) as conn, conn:
+                conn.executemany('INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)',
+                                 [(keys[text], *(scores[c] for c in SCORE_COLUMNS)) for text, scores in zip(missing, computed)])
+        return pd.DataFrame([results[text] for text in texts], columns=SCORE_COLUMNS)
+
+    def classify(self, texts):
+        return [classify(compound) for compound in self.scores(texts)['compound']]
+
+
+def after_close(dates):
+    # dates : horodatages UTC sans fuseau. True pour les articles publiés après la clôture du jour calendaire UTC
+    # (l'heure de New York est en retard sur UTC : une date locale différente précède toujours la clôture)
+    local = dates.dt.tz_localize('UTC').dt.tz_convert(MARKET_TIMEZONE).dt.tz_localize(None)
+    return (local.dt.normalize() == dates.dt.normalize()) & (local - local.dt.normalize() >= MARKET_CLOSE)
+
+
+class DailySentiment:
+    # Sentiment journalier des articles stockés (nombre d'articles, somme des scores compound, répartition des classes),
+    # conservé dans la base des actualités. update() n'analyse que les journées dont le nombre d'articles a changé.
+    # late_articles / late_compound : part des articles du jour publiés après la clôture
+    def __init__(self, store, scorer):
+        self.store = store
+        self.scorer = scorer
+        with closing(store.connect()) as conn, conn:
+            # Table créée avant la séparation autour de la clôture : reconstruite depuis les scores en cache
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(daily_sentiment)')]
+            if columns and 'late_articles' not in columns:
+                conn.execute('DROP TABLE daily_sentiment')
+            conn.execute('CREATE TABLE IF NOT EXISTS daily_sentiment (day TEXT PRIMARY KEY, articles INTEGER, '
+                         'compound REAL, positive INTEGER, negative INTEGER, neutral INTEGER, '
+                         'late_articles INTEGER, late_compound REAL)')
+
+    def stale_days(self):
+        with closing(self.store.connect()) as conn:
+            rows = conn.execute(
+                'SELECT a.day FROM (SELECT substr(published_at, 1, 10) AS day, COUNT(*) AS articles FROM articles GROUP BY day) a '
+                'LEFT JOIN daily_sentiment d ON d.day = a.day WHERE d.articles IS NULL OR d.articles != a.articles').fetchall()
+        return sorted(day for day, in rows)
+
+    def update(self):
+        days = self.stale_days()
+        if not days:
+            return 0
+        articles = self.store.read(start=days[0], end=pd.Timestamp(days[-1]) + pd.Timedelta(days=1))
+        articles = articles[articles['Date'].dt.strftime('%Y-%m-%d').isin(days)]
+        texts = articles['Title'].fillna('') + ' ' + articles['Description'].fillna('')
+        compound = self.scorer.scores(texts)['compound'].to_numpy()
+
+        daily = pd.DataFrame({
+            'day': articles['Date'].dt.strftime('%Y-%m-%d').to_numpy(),
+            'compound': compound,
+            'positive': compound >= 0.05,
+            'negative': compound <= -0.05,
+        })
+        daily['neutral'] = ~(daily['positive'] | daily['negative'])
+        daily['late'] = after_close(articles['Date']).to_numpy()
+        daily['late_compound'] = daily['compound'].where(daily['late'], 0.0)
+        daily = daily.groupby('day').agg(articles=('compound', 'size'), compound=('compound', 'sum'),
+                                         positive=('positive', 'sum'), negative=('negative', 'sum'), neutral=('neutral', 'sum'),
+                                         late_articles=('late', 'sum'), late_compound=('late_compound', 'sum'))
+        with closing(self.store.connect()) as conn, conn:
+            conn.executemany('INSERT OR REPLACE INTO daily_sentiment VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                             [(day, int(r.articles), float(r.compound), int(r.positive), int(r.negative), int(r.neutral),
+                               int(r.late_articles), float(r.late_compound))
+                              for day, r in daily.iterrows()])
+        return len(daily)
+
+    def series(self):
+        # Une ligne par jour calendaire ayant des articles ; sentiment = score compound moyen
+        with closing(self.store.connect()) as conn:
+            df = pd.read_sql_query('SELECT * FROM daily_sentiment ORDER BY day', conn)
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.pop('day')), name='Date')
+        df['sentiment'] = df['compound'] / df['articles']
+        return df
+
+
+def align_sentiment(daily, dates):
+    # Sentiment moyen des articles publiés entre la clôture de la séance précédente et celle de chaque date de cotation
+    # (0 sans article) : un article publié après la clôture, ou un jour sans séance, compte pour la séance suivante.
+    # Les articles postérieurs à la dernière séance ne sont rattachés à aucune date.
+    dates = pd.DatetimeIndex(dates)
+    # Articles publiés avant la clôture de leur jour, puis ceux publiés après, reportés au lendemain
+    published = pd.concat([
+        pd.DataFrame({'compound': daily['compound'] - daily['late_compound'],
+                      'articles': daily['articles'] - daily['late_articles']}, index=daily.index),
+        pd.DataFrame({'compound': daily['late_compound'].to_numpy(), 'articles': daily['late_articles'].to_numpy()},
+                     index=daily.index + pd.Timedelta(days=1)),
+    ])
+    published = published[published['articles'] > 0]
+    position = dates.searchsorted(published.index)
+    inside = position < len(dates)
+    grouped = published[inside].groupby(dates[position[inside]])[['compound', 'articles']].sum()
+    return (grouped['compound'] / grouped['articles']).reindex(dates, fill_value=0.0).rename(SENTIMENT_FEATURE)
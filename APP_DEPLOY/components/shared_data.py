@@ -0,0 +1,59 @@
+import glob
+import hashlib
+import os
+import re
+
+import pandas as pd
+import pyarrow as pa
+
+
+class SharedDatasets:
+    # Jeux de données préparés, publiés une fois au format Arrow puis lus par projection mémoire.
+    # Les colonnes lues sont des vues sans copie sur le fichier, en lecture seule : toute écriture en place lève
+    # une erreur, et les processus du serveur (workers gunicorn, tâches en arrière-plan) partagent les mêmes pages
+    # du cache système au lieu de garder chacun leur copie.
+    # Un fichier est identifié par le nom du jeu et l'empreinte de son contenu : le premier processus l'écrit,
+    # les suivants le retrouvent tel quel.
+    def __init__(self, directory='cache/datasets'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name, fingerprint):
+        return os.path.join(self.directory, f"{re.sub(r'[^A-Za-z0-9.-]', '_', name)}-{fingerprint}.arrow")
+
+    def fingerprint(self, df):
+        digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        digest.update(repr([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]).encode())
+        return digest.hexdigest()[:16]
+
+    def publish(self, name, df):
+        path = self.path(name, self.fingerprint(df))
+        if not os.path.exists(path):
+            self.write(df, path)
+            self.prune(name, keep=path)
+        return self.open(path)
+
+    def write(self, df, path):
+        # Les NaN des colonnes numériques restent des valeurs (pas de masque de nullité) : la lecture se fait sans copie.
+        # Écriture dans un fichier temporaire puis remplacement atomique, comme MarketDataStore
+        schema = pa.Schema.from_pandas(df, preserve_index=True)
+        arrays = [pa.array(df[column].to_numpy()) for column in df.columns] + [pa.array(df.index.to_numpy())]
+        table = pa.Table.from_arrays(arrays, schema=schema)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def open(self, path):
+        # Un bloc pandas par colonne (split_blocks) : pas de consolidation, donc pas de copie des colonnes
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        return table.to_pandas(split_blocks=True)
+
+    def prune(self, name, keep):
+        # Versions précédentes du jeu : les processus qui les projettent encore en mémoire gardent leur vue
+        for path in glob.glob(self.path(name, '*')):
+            if path != keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
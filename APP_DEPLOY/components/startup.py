@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class NotReady(Exception):
+    pass
+
+
+class Resources:
+    # Jeux de données et modèles de l'application construits en arrière-plan.
+    # Le serveur démarre sans les attendre ; les callbacks interrogent leur état et /healthz, /readyz l'exposent.
+    def __init__(self, max_workers=4):
+        self.builders = {}
+        self.depends = {}
+        self.values = {}
+        self.states = {}
+        self.errors = {}
+        self.timings = {}
+        self.events = {}
+        self.optional = set()
+        self.started_at = None
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='init')
+
+    def register(self, name, builder, depends=(), optional=False):
+        # Les dépendances doivent être enregistrées avant : l'ordre d'enregistrement est un ordre topologique,
+        # ce qui garantit qu'une tâche n'attend que des tâches déjà démarrées par le pool.
+        # Un composant optionnel n'est pas nécessaire à l'interface : son échec ne la rend pas indisponible
+        missing = [dep for dep in depends if dep not in self.builders]
+        if missing:
+            raise ValueError(f"Dépendances inconnues pour {name} : {missing}")
+        self.builders[name] = builder
+        self.depends[name] = tuple(depends)
+        self.states[name] = 'pending'
+        self.events[name] = threading.Event()
+        if optional:
+            self.optional.add(name)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        for name in self.builders:
+            self.executor.submit(self.build, name)
+
+    def build(self, name):
+        try:
+            for dep in self.depends[name]:
+                self.events[dep].wait()
+            failed = [dep for dep in self.depends[name] if self.states[dep] != 'ready']
+            if failed:
+                raise NotReady(f"dépendance(s) en échec : {', '.join(failed)}")
+
+            self.states[name] = 'running'
+            start = time.perf_counter()
+            self.values[name] = self.builders[name](*[self.values[dep] for dep in self.depends[name]])
+            self.timings[name] = time.perf_counter() - start
+            self.states[name] = 'ready'
+        except Exception as e:
+            self.errors[name] = repr(e)
+            self.states[name] = 'failed'
+            print(f"Initialisation de {name} en échec : {e!r}")
+        finally:
+            self.events[name].set()
+
+    def rebuild(self, name):
+        # Reconstruction d'un composant puis de ceux qui en dépendent, dans l'ordre d'enregistrement.
+        # Les anciennes valeurs restent servies jusqu'à leur remplacement, et en cas d'échec.
+        stale, failed = {name}, set()
+        for other in self.builders:
+            if any(dep in stale for dep in self.depends[other]):
+                stale.add(other)
+        for other in [n for n in self.builders if n in stale]:
+            if any(dep in failed for dep in self.depends[other]) or not self.ready(*self.depends[other]):
+                failed.add(other)
+                continue
+            try:
+                start = time.perf_counter()
+                value = self.builders[other](*[self.values[dep] for dep in self.depends[other]])
+                self.values[other], self.states[other] = value, 'ready'
+                self.timings[other] = time.perf_counter() - start
+                self.errors.pop(other, None)
+            except Exception as e:
+                failed.add(other)
+                self.errors[other] = repr(e)
+                print(f"Reconstruction de {other} en échec : {e!r}")
+        return not failed
+
+    def required(self):
+        return [name for name in self.builders if name not in self.optional]
+
+    def ready(self, *names):
+        return all(self.states.get(name) == 'ready' for name in names)
+
+    def get(self, name):
+        if self.states.get(name) != 'ready':
+            raise NotReady(name)
+        return self.values[name]
+
+    def wait(self, *names, timeout=None):
+        # Attente bloquante, réservée aux scripts et benchmarks
+        for name in names or self.builders:
+            self.events[name].wait(timeout)
+        return self.ready(*(names or self.builders))
+
+    def status(self):
+        return {
+            name: {
+                'state': self.states[name],
+                'seconds': round(self.timings[name], 3) if name in self.timings else None,
+                'error': self.errors.get(name),
+                'optional': name in self.optional,
+            }
+            for name in self.builders
+        }
@@ -0,0 +1,144 @@
+import threading
+import zlib
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+from components.indicators import IndicatorEngine
+from components.market_data import OHLCV_COLUMNS
+
+
+class SimulatedFeed:
+    # Flux local de séances simulées à partir de la dernière séance connue (marche aléatoire log-normale), pour
+    # développer, tester et mesurer le mode streaming sans réseau. Chaque interrogation renvoie les bars_per_poll
+    # séances ouvrées suivantes ; les tirages dépendent du ticker et de la date : la suite est reproductible
+    def __init__(self, bars_per_poll=1, drift=0.0004, volatility=0.02):
+        self.bars_per_poll = bars_per_poll
+        self.drift = drift
+        self.volatility = volatility
+
+    def bars(self, ticker, last):
+        # last : dernière séance connue (cours OHLCV, nommée par sa date)
+        dates = pd.bdate_range(last.name + pd.tseries.offsets.BDay(1), periods=self.bars_per_poll, name='Date')
+        z = np.random.default_rng([zlib.crc32(ticker.encode()), last.name.value]).standard_normal((len(dates), 4))
+        close = last['Close'] * np.exp(np.cumsum(self.drift + self.volatility * z[:, 0]))
+        previous = np.r_[last['Close'], close[:-1]]
+        open_ = previous * (1 + 0.005 * z[:, 1])
+        spread = 0.01 * np.abs(z[:, 2]) * close
+        return pd.DataFrame({
+            'Close': close,
+            'High': np.maximum(open_, close) + spread,
+            'Low': np.minimum(open_, close) - spread,
+            'Open': open_,
+            'Volume': np.round(3_000_000 * np.exp(0.3 * z[:, 3])),
+        }, index=dates)
+
+
+class FetcherFeed:
+    # Nouvelles séances lues auprès d'un fetcher de components.market_data (YahooFetcher, FixtureFetcher)
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+
+    def bars(self, ticker, last):
+        start = last.name + pd.Timedelta(days=1)
+        end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        if start >= end:
+            return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype=float)
+        data = self.fetcher.fetch(ticker, start, end)
+        return data[data.index > last.name][OHLCV_COLUMNS].dropna()
+
+
+class LiveSeries:
+    # Séances reçues d'un flux après l'historique d'un ticker. Les indicateurs sont avancés séance par séance
+    # (IndicatorEngine.update) depuis leur état de fin d'historique, sans recalcul de la série complète.
+    # Un graphique demande les séances postérieures à la dernière date qu'il affiche (since) : un graphique construit
+    # sur un historique plus récent (nouvelle version du modèle) ne reçoit pas celles qu'il contient déjà
+    def __init__(self, ticker, history, feed):
+        self.ticker = ticker
+        self.feed = feed
+        self.engine = IndicatorEngine()
+        self.engine.compute(history['Close'])
+        self.last = history[OHLCV_COLUMNS].iloc[-1]
+        self.dates = []
+        self.rows = []
+        self.lock = threading.Lock()
+
+    def poll(self):
+        # Interroge le flux et ajoute les nouvelles séances ; retourne leur nombre
+        bars = self.feed.bars(self.ticker, self.last)
+        with self.lock:
+            # L'historique a pu être remplacé (reset) pendant l'interrogation du flux
+            bars = bars[bars.index > self.last.name]
+            for date, bar in zip(bars.index, bars.to_dict('records')):
+                bar.update(self.engine.update(bar['Close']))
+                self.dates.append(date)
+                self.rows.append(bar)
+            if len(bars):
+                self.last = bars.iloc[-1]
+        return len(bars)
+
+    def reset(self, history):
+        # Nouvel historique (nouvelle version du modèle) : les indicateurs repartent de sa dernière séance et les
+        # séances reçues après elle sont rejouées. Celles qu'il contient déjà restent servies aux graphiques
+        # construits sur un historique plus ancien
+        engine = IndicatorEngine()
+        engine.compute(history['Close'])
+        end = history.index[-1]
+        with self.lock:
+            for date, row in zip(self.dates, self.rows):
+                if date > end:
+                    row.update(engine.update(row['Close']))
+            self.engine = engine
+            if not self.dates or self.dates[-1] <= end:
+                self.last = history[OHLCV_COLUMNS].iloc[-1]
+
+    def since(self, after=None):
+        # Séances postérieures à la date `after` (toutes si None), et date de la dernière séance reçue
+        with self.lock:
+            start = 0 if after is None else bisect_right(self.dates, pd.Timestamp(after))
+            last = self.dates[-1].isoformat() if self.dates else after
+            return pd.DataFrame(self.rows[start:], index=pd.DatetimeIndex(self.dates[start:], name='Date')), last
+
+
+class MarketStream:
+    # Séances en direct des tickers affichés : une LiveSeries par ticker, créée à la première demande depuis son
+    # historique (history(ticker)), puis alimentée par un thread qui interroge le flux toutes les `interval` secondes.
+    # Comme les métriques, les séances reçues sont propres à chaque processus du serveur
+    def __init__(self, feed, history, interval=5.0):
+        self.feed = feed
+        self.history = history
+        self.interval = interval
+        self.live = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='market-stream', daemon=True)
+
+    def series(self, ticker):
+        with self.lock:
+            if ticker not in self.live:
+                self.live[ticker] = LiveSeries(ticker, self.history(ticker), self.feed)
+            return self.live[ticker]
+
+    def reset(self, ticker, history):
+        # Historique d'une nouvelle version du modèle du ticker, si ses séances en direct sont déjà suivies
+        with self.lock:
+            live = self.live.get(ticker)
+        if live is not None:
+            live.reset(history)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            with self.lock:
+                live = list(self.live.values())
+            for series in live:
+                try:
+                    series.poll()
+                except Exception as e:
+                    print(f"Lecture du flux de {series.ticker} en échec : {e!r}")
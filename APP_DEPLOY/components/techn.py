@@ -6,8 +6,10 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 
+from components.correlation import ROLLING_WINDOWS
+
 class Techn:
-    def __init__(self):
+    def __init__(self, tickers=('ADBE',), stream_interval=None):
         
         self.button_mesure = html.Div(
                 [
@@ -33,6 +35,25 @@ class Techn:
             value='SP'
         )
 
+        # Corrélation et bêta glissants d'un ticker suivi contre l'indice choisi ci-dessus
+        self.correlation_ticker = dbc.Select(
+            id='correlation-ticker',
+            options=[{'label': ticker, 'value': ticker} for ticker in tickers],
+            value=tickers[0]
+        )
+
+        self.correlation_windows = dbc.Checklist(
+            id='correlation-windows',
+            options=[{'label': f'{window}d', 'value': window} for window in ROLLING_WINDOWS],
+            value=[ROLLING_WINDOWS[0], ROLLING_WINDOWS[-1]],
+            inline=True
+        )
+
+        # Mode streaming : interrogation périodique des nouvelles séances (stream_interval en secondes, None : désactivé)
+        # et numéro de la prochaine séance à ajouter au graphique
+        self.stream = [dcc.Interval(id='adobe-stream', interval=int((stream_interval or 1) * 1000), disabled=stream_interval is None),
+                       dcc.Store(id='adobe-stream-position', data=None)]
+
         
     def date_gestion(self):
         return dcc.RangeSlider(
@@ -47,7 +68,7 @@ class Techn:
                     dbc.Row(
                         [
                             # Colonne de gauche avec le RangeSlider et un graphique
-                            dbc.Col([html.Br(), dbc.Row([dbc.Col(self.date_gestion())]), dcc.Graph(id='adobe-graph')], width=6),
+                            dbc.Col([html.Br(), dbc.Row([dbc.Col(self.date_gestion())]), dcc.Graph(id='adobe-graph')] + self.stream, width=6),
                             dbc.Col([html.Br(), dbc.Row([dbc.Col(self.index_select), dbc.Col(self.button_mesure)]), dcc.Graph(id='index-graph')], width=6),
                         ]
                     ),
@@ -58,6 +79,12 @@ class Techn:
                             dbc.Col([html.Br(), dash_table.DataTable(id="data-table", filter_action="native", filter_options={"placeholder_text": "Filter..."}, page_size=10)], width=6),
                         ], style={'height': '400px'}
                     ),
+                    dbc.Row(
+                        [
+                            dbc.Col([html.Br(), dbc.Row([dbc.Col(self.correlation_ticker), dbc.Col(self.correlation_windows)]),
+                                     dcc.Graph(id='correlation-graph')], width=12),
+                        ]
+                    ),
                 ]
             )
         return row
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Les rendements sont exprimés en pourcentage pendant l'estimation (meilleur conditionnement de l'optimisation)
+SCALE = 100.0
+# Longueur des blocs de la récursion de variance vectorisée
+BLOCK = 64
+
+
+def log_returns(prices):
+    return np.log(prices).diff().dropna()
+
+
+def linear_recursion(c, beta, s0, block=BLOCK):
+    # s[t] = c[t] + beta * s[t-1], avec s[-1] = s0.
+    # Chaque bloc est calculé par un produit matriciel (puissances de beta) ; seule la valeur de fin de bloc
+    # est propagée d'un bloc à l'autre dans une boucle Python
+    n = len(c)
+    blocks = -(-n // block)
+    padded = np.zeros(blocks * block)
+    padded[:n] = c
+    steps = np.arange(block)
+    lags = steps[:, None] - steps[None, :]
+    powers = np.where(lags >= 0, beta ** np.maximum(lags, 0), 0.0)
+    partial = padded.reshape(blocks, block) @ powers.T
+
+    carries = np.empty(blocks)
+    carry, decay = s0, beta ** block
+    for b in range(blocks):
+        carries[b] = carry
+        carry = partial[b, -1] + decay * carry
+    return (partial + carries[:, None] * beta ** (steps + 1)).ravel()[:n]
+
+
+def numeric_gradient(f, x, h=1e-5):
+    grad = np.empty_like(x)
+    for i in range(len(x)):
+        step = np.zeros_like(x)
+        step[i] = h
+        grad[i] = (f(x + step) - f(x - step)) / (2 * h)
+    return grad
+
+
+def minimize(f, x0, tol=1e-6, max_iter=200):
+    # BFGS avec gradient numérique et recherche linéaire par rebroussement (Armijo)
+    x = np.asarray(x0, dtype=float)
+    fx, grad = f(x), numeric_gradient(f, x)
+    inverse_hessian = np.eye(len(x))
+    for iteration in range(1, max_iter + 1):
+        direction = -inverse_hessian @ grad
+        if grad @ direction >= 0:
+            inverse_hessian = np.eye(len(x))
+            direction = -grad
+        step = 1.0
+        while True:
+            candidate = x + step * direction
+            f_candidate = f(candidate)
+            if f_candidate <= fx + 1e-4 * step * (grad @ direction) or step < 1e-10:
+                break
+            step /= 2
+        new_grad = numeric_gradient(f, candidate)
+        s, y = candidate - x, new_grad - grad
+        converged = abs(fx - f_candidate) < tol * max(1.0, abs(fx)) and np.max(np.abs(new_grad)) < 1e-3
+        x, fx, grad = candidate, f_candidate, new_grad
+        if converged or step < 1e-10:
+            break
+        if s @ y > 1e-12:
+            rho = 1.0 / (s @ y)
+            identity = np.eye(len(x))
+            inverse_hessian = (identity - rho * np.outer(s, y)) @ inverse_hessian @ (identity - rho * np.outer(y, s)) + rho * np.outer(s, s)
+    return x, fx, iteration
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class GarchModel:
+    # GARCH(1,1) (kind='garch') ou GJR-GARCH(1,1) (kind='gjr') à innovations gaussiennes, estimé par maximum
+    # de vraisemblance avec une récursion de variance vectorisée par blocs.
+    # sigma2[t] = omega + (alpha + gamma * 1[eps[t-1] < 0]) * eps[t-1]^2 + beta * sigma2[t-1]
+    # mean='constant' retire la moyenne empirique des rendements, mean='zero' les prend tels quels.
+    def __init__(self, kind='garch', mean='constant'):
+        if kind not in ('garch', 'gjr'):
+            raise ValueError(f"Modèle de volatilité inconnu : {kind}")
+        self.kind = kind
+        self.mean = mean
+        self.params = None
+        self.mu = 0.0
+        self.fingerprint = None
+        self.iterations = 0
+        self.loglik = None
+
+    def unpack(self, x):
+        # Paramètres non contraints -> omega > 0, alpha, gamma, beta >= 0 et persistance alpha + gamma/2 + beta < 1
+        omega, persistence = np.exp(x[0]), sigmoid(x[1])
+        logits = np.append(x[2:], 0.0)
+        shares = np.exp(logits - logits.max())
+        shares = persistence * shares / shares.sum()
+        if self.kind == 'gjr':
+            return {'omega': omega, 'alpha': shares[0], 'gamma': 2 * shares[1], 'beta': shares[2]}
+        return {'omega': omega, 'alpha': shares[0], 'gamma': 0.0, 'beta': shares[1]}
+
+    def pack(self, params):
+        persistence = params['alpha'] + params['gamma'] / 2 + params['beta']
+        shares = [params['alpha'], params['gamma'] / 2, params['beta']] if self.kind == 'gjr' else [params['alpha'], params['beta']]
+        shares = np.maximum(shares, 1e-8)
+        return np.concatenate([[np.log(params['omega']), np.log(persistence / (1 - persistence))],
+                               np.log(shares[:-1] / shares[-1])])
+
+    def initial_params(self, variance):
+        if self.kind == 'gjr':
+            return {'omega': 0.05 * variance, 'alpha': 0.03, 'gamma': 0.06, 'beta': 0.89}
+        return {'omega': 0.05 * variance, 'alpha': 0.05, 'gamma': 0.0, 'beta': 0.90}
+
+    def variance(self, params, eps, backcast):
+        # Variance conditionnelle de chaque innovation, la première valant la variance initiale
+        shock = params['alpha'] + params['gamma'] * (eps[:-1] < 0)
+        c = params['omega'] + shock * eps[:-1] ** 2
+        return np.concatenate([[backcast], linear_recursion(c, params['beta'], backcast)])
+
+    def neg_loglik(self, x, eps, backcast):
+        sigma2 = self.variance(self.unpack(x), eps, backcast)
+        return 0.5 * np.sum(np.log(2 * np.pi) + np.log(sigma2) + eps ** 2 / sigma2)
+
+    def fit(self, returns, start=None):
+        # returns : rendements logarithmiques (Series indexée par date) ; start : paramètres d'un ajustement
+        # précédent servant de point de départ (réajustement à chaud après l'arrivée de nouveaux rendements)
+        self.prepare(returns)
+        x0 = self.pack(start or self.initial_params(self.backcast))
+        x, fx, self.iterations = minimize(lambda x: self.neg_loglik(x, self.eps, self.backcast), x0)
+        self.params = {name: float(value) for name, value in self.unpack(x).items()}
+        self.loglik = -float(fx)
+        self.set_state(returns)
+        return self
+
+    def prepare(self, returns):
+        # Innovations (rendements en pourcentage moins la moyenne) et variance initiale de la récursion
+        values = returns.to_numpy(dtype=float) * SCALE
+        self.mu = float(values.mean()) if self.mean == 'constant' else 0.0
+        self.eps = values - self.mu
+        self.backcast = float(np.mean(self.eps ** 2))
+
+    def set_state(self, returns):
+        self.index = returns.index
+        self.fingerprint = self.returns_fingerprint(returns)
+        self.sigma2 = self.variance(self.params, self.eps, self.backcast)
+        # Variance du prochain rendement, tenue à jour en O(1) par update()
+        self.next_sigma2 = self.step(self.sigma2[-1], self.eps[-1])
+
+    def step(self, sigma2, eps):
+        p = self.params
+        return p['omega'] + (p['alpha'] + p['gamma'] * (eps < 0)) * eps ** 2 + p['beta'] * sigma2
+
+    def update(self, r):
+        # Nouveau rendement observé : variance du rendement suivant sans recalculer l'historique
+        eps = r * SCALE - self.mu
+        self.next_sigma2 = self.step(self.next_sigma2, eps)
+        return self.next_sigma2 / SCALE ** 2
+
+    def persistence(self):
+        return self.params['alpha'] + self.params['gamma'] / 2 + self.params['beta']
+
+    def forecast(self, horizon):
+        # Variance attendue des rendements des `horizon` prochains jours : retour géométrique vers la variance de long terme
+        persistence = self.persistence()
+        long_run = self.params['omega'] / (1 - persistence)
+        steps = np.arange(horizon)
+        return (long_run + persistence ** steps * (self.next_sigma2 - long_run)) / SCALE ** 2
+
+    def simulate(self, horizon, paths, rng):
+        # Innovations des rendements logarithmiques de `paths` trajectoires sur `horizon` jours (tableau paths x horizon),
+        # la variance de chaque trajectoire suivant sa propre récursion GARCH
+        sigma2 = np.full(paths, self.next_sigma2)
+        shocks = np.empty((paths, horizon))
+        for t in range(horizon):
+            shocks[:, t] = np.sqrt(sigma2) * rng.standard_normal(paths)
+            sigma2 = self.step(sigma2, shocks[:, t])
+        return shocks / SCALE
+
+    def bands(self, center, z=1.96):
+        # Intervalle de prix autour des prix prévus `center` (un par jour d'horizon), d'après la variance cumulée des rendements
+        spread = z * np.sqrt(np.cumsum(self.forecast(len(center))))
+        center = np.asarray(center, dtype=float)
+        return center * np.exp(-spread), center * np.exp(spread)
+
+    def volatility(self):
+        # Même format que data/volatilite_estimee.csv (sortie des notebooks R) : Sigma2 et Sigma par jour
+        sigma2 = self.sigma2 / SCALE ** 2
+        return pd.DataFrame({'Sigma2': sigma2, 'Sigma': np.sqrt(sigma2)}, index=self.index)
+
+    def returns_fingerprint(self, returns):
+        digest = hashlib.sha256(np.ascontiguousarray(returns.to_numpy(dtype=float)).tobytes())
+        digest.update(f'{self.kind}|{self.mean}'.encode())
+        return digest.hexdigest()[:16]
+
+    def save(self, path):
+        artifact = {'kind': self.kind, 'mean': self.mean, 'params': self.params, 'fingerprint': self.fingerprint,
+                    'observations': len(self.eps)}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(artifact, f)
+        os.replace(tmp_path, path)
+
+    def fit_or_load(self, returns, path):
+        # Paramètres enregistrés réutilisés tels quels si les rendements n'ont pas changé,
+        # sinon point de départ d'un réajustement à chaud
+        try:
+            with open(path) as f:
+                artifact = json.load(f)
+        except (OSError, ValueError):
+            artifact = None
+        if artifact and (artifact['kind'], artifact['mean']) != (self.kind, self.mean):
+            artifact = None
+
+        if artifact and artifact['fingerprint'] == self.returns_fingerprint(returns):
+            self.prepare(returns)
+            self.params = artifact['params']
+            self.set_state(returns)
+            return self
+        self.fit(returns, start=artifact and artifact['params'])
+        self.save(path)
+        return self
@@ -0,0 +1,23 @@
+import numpy as np
+
+
+class YearIndex:
+    # Position de la première ligne de chaque année d'un jeu de données trié par date.
+    # Une plage d'années devient une tranche positionnelle, sans masque booléen sur toute la série.
+    def __init__(self, years):
+        years = np.asarray(years)
+        if len(years) == 0:
+            self.first_year, self.offsets = 0, np.zeros(1, dtype=int)
+            return
+        if np.any(np.diff(years) < 0):
+            raise ValueError("Les données doivent être triées par date")
+        self.first_year = int(years[0])
+        # offsets[k] : première ligne de l'année first_year + k ; la dernière valeur est la longueur totale
+        self.offsets = np.searchsorted(years, np.arange(self.first_year, int(years[-1]) + 2))
+
+    def rows(self, start_year, end_year):
+        # Tranche des lignes dont l'année est comprise entre start_year et end_year inclus
+        last = len(self.offsets) - 1
+        start = min(max(int(start_year) - self.first_year, 0), last)
+        end = min(max(int(end_year) + 1 - self.first_year, 0), last)
+        return slice(int(self.offsets[start]), int(self.offsets[max(start, end)]))
@@ -0,0 +1,16 @@
+import pytest
+
+from components.datasets import prepare_forecast_data
+from components.market_data import FixtureFetcher
+
+
+@pytest.fixture(scope='session')
+def market_data():
+    # Environ 1 500 séances synthétiques déterministes (données hors ligne de l'application)
+    return FixtureFetcher().fetch('ADBE', '2018-01-01', '2024-01-01')
+
+
+@pytest.fixture(scope='session')
+def forecast_data(market_data):
+    # Cours et indicateurs, comme les données d'entrée de ProphetForecast
+    return prepare_forecast_data(market_data.copy())
@@ -0,0 +1,30 @@
+from components.backtest import Backtest
+from components.prophet import DEFAULT_FEATURES
+
+
+def test_folds_count_rows(forecast_data, tmp_path):
+    # initial_rows est un nombre de séances : première coupure à cette position, fenêtres glissantes de cette longueur
+    data = forecast_data.iloc[:400]
+    expanding = Backtest(data, horizon=10, step=100, initial_rows=200, cache_dir=str(tmp_path))
+    rolling = Backtest(data, horizon=10, step=100, initial_rows=200, window='rolling', cache_dir=str(tmp_path))
+    assert expanding.folds() == [(0, 200), (0, 300)]
+    assert rolling.folds() == [(0, 200), (100, 300)]
+
+
+def test_fold_key_depends_on_features(forecast_data, tmp_path):
+    # Les prévisions en cache d'un pli ne servent qu'au modèle ajusté avec les mêmes régresseurs
+    data = forecast_data.assign(Sentiment=0.5)
+    train = data.iloc[:300]
+    default = Backtest(data, cache_dir=str(tmp_path / 'default')).fold_key(train)
+    served = Backtest(data, features=DEFAULT_FEATURES + ['Sentiment'], cache_dir=str(tmp_path / 'served')).fold_key(train)
+    assert default != served
+    assert default == Backtest(data, features=list(DEFAULT_FEATURES), cache_dir=str(tmp_path / 'same')).fold_key(train)
+
+
+def test_fold_key_depends_on_forecast_version(forecast_data, tmp_path, monkeypatch):
+    # Les plis en cache d'une version précédente de la prévision récursive ne sont pas relus
+    backtest = Backtest(forecast_data, cache_dir=str(tmp_path))
+    train = forecast_data.iloc[:300]
+    key = backtest.fold_key(train)
+    monkeypatch.setattr('components.backtest.FORECAST_VERSION', -1)
+    assert backtest.fold_key(train) != key
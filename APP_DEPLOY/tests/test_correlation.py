@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.correlation import CorrelationEngine, rolling_beta_correlation
+from components.market_data import FixtureFetcher
+
+
+@pytest.fixture(scope='module')
+def engine():
+    fetcher = FixtureFetcher()
+    closes = {ticker: fetcher.fetch(ticker, '2018-01-01', '2024-01-01')['Close'] for ticker in ('ADBE', 'MSFT', 'SP')}
+    returns = np.log(pd.DataFrame(closes)).diff()
+    # Séances sans cours de l'indice : les séries glissantes suivent les seules séances de l'indice
+    returns.loc[returns.index[::50], 'SP'] = np.nan
+    return CorrelationEngine(returns, ['ADBE', 'MSFT'], ['SP'])
+
+
+@pytest.mark.parametrize('years', [(2019, 2021), (2015, 2019), (2023, 2030), (2021, 2021), (2010, 2012)])
+def test_rolling_years_matches_year_mask(engine, years):
+    start_year, end_year = years
+    selected = engine.rolling_years('MSFT', 'SP', (20, 60), start_year, end_year)
+    for window, df in engine.rolling('MSFT', 'SP', (20, 60)).items():
+        expected = df[(df.index.year >= start_year) & (df.index.year <= end_year)]
+        pd.testing.assert_frame_equal(selected[window], expected)
+
+
+def synthetic_returns(days):
+    # Trois tickers liés au marché ; le dernier n'est coté qu'après un tiers de l'historique, le deuxième a une
+    # interruption de cinq séances
+    rng = np.random.default_rng(0)
+    market = rng.normal(0.0003, 0.012, days)
+    assets = market[:, None] * np.array([0.5, 1.2, 1.8]) + rng.normal(0, 0.02, (days, 3))
+    assets[:days // 3, 2] = np.nan
+    assets[days // 2:days // 2 + 5, 1] = np.nan
+    return pd.DataFrame(assets), pd.Series(market)
+
+
+# 20000 séances : en sommes cumulées float32, l'écart à pandas dépassait 1e-3 sur le bêta de la fenêtre de 20 séances
+@pytest.mark.parametrize('days', [1500, 20000])
+def test_rolling_beta_correlation_matches_pandas(days):
+    assets, market = synthetic_returns(days)
+    windows = (20, 60, 250)
+    results = rolling_beta_correlation(assets.to_numpy(), market.to_numpy(), windows)
+    for window in windows:
+        correlation, beta = results[window]
+        rolling = assets.rolling(window)
+        expected_correlation = rolling.corr(market).to_numpy()
+        expected_beta = (rolling.cov(market) / market.rolling(window).var().to_numpy()[:, None]).to_numpy()
+        assert correlation.dtype == beta.dtype == np.float32
+        np.testing.assert_array_equal(np.isnan(correlation), np.isnan(expected_correlation))
+        np.testing.assert_array_equal(np.isnan(beta), np.isnan(expected_beta))
+        np.testing.assert_allclose(correlation, expected_correlation, rtol=0, atol=1e-5, equal_nan=True)
+        np.testing.assert_allclose(beta, expected_beta, rtol=0, atol=1e-5, equal_nan=True)
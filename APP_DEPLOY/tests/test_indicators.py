@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ta.trend import SMAIndicator, EMAIndicator, MACD
+from ta.momentum import RSIIndicator
+
+from components.indicators import IndicatorEngine, PathIndicators
+
+TOLERANCE = 1e-8
+
+
+def ta_indicators(close):
+    # Référence : calcul historique de calculate_indicators avec le package ta
+    values = {f'RSI{w}Day': RSIIndicator(close, window=w).rsi() for w in (3, 9, 14, 30)}
+    values.update({f'MA{w}Day': SMAIndicator(close, window=w).sma_indicator() for w in (10, 30, 50)})
+    values['EMA10Day'] = EMAIndicator(close, window=10).ema_indicator()
+    macd = MACD(close)
+    values['MACD'] = macd.macd()
+    values['Signal'] = macd.macd_signal()
+    return {name: series.to_numpy() for name, series in values.items()}
+
+
+def assert_equivalent(expected, actual):
+    # Mêmes positions de valeurs manquantes, écart maximal sous la tolérance ailleurs
+    np.testing.assert_array_equal(np.isnan(expected), np.isnan(actual))
+    valid = ~np.isnan(expected)
+    np.testing.assert_allclose(actual[valid], expected[valid], rtol=0, atol=TOLERANCE)
+
+
+@pytest.fixture
+def close(market_data):
+    close = market_data['Close'].to_numpy().copy()
+    # Quelques clôtures inchangées pour couvrir le cas des variations nulles du RSI
+    close[::97] = np.roll(close, 1)[::97]
+    return close
+
+
+def test_compute_matches_ta(close):
+    reference = ta_indicators(pd.Series(close))
+    computed = IndicatorEngine().compute(close)
+    assert set(computed) == set(reference)
+    for name, expected in reference.items():
+        assert_equivalent(expected, computed[name])
+
+
+@pytest.mark.parametrize('start', [0, 1, 20, 700])
+def test_updates_match_ta(close, start):
+    # Calcul complet des `start` premières séances, puis une mise à jour par séance
+    reference = ta_indicators(pd.Series(close))
+    engine = IndicatorEngine()
+    engine.compute(close[:start])
+    streamed = pd.DataFrame([engine.update(c) for c in close[start:]])
+    for name, expected in reference.items():
+        assert_equivalent(expected[start:], streamed[name].to_numpy())
+
+
+def test_short_history_is_missing():
+    # Moins de séances que les fenêtres : valeurs manquantes, comme ta
+    close = np.array([10.0, 11.0, 10.5])
+    reference = ta_indicators(pd.Series(close))
+    computed = IndicatorEngine().compute(close)
+    for name, expected in reference.items():
+        assert_equivalent(expected, computed[name])
+
+
+def test_path_indicators_match_engine(close):
+    # Trajectoires simulées : chaque trajectoire avance comme un moteur alimenté par ses propres cours
+    engine = IndicatorEngine()
+    engine.compute(close[:-20])
+    prices = close[-20:, None] * np.array([1.0, 1.01, 0.98])
+    paths = PathIndicators(engine, prices.shape[1])
+    engines = [IndicatorEngine() for _ in range(prices.shape[1])]
+    for single in engines:
+        single.compute(close[:-20])
+    for row in prices:
+        values = paths.update(row)
+        for column, single in enumerate(engines):
+            expected = single.update(row[column])
+            for name, value in expected.items():
+                assert values[name][column] == pytest.approx(value, abs=TOLERANCE)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.lstm import LstmForecaster
+
+FEATURES = ['Close', 'Volume', 'RSI14Day', 'MA10Day', 'MACD']
+HIDDEN = 8
+SEQ_LENGTH = 12
+
+
+def export_weights(path, layers, seed=0):
+    # Poids aléatoires au format de l'export de LSTM_Stock.ipynb (state_dict de nn.LSTM, portes i, f, g, o)
+    rng = np.random.default_rng(seed)
+    weights = {}
+    for layer in range(layers):
+        size = len(FEATURES) if layer == 0 else 2 * HIDDEN
+        for suffix in ('', '_reverse'):
+            weights[f'lstm.weight_ih_l{layer}{suffix}'] = rng.normal(0, 0.5, (4 * HIDDEN, size)).astype(np.float32)
+            weights[f'lstm.weight_hh_l{layer}{suffix}'] = rng.normal(0, 0.5, (4 * HIDDEN, HIDDEN)).astype(np.float32)
+            weights[f'lstm.bias_ih_l{layer}{suffix}'] = rng.normal(0, 0.5, 4 * HIDDEN).astype(np.float32)
+            weights[f'lstm.bias_hh_l{layer}{suffix}'] = rng.normal(0, 0.5, 4 * HIDDEN).astype(np.float32)
+    weights['fc.weight'] = rng.normal(0, 0.5, (1, 2 * HIDDEN)).astype(np.float32)
+    weights['fc.bias'] = rng.normal(0, 0.5, 1).astype(np.float32)
+    data_min, data_max = rng.uniform(-5, 0, len(FEATURES)), rng.uniform(1, 5, len(FEATURES))
+    np.savez(path, **weights, data_min=data_min, data_max=data_max, features=np.array(FEATURES), seq_length=SEQ_LENGTH)
+    return {name: value.astype(np.float64) for name, value in weights.items()}
+
+
+def sigmoid(z):
+    return 1 / (1 + np.exp(-z))
+
+
+def reference_forward(weights, layers, sequence):
+    # Passe de nn.LSTM(bidirectional=True, batch_first=True) sur une séquence, pas à pas et en float64,
+    # puis couche linéaire sur la sortie au dernier pas
+    layer_input = sequence.astype(np.float64)
+    for layer in range(layers):
+        outputs = np.zeros((len(layer_input), 2 * HIDDEN))
+        for d, suffix in enumerate(('', '_reverse')):
+            w_ih, w_hh = weights[f'lstm.weight_ih_l{layer}{suffix}'], weights[f'lstm.weight_hh_l{layer}{suffix}']
+            b = weights[f'lstm.bias_ih_l{layer}{suffix}'] + weights[f'lstm.bias_hh_l{layer}{suffix}']
+            h, c = np.zeros(HIDDEN), np.zeros(HIDDEN)
+            steps = range(len(layer_input)) if d == 0 else reversed(range(len(layer_input)))
+            for t in steps:
+                i, f, g, o = np.split(w_ih @ layer_input[t] + w_hh @ h + b, 4)
+                c = sigmoid(f) * c + sigmoid(i) * np.tanh(g)
+                h = sigmoid(o) * np.tanh(c)
+                outputs[t, d * HIDDEN:(d + 1) * HIDDEN] = h
+        layer_input = outputs
+    return (weights['fc.weight'] @ layer_input[-1] + weights['fc.bias'])[0]
+
+
+@pytest.mark.parametrize('layers', [1, 2, 3])
+def test_forward_matches_reference(tmp_path, layers):
+    weights = export_weights(tmp_path / 'lstm.npz', layers)
+    forecaster = LstmForecaster(tmp_path / 'lstm.npz', max_batch=16)
+    x = np.random.default_rng(1).uniform(0, 1, (37, SEQ_LENGTH, len(FEATURES))).astype(np.float32)
+    # 37 séquences : trois lots de 16 au plus, le dernier incomplet
+    expected = np.array([reference_forward(weights, layers, sequence) for sequence in x])
+    np.testing.assert_allclose(forecaster.forward(x), expected, rtol=0, atol=1e-5)
+
+
+def test_reverse_direction_contributes(tmp_path):
+    # La sortie dépend de la direction inverse : inverser l'ordre des séances la change
+    export_weights(tmp_path / 'lstm.npz', 2)
+    forecaster = LstmForecaster(tmp_path / 'lstm.npz')
+    x = np.random.default_rng(2).uniform(0, 1, (4, SEQ_LENGTH, len(FEATURES))).astype(np.float32)
+    assert np.abs(forecaster.forward(x) - forecaster.forward(x[:, ::-1].copy())).max() > 1e-3
+
+
+def test_predict_uses_preceding_windows(tmp_path):
+    weights = export_weights(tmp_path / 'lstm.npz', 2)
+    forecaster = LstmForecaster(tmp_path / 'lstm.npz')
+    dates = pd.bdate_range('2024-01-01', periods=30)
+    features = pd.DataFrame(np.random.default_rng(3).uniform(-4, 4, (30, len(FEATURES))), index=dates, columns=FEATURES)
+    predictions = forecaster.predict(features, 5)
+
+    # Cinq dernières séances et la séance suivante, chacune prévue à partir des SEQ_LENGTH séances précédentes
+    assert list(predictions.index) == list(dates[-5:]) + [dates[-1] + pd.tseries.offsets.BDay(1)]
+    scaled = forecaster.scale(features.to_numpy())
+    for k, date in enumerate(predictions.index):
+        end = len(dates) - 5 + k
+        expected = forecaster.unscale(reference_forward(weights, 2, scaled[end - SEQ_LENGTH:end]))
+        assert predictions[date] == pytest.approx(expected, abs=1e-4)
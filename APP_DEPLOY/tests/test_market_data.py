@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+from components.market_data import FixtureFetcher, MarketDataStore, OHLCV_COLUMNS
+
+
+class RecordingFetcher:
+    # Fetcher hors ligne qui note les plages demandées ; offline=True imite un échec de yfinance (tableau vide)
+    def __init__(self):
+        self.fixture = FixtureFetcher()
+        self.requests = []
+        self.offline = False
+
+    def fetch(self, ticker, start, end):
+        self.requests.append((pd.Timestamp(start), pd.Timestamp(end)))
+        if self.offline:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return self.fixture.fetch(ticker, start, end)
+
+
+@pytest.fixture
+def fetcher():
+    return RecordingFetcher()
+
+
+@pytest.fixture
+def store(tmp_path, fetcher):
+    return MarketDataStore(str(tmp_path), fetcher=fetcher)
+
+
+def test_fixture_fetcher_is_deterministic():
+    # Une date a la même valeur quelle que soit la plage demandée
+    fetcher = FixtureFetcher()
+    long = fetcher.fetch('ADBE', '2020-01-01', '2021-01-01')
+    short = fetcher.fetch('ADBE', '2020-06-01', '2020-07-01')
+    pd.testing.assert_frame_equal(short, long.loc[short.index])
+    assert list(long.columns) == OHLCV_COLUMNS
+    assert long.index.min() >= pd.Timestamp('2020-01-01') and long.index.max() < pd.Timestamp('2021-01-01')
+    assert (long['High'] >= long['Low']).all()
+    assert not fetcher.fetch('MSFT', '2020-01-01', '2021-01-01')['Close'].equals(long['Close'])
+
+
+def test_update_fetches_only_missing_dates(store, fetcher):
+    first = store.get('ADBE', '2020-01-01', '2020-07-01')
+    again = store.get('ADBE', '2020-03-01', '2020-07-01')
+    assert fetcher.requests == [(pd.Timestamp('2020-01-01'), pd.Timestamp('2020-07-01'))]
+    pd.testing.assert_frame_equal(again, first.loc['2020-03-01':], check_freq=False)
+
+    store.get('ADBE', '2019-06-01', '2020-09-01')
+    assert fetcher.requests[1:] == [(pd.Timestamp('2019-06-01'), pd.Timestamp('2020-01-01')),
+                                    (pd.Timestamp('2020-07-01'), pd.Timestamp('2020-09-01'))]
+    stored, coverage = store.read('ADBE')
+    assert coverage == (pd.Timestamp('2019-06-01'), pd.Timestamp('2020-09-01'))
+    pd.testing.assert_frame_equal(stored, FixtureFetcher().fetch('ADBE', '2019-06-01', '2020-09-01'),
+                                  check_freq=False, check_dtype=False)
+
+
+def test_empty_download_on_cold_start_raises(store, fetcher):
+    fetcher.offline = True
+    with pytest.raises(ValueError):
+        store.get('ADBE', '2020-01-01', '2020-07-01')
+    assert store.read('ADBE')[1] is None
+
+    # Le réseau revenu, toute la plage est téléchargée
+    fetcher.offline = False
+    assert len(store.get('ADBE', '2020-01-01', '2020-07-01')) > 100
+
+
+def test_empty_download_keeps_coverage(store, fetcher):
+    store.get('ADBE', '2020-01-01', '2020-07-01')
+    fetcher.offline = True
+    served = store.get('ADBE', '2020-01-01', '2020-09-01')
+    assert served.index.max() < pd.Timestamp('2020-07-01')
+    assert store.read('ADBE')[1] == (pd.Timestamp('2020-01-01'), pd.Timestamp('2020-07-01'))
+
+    # La plage manquante est redemandée à la mise à jour suivante
+    fetcher.offline = False
+    assert store.get('ADBE', '2020-01-01', '2020-09-01').index.max() >= pd.Timestamp('2020-08-31')
+    assert fetcher.requests[-1] == (pd.Timestamp('2020-07-01'), pd.Timestamp('2020-09-01'))
+
+
+def test_coverage_stops_at_last_returned_date(store, fetcher):
+    # Aucun cours publié après le 15 : la fin de la plage demandée n'est pas marquée comme couverte
+    fetcher.fetch = lambda ticker, start, end: FixtureFetcher().fetch(ticker, start, '2020-06-16')
+    store.get('ADBE', '2020-01-01', '2020-07-01')
+    assert store.read('ADBE')[1] == (pd.Timestamp('2020-01-01'), pd.Timestamp('2020-06-16'))
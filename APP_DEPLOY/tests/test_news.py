@@ -0,0 +1,78 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from components.news import NewsClient, NewsIngestor, NewsStore
+from components.news_stub import NewsStubServer, stub_articles
+
+
+@pytest.fixture
+def stub(request):
+    # Options du serveur local passées par @pytest.mark.parametrize('stub', [...], indirect=True)
+    stub = NewsStubServer(**getattr(request, 'param', {}))
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(str(tmp_path / 'news.sqlite'))
+
+
+def ingestor(stub, store, days=2, **options):
+    client = NewsClient('test', base_url=stub.url, backoff=0, **options)
+    return NewsIngestor(client, store, queries=('adobe',), days=days)
+
+
+def test_stub_articles_are_deterministic():
+    day = date(2024, 3, 1)
+    articles = stub_articles('adobe', day, 5)
+    assert articles == stub_articles('adobe', day, 5)
+    assert len({a['url'] for a in articles}) == 5
+    assert all(a['publishedAt'].startswith('2024-03-01') for a in articles)
+
+
+@pytest.mark.parametrize('stub', [{'articles_per_day': 12}], indirect=True)
+def test_refresh_stores_missing_days_once(stub, store):
+    news = ingestor(stub, store)
+    summary = news.refresh()
+    assert (summary['requests'], summary['added'], summary['errors']) == (2, 24, {})
+    assert len(store.read()) == 24
+    assert store.term_counts(limit=1)['Count'].iloc[0] > 0
+
+    # La veille est terminée : seul le jour courant est redemandé, sans doublon
+    summary = news.refresh()
+    assert summary['requests'] == 1 and summary['added'] == 0
+    assert len(store.read()) == 24
+
+
+@pytest.mark.parametrize('stub', [{'articles_per_day': 25}], indirect=True)
+def test_pagination_reads_every_page(stub, store):
+    summary = ingestor(stub, store, days=1, page_size=10).refresh()
+    assert summary['added'] == 25
+    assert stub.requests == 3
+
+
+@pytest.mark.parametrize('stub', [{'articles_per_day': 5, 'failures': 2}], indirect=True)
+def test_rate_limit_is_retried(stub, store):
+    summary = ingestor(stub, store, days=1, retries=3).refresh()
+    assert summary['errors'] == {} and summary['added'] == 5
+    assert stub.requests == 3
+
+
+@pytest.mark.parametrize('stub', [{'articles_per_day': 5, 'failures': 5}], indirect=True)
+def test_exhausted_retries_are_reported(stub, store):
+    news = ingestor(stub, store, days=1, retries=1)
+    summary = news.refresh()
+    assert summary['added'] == 0 and len(summary['errors']) == 1
+    assert '429' in next(iter(summary['errors'].values()))
+    # La journée en échec n'est pas marquée comme téléchargée
+    today = datetime.now(timezone.utc).date()
+    assert news.pending(today) == [('adobe', today)]
+
+
+@pytest.mark.parametrize('stub', [{'articles_per_day': 50, 'max_results': 20}], indirect=True)
+def test_result_limit_keeps_accessible_pages(stub, store):
+    summary = ingestor(stub, store, days=1, page_size=10).refresh()
+    assert summary['errors'] == {} and summary['added'] == 20
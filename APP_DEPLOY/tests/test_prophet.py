@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator
+from ta.trend import SMAIndicator, EMAIndicator, MACD
+
+from components.prophet import ProphetForecast
+
+HORIZON = 5
+
+
+def update_indicators(df):
+    # Recalcul complet des indicateurs de la boucle d'origine, avec le package ta
+    df['RSI3Day'] = RSIIndicator(df['y'], window=3).rsi()
+    df['RSI9Day'] = RSIIndicator(df['y'], window=9).rsi()
+    df['RSI14Day'] = RSIIndicator(df['y'], window=14).rsi()
+    df['MA10Day'] = SMAIndicator(df['y'], window=10).sma_indicator()
+    df['MA30Day'] = SMAIndicator(df['y'], window=30).sma_indicator()
+    df['MA50Day'] = SMAIndicator(df['y'], window=50).sma_indicator()
+    df['EMA10Day'] = EMAIndicator(df['y'], window=10).ema_indicator()
+    macd = MACD(df['y'])
+    df['MACD'] = macd.macd()
+    df['Signal'] = macd.macd_signal()
+    df.dropna(inplace=True)
+    return df
+
+
+def recursive_predict(forecaster, p):
+    # Boucle d'origine de ProphetForecast.predict : à chaque pas, prédiction de tout l'historique prolongé d'une ligne,
+    # puis recalcul de tous les indicateurs
+    data = forecaster.data
+    future = forecaster.prophet_df[['ds'] + forecaster.features].copy()
+    future['y'] = data[(data['Date'] >= future['ds'].min()) & (data['Date'] <= future['ds'].max())][forecaster.target]
+    for _ in range(p):
+        next_date = future['ds'].max() + pd.tseries.offsets.BDay(1)
+        new_row = {'ds': next_date}
+        for feature in forecaster.features:
+            new_row[feature] = future[feature].iloc[-1]
+        future = pd.concat([future, pd.DataFrame([new_row])], ignore_index=True)
+        forecast = forecaster.model.predict(future[['ds'] + forecaster.features])
+        future.loc[future['ds'] == next_date, 'y'] = forecast['yhat'].iloc[-1]
+        future = update_indicators(future)
+    return forecaster.model.predict(future)
+
+
+@pytest.fixture(scope='module')
+def forecaster(forecast_data):
+    forecaster = ProphetForecast(forecast_data)
+    forecaster.fit_model()
+    return forecaster
+
+
+def test_predict_matches_recursive_loop(forecaster):
+    expected = recursive_predict(forecaster, HORIZON).tail(HORIZON)
+    forecast = forecaster.predict(HORIZON)
+    future = forecast.tail(HORIZON)
+
+    assert len(forecast) == len(forecaster.prophet_df) + HORIZON
+    np.testing.assert_array_equal(future['ds'].to_numpy(), expected['ds'].to_numpy())
+    for column in ('yhat', 'trend'):
+        np.testing.assert_allclose(future[column].to_numpy(), expected[column].to_numpy(), rtol=1e-6)
+
+
+def test_longer_horizon_extends_shorter_one(forecaster):
+    # Les premiers pas d'un horizon plus long sont ceux de l'horizon court
+    short = forecaster.predict(HORIZON).tail(HORIZON)
+    long = forecaster.predict(2 * HORIZON).tail(2 * HORIZON)
+    np.testing.assert_allclose(long['yhat'].to_numpy()[:HORIZON], short['yhat'].to_numpy())
+
+
+def test_concurrent_predictions_do_not_interfere(forecaster):
+    # Le modèle servi est partagé entre les callbacks : chaque appel reçoit sa propre prévision
+    horizons = [HORIZON, 2 * HORIZON] * 4
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        forecasts = list(executor.map(forecaster.predict, horizons))
+    for p, forecast in zip(horizons, forecasts):
+        assert len(forecast) == len(forecaster.prophet_df) + p
+    assert not hasattr(forecaster, 'forecast')
+    assert list(forecaster.get_forecast_table(forecasts[0]).columns) == ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+
+def test_zero_shock_simulation_matches_predict(forecaster):
+    # Sans choc, chaque trajectoire simulée reproduit la prévision récursive de predict
+    dates, prices = forecaster.simulate(2 * HORIZON, np.zeros((3, 2 * HORIZON)))
+    expected = forecaster.predict(2 * HORIZON).tail(2 * HORIZON)
+    np.testing.assert_array_equal(dates.to_numpy(), expected['ds'].to_numpy())
+    for path in prices:
+        np.testing.assert_allclose(path, expected['yhat'].to_numpy(), rtol=1e-9)
+
+
+def test_simulation_bands_contain_predict(forecaster):
+    # La médiane des trajectoires bootstrap reste proche de yhat, compris dans l'intervalle simulé
+    rng = np.random.default_rng(0)
+    bands = forecaster.simulation_bands(*forecaster.simulate(HORIZON, forecaster.bootstrap_shocks(HORIZON, 2000, rng)))
+    yhat = forecaster.predict(HORIZON)['yhat'].tail(HORIZON).to_numpy()
+    assert (bands['yhat_lower'].to_numpy() <= yhat).all() and (yhat <= bands['yhat_upper'].to_numpy()).all()
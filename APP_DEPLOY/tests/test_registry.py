@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from components.registry import ModelRegistry
+
+
+class Forecaster:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+
+
+@pytest.fixture
+def registry():
+    evicted = []
+    registry = ModelRegistry(on_evict=evicted.append)
+    registry.evicted_versions = evicted
+    return registry
+
+
+def test_publish_keeps_acquired_version_until_released(registry):
+    registry.publish('ADBE', Forecaster('a'))
+    with registry.acquire('ADBE') as version:
+        registry.publish('ADBE', Forecaster('b'))
+        assert version.fingerprint == 'a' and registry.fingerprints() == {'ADBE': 'b'}
+        assert registry.evicted_versions == []
+    assert [v.fingerprint for v in registry.evicted_versions] == ['a']
+    # Un modèle identique à la version courante ne crée pas de nouvelle version
+    assert registry.publish('ADBE', Forecaster('b')).number == 2
+
+
+def test_registry_without_fork_support(monkeypatch):
+    # Windows : os.register_at_fork n'existe pas
+    monkeypatch.delattr(os, 'register_at_fork')
+    registry = ModelRegistry()
+    registry.publish('ADBE', Forecaster('a'))
+    assert registry.ready('ADBE')
+
+
+def test_on_publish_receives_new_versions():
+    published = []
+    registry = ModelRegistry(on_publish=published.append)
+    registry.publish('ADBE', Forecaster('a'))
+    registry.publish('ADBE', Forecaster('a'))
+    registry.publish('ADBE', Forecaster('b'))
+    assert [(v.fingerprint, v.number) for v in published] == [('a', 1), ('b', 2)]
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from components.news import NewsStore
+from components.sentiment import DailySentiment, SentimentScorer, align_sentiment
+
+# Séances du jeudi 7 au mardi 12 mars 2024 ; New York passe à l'heure d'été le dimanche 10 (clôture 21:00 puis 20:00 UTC)
+SESSIONS = pd.DatetimeIndex(['2024-03-07', '2024-03-08', '2024-03-11', '2024-03-12'])
+# (publication UTC, titre, séance attendue)
+ARTICLES = [
+    ('2024-03-07T15:00:00Z', 'Adobe shares rally on excellent results', '2024-03-07'),
+    ('2024-03-07T20:30:00Z', 'Adobe wins a great award', '2024-03-07'),
+    # Après la clôture du jeudi : compte pour le vendredi
+    ('2024-03-07T22:30:00Z', 'Adobe faces a terrible lawsuit', '2024-03-08'),
+    ('2024-03-08T02:00:00Z', 'Analysts worry about weak Adobe guidance', '2024-03-08'),
+    # Samedi : compte pour le lundi
+    ('2024-03-09T15:00:00Z', 'Adobe launches a wonderful new tool', '2024-03-11'),
+    # 16:30 à New York après le changement d'heure : compte pour le mardi
+    ('2024-03-11T20:30:00Z', 'Adobe hit by a painful outage', '2024-03-12'),
+    # Après la clôture de la dernière séance : aucune date
+    ('2024-03-12T21:30:00Z', 'Adobe stock crashes badly', None),
+]
+
+
+@pytest.fixture
+def daily(tmp_path):
+    store = NewsStore(str(tmp_path / 'news.sqlite'))
+    store.add('adobe', [{'publishedAt': published_at, 'title': title, 'description': '', 'url': f'https://example.com/{i}'}
+                        for i, (published_at, title, _) in enumerate(ARTICLES)])
+    scorer = SentimentScorer(str(tmp_path / 'sentiment.sqlite'))
+    daily_sentiment = DailySentiment(store, scorer)
+    daily_sentiment.update()
+    return daily_sentiment.series(), scorer
+
+
+def test_after_close_articles_count_for_next_session(daily):
+    daily, scorer = daily
+    compound = scorer.scores([f'{title} ' for _, title, _ in ARTICLES])['compound']
+    sessions = pd.Series([session for _, _, session in ARTICLES])
+    expected = compound.groupby(sessions).mean()
+    expected.index = pd.DatetimeIndex(expected.index)
+    assert expected.ne(0).all()
+
+    aligned = align_sentiment(daily, SESSIONS)
+    pd.testing.assert_series_equal(aligned, expected.reindex(SESSIONS), check_names=False, check_freq=False)
+    # Les comptes par jour calendaire (répartition affichée) ne changent pas
+    assert daily['articles'].to_dict() == {pd.Timestamp(day): count for day, count in
+                                           pd.Series([p[:10] for p, _, _ in ARTICLES]).value_counts().items()}
@@ -0,0 +1,38 @@
+import pytest
+
+from components.startup import NotReady, Resources
+
+
+def fail():
+    raise RuntimeError('indisponible')
+
+
+@pytest.fixture
+def resources():
+    resources = Resources(max_workers=2)
+    resources.register('data', lambda: 1)
+    resources.register('model', lambda data: data + 1, depends=['data'])
+    resources.register('news', fail, optional=True)
+    resources.register('backtest', lambda model: model * 10, depends=['model'], optional=True)
+    yield resources
+    resources.executor.shutdown()
+
+
+def test_optional_failure_keeps_required_ready(resources):
+    resources.start()
+    resources.wait()
+    assert resources.required() == ['data', 'model']
+    assert resources.ready(*resources.required())
+    status = resources.status()
+    assert status['news']['state'] == 'failed' and status['news']['optional']
+    assert status['backtest']['state'] == 'ready' and not status['model']['optional']
+    with pytest.raises(NotReady):
+        resources.get('news')
+
+
+def test_failed_dependency_propagates(resources):
+    resources.register('report', lambda news: news, depends=['news'])
+    resources.start()
+    resources.wait()
+    assert resources.status()['report']['state'] == 'failed'
+    assert not resources.ready(*resources.required())
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.datasets import prepare_forecast_data
+from components.figures import ADOBE_LINES, adobe_extend, adobe_figure, predict_extend
+from components.indicators import IndicatorEngine
+from components.market_data import FixtureFetcher, OHLCV_COLUMNS
+from components.streaming import FetcherFeed, LiveSeries, SimulatedFeed
+
+INDICATORS = list(IndicatorEngine().compute(np.arange(60.0)))
+
+
+@pytest.fixture
+def history(forecast_data):
+    return forecast_data.iloc[:-40]
+
+
+def test_simulated_feed_is_reproducible(history):
+    feed = SimulatedFeed(bars_per_poll=5)
+    bars = feed.bars('ADBE', history.iloc[-1])
+    pd.testing.assert_frame_equal(bars, feed.bars('ADBE', history.iloc[-1]))
+    assert not bars['Close'].equals(feed.bars('MSFT', history.iloc[-1])['Close'])
+
+    # Séances ouvrées suivant la dernière séance connue, cours cohérents
+    assert list(bars.index) == list(pd.bdate_range(history.index[-1] + pd.tseries.offsets.BDay(1), periods=5))
+    assert (bars['High'] >= bars[['Open', 'Close']].max(axis=1)).all()
+    assert (bars['Low'] <= bars[['Open', 'Close']].min(axis=1)).all()
+    assert (bars['Volume'] > 0).all()
+
+
+def test_fetcher_feed_returns_bars_after_last(history):
+    bars = FetcherFeed(FixtureFetcher()).bars('ADBE', history.iloc[-1])
+    assert list(bars.columns) == OHLCV_COLUMNS
+    assert bars.index.min() > history.index[-1]
+    pd.testing.assert_frame_equal(bars.head(40), FixtureFetcher().fetch('ADBE', '2018-01-01', '2024-01-01')
+                                  .loc[bars.index[:40], OHLCV_COLUMNS], check_freq=False)
+
+
+@pytest.mark.parametrize('feed', [SimulatedFeed(bars_per_poll=3), FetcherFeed(FixtureFetcher())], ids=['simulated', 'fetcher'])
+def test_live_indicators_match_full_recompute(history, feed):
+    # Indicateurs avancés séance par séance = indicateurs recalculés sur l'historique prolongé
+    live = LiveSeries('ADBE', history, feed)
+    for _ in range(4):
+        live.poll()
+    bars, last = live.since()
+    assert len(bars) > 0 and last == bars.index[-1].isoformat()
+    expected = prepare_forecast_data(pd.concat([history[OHLCV_COLUMNS], bars[OHLCV_COLUMNS]]))
+    for name in INDICATORS:
+        np.testing.assert_allclose(bars[name].to_numpy(), expected[name].tail(len(bars)).to_numpy(), rtol=1e-9)
+
+
+def test_since_returns_bars_after_date(history):
+    live = LiveSeries('ADBE', history, SimulatedFeed(bars_per_poll=2))
+    bars, last = live.since()
+    assert bars.empty and last is None
+    assert live.poll() == 2
+    first, last = live.since(history.index[-1].isoformat())
+    assert len(first) == 2 and last == first.index[-1].isoformat()
+    live.poll()
+    new, next_last = live.since(last)
+    assert len(new) == 2 and new.index.min() > first.index.max()
+    new_again, same = live.since(next_last)
+    assert new_again.empty and same == next_last
+
+
+def test_reset_skips_bars_in_new_history(history):
+    # Nouvelle version du modèle ajustée sur des données contenant une partie des séances déjà reçues
+    live = LiveSeries('ADBE', history, SimulatedFeed(bars_per_poll=3))
+    for _ in range(3):
+        live.poll()
+    streamed, _ = live.since()
+    reloaded = prepare_forecast_data(pd.concat([history[OHLCV_COLUMNS], streamed[OHLCV_COLUMNS].head(5)]))
+    live.reset(reloaded)
+    live.poll()
+
+    # Un graphique construit sur le nouvel historique ne reçoit que les séances qu'il ne contient pas
+    bars, _ = live.since(reloaded.index[-1].isoformat())
+    assert bars.index.min() > reloaded.index[-1] and len(bars) == 4 + 3
+    expected = prepare_forecast_data(pd.concat([reloaded[OHLCV_COLUMNS], bars[OHLCV_COLUMNS]]))
+    for name in INDICATORS:
+        np.testing.assert_allclose(bars[name].to_numpy(), expected[name].tail(len(bars)).to_numpy(), rtol=1e-9)
+
+    # Un graphique construit sur l'ancien historique les reçoit toutes, sans doublon
+    old, _ = live.since(history.index[-1].isoformat())
+    assert len(old) == 12 and old.index.is_unique
+
+
+def test_reset_past_streamed_bars_moves_feed(history):
+    # Un historique rechargé plus récent que les séances reçues : le flux reprend après sa dernière séance
+    live = LiveSeries('ADBE', history.iloc[:-10], SimulatedFeed())
+    live.poll()
+    live.reset(history)
+    live.poll()
+    bars, _ = live.since(history.index[-1].isoformat())
+    assert len(bars) == 1 and bars.index[0] > history.index[-1]
+
+
+def test_extend_updates_match_figure_traces(history):
+    live = LiveSeries('ADBE', history, SimulatedFeed(bars_per_poll=3))
+    live.poll()
+    bars, _ = live.since()
+
+    # Plotly.extendTraces refuse un attribut absent d'une trace visée
+    figure = adobe_figure(history, extendable=True)
+    update, traces = adobe_extend(bars)
+    assert traces == list(range(len(figure['data'])))
+    assert all(key in trace for trace in figure['data'] for key in update)
+    assert all(len(values) == len(traces) for values in update.values())
+    assert [len(y) for y in update['y']] == [0] + [3] * len(ADOBE_LINES)
+    np.testing.assert_array_equal(update['close'][0], bars['Close'].to_numpy())
+
+    update, traces = predict_extend(bars)
+    assert traces == [0] and len(update['x'][0]) == len(update['y'][0]) == 3
@@ -0,0 +1,40 @@
+# Pré-entraînement hors ligne des modèles Prophet servis par l'application.
+# Exemple depuis APP_DEPLOY : python train.py ADBE --models-dir models
+import argparse
+import os
+
+import pandas as pd
+
+from components.datasets import prepare_forecast_data
+from components.market_data import MarketDataStore, YahooFetcher, FixtureFetcher
+from components.prophet import ProphetForecast, artifact_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste et enregistre les modèles Prophet des tickers demandés.")
+    parser.add_argument('tickers', nargs='*', default=['ADBE'])
+    parser.add_argument('--start', default='2010-01-01')
+    parser.add_argument('--end', default=pd.to_datetime('today').strftime('%Y-%m-%d'))
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--data-dir', default=os.path.join('data', 'market'))
+    parser.add_argument('--offline', action='store_true', help="données synthétiques au lieu de Yahoo Finance")
+    parser.add_argument('--force', action='store_true', help="réajuste même si l'artefact correspond aux données")
+    args = parser.parse_args()
+
+    fetcher = FixtureFetcher() if args.offline or os.environ.get('MARKET_DATA_OFFLINE') else YahooFetcher()
+    store = MarketDataStore(args.data_dir, fetcher=fetcher)
+
+    for ticker in args.tickers:
+        path = artifact_path(args.models_dir, ticker)
+        forecaster = ProphetForecast(prepare_forecast_data(store.get(ticker, args.start, args.end)))
+        if args.force:
+            forecaster.fit_model()
+            forecaster.save_model(path)
+            refit = True
+        else:
+            refit = forecaster.fit_or_load(path)
+        print(f"{ticker}: {'ajusté' if refit else 'à jour'} -> {path} ({forecaster.data_fingerprint()})")
+
+
+if __name__ == '__main__':
+    main()